@@ -4,8 +4,8 @@ from discord import app_commands
 from discord.ext import commands
 
 
-def setup_game_commands(bot, game_session, player_service, game_service, 
-                       wikipedia_service, embed_creator, formatters, validators):
+def setup_game_commands(bot, session_manager, player_service, game_service, 
+                       wikipedia_service, path_pool, embed_creator, formatters, validators):
     """Configure les commandes de jeu en slash commands"""
     
     @bot.tree.command(name='partie', description='Démarre une partie classée')
@@ -21,6 +21,7 @@ def setup_game_commands(bot, game_session, player_service, game_service,
         
         try:
             channel = interaction.user.voice.channel
+            game_session = session_manager.for_interaction(interaction)
             human_members = validators.get_human_members(channel)
             
             if not human_members:
@@ -31,7 +32,7 @@ def setup_game_commands(bot, game_session, player_service, game_service,
                 return
             
             # Si une partie est déjà active dans ce salon
-            if game_session.enabled and game_session.channel_id == channel.id:
+            if game_session.enabled:
                 embed = embed_creator.create_warning_embed(
                     "Partie déjà active",
                     f"Une partie classée est déjà en cours dans **{channel.name}**"
@@ -75,20 +76,26 @@ def setup_game_commands(bot, game_session, player_service, game_service,
             else:
                 await interaction.response.defer()
             
-            # Initialiser la session
+            # Initialiser la session (vérification refaite sous le verrou : un autre /partie
+            # a pu démarrer la partie pendant la confirmation)
             from datetime import datetime
-            game_session.members = [m.name for m in human_members]
-            game_session.enabled = True
-            game_session.channel_id = channel.id
-            game_session.start_time = datetime.now()
-            
-            new_players = []
+            async with game_session.lock:
+                if game_session.enabled:
+                    embed = embed_creator.create_warning_embed(
+                        "Partie déjà active",
+                        f"Une partie classée est déjà en cours dans **{channel.name}**"
+                    )
+                    if len(human_members) < 2:
+                        await interaction.edit_original_response(embed=embed, view=None)
+                    else:
+                        await interaction.followup.send(embed=embed, ephemeral=True)
+                    return
+                game_session.members = [m.name for m in human_members]
+                game_session.enabled = True
+                game_session.channel_id = channel.id
+                game_session.start_time = datetime.now()
             
-            for member_name in game_session.members:
-                player_data = player_service.get_player(member_name)
-                if not player_data:
-                    player_service.create_player(member_name)
-                    new_players.append(member_name)
+            new_players = await player_service.create_players_async(game_session.members)
             
             # Créer l'embed de partie
             embed = embed_creator.create_game_created_embed(
@@ -112,8 +119,17 @@ def setup_game_commands(bot, game_session, player_service, game_service,
                 await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @bot.tree.command(name='way', description='Génère un parcours Wikipédia aléatoire')
-    async def way(interaction: discord.Interaction):
-        """Génère un parcours Wikipédia aléatoire"""
+    @app_commands.describe(difficulte='Difficulté du parcours (nombre minimal de clics)')
+    @app_commands.choices(difficulte=[
+        app_commands.Choice(name='Facile', value='easy'),
+        app_commands.Choice(name='Moyen', value='medium'),
+        app_commands.Choice(name='Difficile', value='hard')
+    ])
+    async def way(interaction: discord.Interaction, difficulte: str = None):
+        """Génère un parcours Wikipédia aléatoire, éventuellement d'une difficulté donnée"""
+        
+        key = session_manager.key_for(interaction)
+        game_session = session_manager.get_or_create(key)
         
         if not game_session.enabled:
             await interaction.response.send_message(
@@ -123,91 +139,119 @@ def setup_game_commands(bot, game_session, player_service, game_service,
         else:
             await interaction.response.send_message("🔄 Génération du parcours...")
         
-        result = wikipedia_service.generate_path(max_attempts=10)
+        # Parcours pré-généré si disponible, sinon génération à la volée
+        result = await path_pool.get(difficulty=difficulte)
         
         if result is None:
             await interaction.edit_original_response(
-                content="🔴 Impossible de générer un parcours après 10 tentatives."
+                content=f"🔴 Impossible de générer un parcours après {path_pool.max_attempts} tentatives."
             )
             return
         
-        page1, page_target, attempt = result
-        game_session.parcours = [page1, page_target]
+        page1, page_target, attempt, optimal = result
         
         # Créer l'embed du parcours
         embed = embed_creator.create_path_embed(
             page1, 
             page_target, 
             game_session.enabled, 
-            attempt
+            attempt,
+            optimal,
+            difficulte
         )
         
         msg = await interaction.edit_original_response(content=None, embed=embed)
+        # Parcours et message remplacés ensemble, sans s'intercaler dans un /win ou une réaction
+        async with game_session.lock:
+            game_session.parcours = [page1, page_target]
+            session_manager.bind_message(key, msg.id)
         
         await msg.add_reaction("🔄")
         await msg.add_reaction("✅")
+        
+        # Parcours généré à la volée : minimum de clics calculé pendant la partie
+        if optimal is None:
+            page_target.optimal = await wikipedia_service.shortest_distance_async(
+                page1.title, page_target.title
+            )
     
     @bot.tree.command(name='win', description='Enregistre votre victoire')
     @app_commands.describe(clicks='Nombre de clics effectués')
     async def win(interaction: discord.Interaction, clicks: int):
         """Enregistre la victoire avec calcul de points et XP"""
         
-        if not game_session.enabled:
-            await interaction.response.send_message(
-                "⚠️ Partie non classée - score non enregistrable !",
-                ephemeral=True
-            )
-            return
+        game_session = session_manager.for_interaction(interaction, create=False)
         
-        if interaction.user != game_session.winner:
+        if game_session is None or not game_session.enabled:
             await interaction.response.send_message(
-                f"❌ {interaction.user.mention} n'est pas le gagnant !",
-                ephemeral=True
-            )
-            return
-        
-        if clicks <= 0:
-            await interaction.response.send_message(
-                "❌ Le nombre de clics doit être un nombre positif !",
+                "⚠️ Partie non classée - score non enregistrable !",
                 ephemeral=True
             )
             return
         
-        try:
-            await interaction.response.defer()
-            
-            winner_name = game_session.winner.name
-            temps = float(game_session.timer.duration)
-            
-            # Enregistrer la victoire
-            articles = (game_session.parcours[0].title, game_session.parcours[1].title)
-            result = game_service.register_win(
-                winner_name, 
-                temps, 
-                clicks, 
-                articles, 
-                game_session.members
-            )
-            
-            result['temps'] = temps
-            result['clicks'] = clicks
-            
-            # Obtenir les infos de rang
-            rank_info = player_service.get_rank_info(result['player_data']['level'])
-            
-            # Créer l'embed de victoire
-            embed = embed_creator.create_victory_embed(
-                game_session.winner,
-                result,
-                rank_info,
-                formatters
-            )
+        # Les /win concurrents d'une même session sont traités l'un après l'autre
+        async with game_session.lock:
+            if interaction.user != game_session.winner:
+                await interaction.response.send_message(
+                    f"❌ {interaction.user.mention} n'est pas le gagnant !",
+                    ephemeral=True
+                )
+                return
             
-            await interaction.followup.send(embed=embed)
+            if game_session.round_token is None:
+                await interaction.response.send_message(
+                    "⚠️ Cette victoire a déjà été enregistrée !",
+                    ephemeral=True
+                )
+                return
             
-            game_session.reset_round()
+            if clicks <= 0:
+                await interaction.response.send_message(
+                    "❌ Le nombre de clics doit être un nombre positif !",
+                    ephemeral=True
+                )
+                return
             
-        except Exception as e:
-            await interaction.followup.send(f"🔴 Erreur : {str(e)}", ephemeral=True)
+            try:
+                await interaction.response.defer()
+                
+                winner = game_session.winner
+                temps = float(game_session.timer.duration)
+                
+                # Joueurs lus hors de la boucle avant l'enregistrement (synchrone, en mémoire)
+                await player_service.preload_players([winner.name, *game_session.members])
+                
+                # Enregistrer la victoire (une seule fois par manche grâce au jeton)
+                articles = (game_session.parcours[0].title, game_session.parcours[1].title)
+                result = game_service.register_win(
+                    winner.name, 
+                    temps, 
+                    clicks, 
+                    articles, 
+                    game_session.members,
+                    token=game_session.round_token
+                )
+                
+                result['temps'] = temps
+                result['clicks'] = clicks
+                result['optimal_clicks'] = game_session.optimal_clicks
+                
+                game_session.reset_round()
+                
+                # Obtenir les infos de rang
+                rank_info = player_service.get_rank_info(result['player_data']['level'])
+                
+                # Créer l'embed de victoire
+                embed = embed_creator.create_victory_embed(
+                    winner,
+                    result,
+                    rank_info,
+                    formatters
+                )
+                
+                await interaction.followup.send(embed=embed)
+                
+            except Exception as e:
+                await interaction.followup.send(f"🔴 Erreur : {str(e)}", ephemeral=True)
     
     return partie, way, win
\ No newline at end of file
@@ -1,10 +1,15 @@
 #! /usr/bin/python
 # -*- coding: utf-8 -*-
 
+from typing import Optional
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from config.constants import PERIOD_LABELS
+from ui.views import LeaderboardView
+
 
 def setup_stats_commands(bot, player_service, embed_creator, formatters):
     """Configure les commandes de statistiques en slash commands"""
@@ -17,7 +22,7 @@ def setup_stats_commands(bot, player_service, embed_creator, formatters):
         if joueur is None:
             joueur = interaction.user.name
         
-        player_data = player_service.get_player(joueur)
+        player_data = await player_service.get_player_async(joueur)
         
         if not player_data:
             await interaction.response.send_message(
@@ -30,7 +35,8 @@ def setup_stats_commands(bot, player_service, embed_creator, formatters):
         rank_info = player_service.get_rank_info(player_data['level'])
         
         # Créer l'embed
-        embed = embed_creator.create_stats_embed(joueur, player_data, rank_info, formatters)
+        rank_stats = player_service.get_rank_stats(joueur)
+        embed = embed_creator.create_stats_embed(joueur, player_data, rank_info, formatters, rank_stats)
         
         await interaction.response.send_message(embed=embed)
     
@@ -42,7 +48,7 @@ def setup_stats_commands(bot, player_service, embed_creator, formatters):
         if joueur is None:
             joueur = interaction.user.name
         
-        player_data = player_service.get_player(joueur)
+        player_data = await player_service.get_player_async(joueur)
         
         if not player_data:
             await interaction.response.send_message(
@@ -53,7 +59,10 @@ def setup_stats_commands(bot, player_service, embed_creator, formatters):
         
         rank_info = player_service.get_rank_info(player_data['level'])
         
-        embed = embed_creator.create_achievements_embed(joueur, player_data, rank_info, formatters)
+        progress = player_service.achievement_progress(player_data)
+        embed = embed_creator.create_achievements_embed(
+            joueur, player_data, rank_info, formatters, progress
+        )
         
         await interaction.response.send_message(embed=embed)
     
@@ -61,41 +70,48 @@ def setup_stats_commands(bot, player_service, embed_creator, formatters):
     async def scoreboard(interaction: discord.Interaction):
         """Affiche le classement des meilleurs joueurs"""
         
-        players = player_service.get_all_players()
+        # Réponse différée : la construction de l'index peut dépasser le délai de 3 s
+        await interaction.response.defer()
+        view = LeaderboardView(player_service, embed_creator, formatters)
+        await player_service.ensure_rank_index_async()
+        embed = view.render(0)
         
-        if not players:
-            await interaction.response.send_message(
-                "Aucun joueur enregistré !",
-                ephemeral=True
-            )
+        if embed is None:
+            await interaction.followup.send("Aucun joueur enregistré !")
             return
         
-        embed = embed_creator.create_scoreboard_embed(players, formatters)
-        
-        await interaction.response.send_message(embed=embed)
+        view.message = await interaction.followup.send(embed=embed, view=view, wait=True)
     
     @bot.tree.command(name='leaderboard', description='Affiche différents classements')
-    @app_commands.describe(categorie='Catégorie de classement')
+    @app_commands.describe(
+        categorie='Catégorie de classement',
+        periode='Période du classement (laissez vide pour le classement général)'
+    )
     @app_commands.choices(categorie=[
         app_commands.Choice(name='Points', value='points'),
         app_commands.Choice(name='Niveau', value='level'),
         app_commands.Choice(name='Win Rate', value='winrate'),
         app_commands.Choice(name='XP', value='xp')
     ])
-    async def leaderboard(interaction: discord.Interaction, categorie: str = "points"):
+    @app_commands.choices(periode=[
+        app_commands.Choice(name=label, value=period) for period, label in PERIOD_LABELS.items()
+    ])
+    async def leaderboard(interaction: discord.Interaction, categorie: str = "points",
+                          periode: Optional[str] = None):
         """Affiche différents classements"""
         
-        players = player_service.get_all_players(sort_by=categorie)
+        # Réponse différée : la construction de l'index peut dépasser le délai de 3 s
+        await interaction.response.defer()
+        view = LeaderboardView(player_service, embed_creator, formatters, categorie, period=periode)
+        await player_service.ensure_rank_index_async()
+        embed = view.render(0)
         
-        if not players:
-            await interaction.response.send_message(
-                "Aucun joueur enregistré !",
-                ephemeral=True
+        if embed is None:
+            await interaction.followup.send(
+                "Aucun joueur classé sur cette période !" if periode else "Aucun joueur enregistré !"
             )
             return
         
-        embed = embed_creator.create_leaderboard_embed(players, categorie, formatters)
-        
-        await interaction.response.send_message(embed=embed)
+        view.message = await interaction.followup.send(embed=embed, view=view, wait=True)
     
     return stats, achievements, scoreboard, leaderboard
\ No newline at end of file
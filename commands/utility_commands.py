@@ -10,8 +10,11 @@ import asyncio
 from discord import app_commands
 from discord.ext import commands
 
+from models.game_session import GameSession
 
-def setup_utility_commands(bot, game_session, wikipedia_service, embed_creator, formatters):
+
+def setup_utility_commands(bot, session_manager, wikipedia_service, path_pool, embed_creator, formatters,
+                           achievement_reloader=None):
     """Configure les commandes utilitaires en slash commands"""
     
     @bot.tree.command(name='sommaire', description='Envoie le sommaire d\'un article en MP')
@@ -27,7 +30,7 @@ def setup_utility_commands(bot, game_session, wikipedia_service, embed_creator,
         try:
             channel = await interaction.user.create_dm()
             
-            result = wikipedia_service.get_summary(article, phrases)
+            result = await wikipedia_service.get_summary_async(article, phrases)
             
             if result is None:
                 await interaction.followup.send(
@@ -97,6 +100,7 @@ def setup_utility_commands(bot, game_session, wikipedia_service, embed_creator,
     async def status(interaction: discord.Interaction):
         """Affiche le statut actuel de la partie"""
         
+        game_session = session_manager.for_interaction(interaction, create=False) or GameSession()
         embed = embed_creator.create_status_embed(game_session, formatters, bot)
         
         await interaction.response.send_message(embed=embed)
@@ -105,7 +109,10 @@ def setup_utility_commands(bot, game_session, wikipedia_service, embed_creator,
     async def leave(interaction: discord.Interaction):
         """Permet à un joueur de quitter la partie classée en cours"""
         
-        if not game_session.enabled:
+        key = session_manager.key_for(interaction)
+        game_session = session_manager.get(key)
+        
+        if game_session is None or not game_session.enabled:
             embed = embed_creator.create_error_embed(
                 "Aucune partie classée n'est active."
             )
@@ -121,26 +128,42 @@ def setup_utility_commands(bot, game_session, wikipedia_service, embed_creator,
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        game_session.members.remove(player_name)
-
-        if game_session.winner and game_session.winner.name == player_name:
-            game_session.winner = None
+        async with game_session.lock:
+            # Retiré entre-temps (départ du salon vocal, dissolution)
+            if player_name not in game_session.members:
+                embed = embed_creator.create_error_embed(
+                    "Vous ne faites pas partie de la partie en cours."
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            
+            game_session.members.remove(player_name)
+            
+            if game_session.winner and game_session.winner.name == player_name:
+                game_session.winner = None
+            
+            remaining = list(game_session.members)
+            # Si plus personne dans la partie, la dissoudre
+            if not remaining:
+                game_session.reset()
+                session_manager.discard(key)
         
         await interaction.response.send_message(
             f"👋 **{interaction.user.display_name}** a quitté la partie classée.\n"
-            f"Joueurs restants : {formatters.format_player_list(game_session.members) if game_session.members else '**Aucun**'}"
+            f"Joueurs restants : {formatters.format_player_list(remaining) if remaining else '**Aucun**'}"
         )
         
-        # Si plus personne dans la partie, la dissoudre
-        if not game_session.members:
+        if not remaining:
             await interaction.followup.send("🔴 **Partie dissoute** - Aucun joueur restant.")
-            game_session.reset()
     
     @bot.tree.command(name='disband', description='Dissout la partie classée en cours')
     async def disband(interaction: discord.Interaction):
         """Dissout la partie classée en cours"""
         
-        if not game_session.enabled:
+        key = session_manager.key_for(interaction)
+        game_session = session_manager.get(key)
+        
+        if game_session is None or not game_session.enabled:
             embed = embed_creator.create_error_embed(
                 "Aucune partie classée n'est active."
             )
@@ -189,12 +212,21 @@ def setup_utility_commands(bot, game_session, wikipedia_service, embed_creator,
             await interaction.edit_original_response(embed=embed, view=None)
             return
         
-        # Dissoudre la partie
-        channel_name = "le salon"
-        if game_session.channel_id:
-            channel = bot.get_channel(game_session.channel_id)
-            if channel:
-                channel_name = f"**{channel.name}**"
+        # Dissoudre la partie, après un éventuel /win en cours sur la session
+        async with game_session.lock:
+            if not game_session.enabled:
+                embed = embed_creator.create_error_embed("La partie a déjà été dissoute.")
+                await interaction.edit_original_response(embed=embed, view=None)
+                return
+            
+            channel_name = "le salon"
+            if game_session.channel_id:
+                channel = bot.get_channel(game_session.channel_id)
+                if channel:
+                    channel_name = f"**{channel.name}**"
+            
+            game_session.reset()
+            session_manager.discard(key)
         
         await interaction.edit_original_response(
             content=f"💥 **Partie dissoute** par {interaction.user.mention}\n"
@@ -202,8 +234,17 @@ def setup_utility_commands(bot, game_session, wikipedia_service, embed_creator,
             embed=None,
             view=None
         )
+    
+    @bot.tree.command(name='pool', description='Affiche l\'état de la réserve de parcours et du cache (admin seulement)')
+    @app_commands.checks.has_permissions(administrator=True)
+    async def pool(interaction: discord.Interaction):
+        """Affiche les métriques de génération des parcours"""
+        
+        cache_stats = wikipedia_service.cache.get_stats() if wikipedia_service.cache else None
+        reload_stats = achievement_reloader.get_metrics() if achievement_reloader else None
+        embed = embed_creator.create_pool_embed(path_pool.get_metrics(), cache_stats, reload_stats)
         
-        game_session.reset()
+        await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @bot.tree.command(name='disconnect', description='Déconnecte le bot (admin seulement)')
     @app_commands.checks.has_permissions(administrator=True)
@@ -212,4 +253,4 @@ def setup_utility_commands(bot, game_session, wikipedia_service, embed_creator,
         await interaction.response.send_message("👋 **WikiBot** se déconnecte...")
         await bot.close()
     
-    return sommaire, guide, clear, status, leave, disband, disconnect
+    return sommaire, guide, clear, status, leave, disband, pool, disconnect
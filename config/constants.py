@@ -9,6 +9,8 @@ from pathlib import Path
 import json
 from typing import Any, Callable, Dict
 
+from services.achievement_engine import compile_condition
+
 # Paliers de niveaux (XP requis)
 LEVEL_THRESHOLDS = {
     1: 0, 2: 100, 3: 250, 4: 450, 5: 700,
@@ -41,47 +43,43 @@ def _make_check(condition: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
       - ge: field >= value
       - eq: field == value
       - len_ge: len(field) >= value (field expected to be iterable)
+      - and / or: {"type": "and", "conditions": [...]} combining the above
     """
-    ctype = condition.get("type")
-    field = condition.get("field")
-    value = condition.get("value")
-
-    if ctype == "lt":
-        return lambda stats: stats.get(field, float('inf')) < value
-    if ctype == "le":
-        return lambda stats: stats.get(field, float('inf')) <= value
-    if ctype == "gt":
-        return lambda stats: stats.get(field, float('-inf')) > value
-    if ctype == "ge":
-        return lambda stats: stats.get(field, float('-inf')) >= value
-    if ctype == "eq":
-        return lambda stats: stats.get(field) == value
-    if ctype == "len_ge":
-        return lambda stats: len(stats.get(field, [])) >= value
-
-    # Unknown condition: always False and safe.
-    return lambda stats: False
-
-
-_ACH_FILE = Path(__file__).parent / "achievements.json"
-print(f"Loading achievements from {_ACH_FILE}")
-_loaded_achievements: Dict[str, Dict[str, Any]] = {}
-if _ACH_FILE.exists():
-    try:
-        with _ACH_FILE.open("r", encoding="utf-8") as f:
-            _raw = json.load(f)
-            for key, data in _raw.items():
-                cond = data.pop("condition", None)
-                entry = dict(data)
-                entry["check"] = _make_check(cond) if cond else (lambda stats: False)
-                _loaded_achievements[key] = entry
-    except Exception:
-        _loaded_achievements = {}
-else:
+    return compile_condition(condition)[0]
+
+
+ACHIEVEMENTS_FILE = Path(__file__).parent / "achievements.json"
+
 
+def load_achievements(path: Path = ACHIEVEMENTS_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Load and compile achievements.json
+    Raises OSError / ValueError when the file is missing or invalid, so that a reload
+    can keep the previous rules instead of silently dropping every achievement
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if not isinstance(raw, dict):
+        raise ValueError("achievements.json must contain an object")
+    achievements = {}
+    for key, data in raw.items():
+        if not isinstance(data, dict):
+            raise ValueError(f"achievement {key!r} must be an object")
+        cond = data.get("condition")
+        entry = dict(data)
+        entry["check"] = _make_check(cond) if cond else (lambda stats: False)
+        achievements[key] = entry
+    return achievements
+
+
+try:
+    _loaded_achievements = load_achievements()
+except (OSError, ValueError) as e:
+    print(f"❌ Impossible de charger {ACHIEVEMENTS_FILE.name} : {e}")
     _loaded_achievements = {}
 
 # Public achievements mapping used by the rest of the codebase.
+# Rebound (never mutated) by AchievementReloader when the file changes.
 ACHIEVEMENTS = _loaded_achievements
 
 # Configuration des récompenses
@@ -102,4 +100,27 @@ CLICK_BONUS_THRESHOLDS = {
     3: 40,
     5: 20,
     10: 10
-}
\ No newline at end of file
+}
+
+# Niveaux de difficulté : bornes (min, max) du nombre minimal de clics, max None = illimité
+DIFFICULTY_BANDS = {
+    'easy': (2, 3),
+    'medium': (4, 5),
+    'hard': (6, None),
+}
+
+DIFFICULTY_LABELS = {
+    'easy': "🟢 Facile",
+    'medium': "🟠 Moyen",
+    'hard': "🔴 Difficile",
+}
+
+# Durée d'une saison de classement, en mois (saisons alignées sur l'année civile)
+SEASON_MONTHS = 3
+
+PERIOD_LABELS = {
+    'day': "Aujourd'hui",
+    'week': "Cette semaine",
+    'month': "Ce mois-ci",
+    'season': "Cette saison",
+}
@@ -15,10 +15,65 @@ with open("TOKEN.dat", "r") as token_file:
 DATA_DIR = Path("../Joueurs")
 DATA_DIR.mkdir(exist_ok=True)
 
+# Stockage des joueurs : "json" (un fichier par joueur) ou "sqlite"
+STORAGE_BACKEND = "json"
+DB_PATH = Path("../wikibot.db")
+
+# Journal d'événements de jeu (None = désactivé), découpé en segments, avec instantanés
+EVENT_LOG_DIR = Path("../events")
+EVENT_LOG_SEGMENT_SIZE = 100000
+EVENT_LOG_SNAPSHOT_INTERVAL = 1000
+# Synchronisation disque groupée toutes les N secondes (0 = un fsync par événement)
+EVENT_LOG_SYNC_INTERVAL = 0.1
+# Supprime les segments couverts par l'instantané de base lors du compactage : les
+# événements bruts sont alors perdus, et avec eux la possibilité de recalculer les joueurs
+# après un changement de formule (StatsService) ou de les reconstruire depuis le journal
+EVENT_LOG_PRUNE_SEGMENTS = False
+
+# Table des titres d'articles (identifiants des articles visités par les joueurs)
+ARTICLE_INDEX_PATH = Path("../articles.idx")
+
+# Archives des classements par période terminés (None = pas d'archivage)
+PERIOD_ARCHIVE_DIR = Path("../archives")
+
+# Rechargement à chaud de achievements.json : intervalle de vérification (None = désactivé)
+ACHIEVEMENTS_RELOAD_INTERVAL = 2.0
+
+# Cache mémoire des joueurs (écriture différée)
+PLAYER_CACHE_SIZE = 512
+PLAYER_FLUSH_INTERVAL = 5.0
+
+# Sessions non classées (/way hors salon vocal) supprimées après cette inactivité (secondes)
+SESSION_IDLE_TTL = 3600.0
+
 # Configuration Wikipedia
 WIKI_LANG = "fr"
 WIKI_RANDOM_PAGES = 10
 MAX_GENERATION_ATTEMPTS = 10
+WIKI_MAX_CONCURRENCY = 4
+# Backend Wikipedia : "api" (client MediaWiki asynchrone) ou "library" (paquet wikipedia)
+WIKI_BACKEND = "api"
+# URL de l'API MediaWiki (None = Wikipédia officiel ; ex. serveur local de test)
+WIKI_API_URL = None
+# Graphe de liens hors ligne (construit avec `python -m graph.builder`), utilisé s'il existe
+WIKI_GRAPH_DIR = Path("../graph") / WIKI_LANG
+
+# Cache des réponses Wikipedia (mémoire + SQLite), TTL en secondes par type
+WIKI_CACHE_PATH = Path("../wiki_cache.db")
+WIKI_CACHE_MEMORY_SIZE = 2048
+WIKI_CACHE_MAX_ENTRIES = 100000
+WIKI_CACHE_TTLS = {
+    'summary': 7 * 24 * 3600,
+    'links': 24 * 3600,
+    'page': 24 * 3600,
+    'search': 24 * 3600,
+}
+
+# Réserve de parcours pré-générés
+PATH_POOL_SIZE = 5
+PATH_POOL_TTL = 3600.0
+# Processus de tirage des parcours sur le graphe hors ligne
+PATH_POOL_WORKERS = 2
 
 # Configuration Discord
 BOT_DESCRIPTION = "Wikipédia Challenge - Un bot Discord pour jouer au Wikipédia Challenge"
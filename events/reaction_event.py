@@ -8,12 +8,17 @@ Gestion des réactions aux messages
 import discord
 
 
-async def on_reaction_add_handler(reaction, user, bot, game_session, 
-                                  player_service, way_command):
+async def on_reaction_add_handler(reaction, user, bot, session_manager, 
+                                  game_service, way_command):
     """Gestion des réactions aux messages"""
     if user.bot:
         return
     
+    # Seul le message du parcours en cours d'une session est interactif
+    game_session = session_manager.for_message(reaction.message.id)
+    if game_session is None:
+        return
+    
     channel = reaction.message.channel
     
     # 🔄 Régénérer le chemin
@@ -39,69 +44,87 @@ async def on_reaction_add_handler(reaction, user, bot, game_session,
     
     # ✅ Démarrer la partie
     elif reaction.emoji == "✅" and reaction.message.author == bot.user:
-        try:
-            await reaction.message.clear_reactions()
-            await reaction.message.add_reaction("🏁")
-            await reaction.message.add_reaction("❌")
-        except discord.NotFound:
-            return
-        
-        game_session.chrono_msg = await channel.send(
-            "━━━━━━━━━━━━━━━━━━━━━\n"
-            "⏱️ **CHRONOMÈTRE LANCÉ !**\n"
-            "Le temps vous est compté !\n"
-            "━━━━━━━━━━━━━━━━━━━━━"
-        )
-        game_session.timer.start()
-        
-        # Incrémenter parties jouées et streak
-        if game_session.enabled:
-            player_service.increment_played_games(game_session.members)
+        async with game_session.lock:
+            # Un second ✅ ne relance pas le chrono ni le compteur de parties
+            if game_session.timer.start_time is not None:
+                return
+            
+            try:
+                await reaction.message.clear_reactions()
+                await reaction.message.add_reaction("🏁")
+                await reaction.message.add_reaction("❌")
+            except discord.NotFound:
+                return
+            
+            game_session.start_round()
+            
+            # Incrémenter parties jouées et streak
+            if game_session.enabled:
+                await game_service.player_service.preload_players(game_session.members)
+                game_service.start_game(game_session.members)
+            
+            game_session.chrono_msg = await channel.send(
+                "━━━━━━━━━━━━━━━━━━━━━\n"
+                "⏱️ **CHRONOMÈTRE LANCÉ !**\n"
+                "Le temps vous est compté !\n"
+                "━━━━━━━━━━━━━━━━━━━━━"
+            )
     
     # ❌ Annuler la partie
     elif reaction.emoji == "❌" and reaction.message.author == bot.user:
-        try:
-            await reaction.message.clear_reactions()
-        except discord.NotFound:
-            pass
-        
-        await channel.send("━━━━━━━━━━━━━━━━━━━━━\n"
-                          "🚫 **PARTIE ANNULÉE**\n"
-                          "━━━━━━━━━━━━━━━━━━━━━")
-        game_session.timer.reset()
-        
-        # Décrémenter parties jouées et streak
-        if game_session.enabled:
-            player_service.decrement_played_games(game_session.members)
-        
-        try:
-            await reaction.message.delete()
-            if game_session.chrono_msg:
-                await game_session.chrono_msg.delete()
-        except discord.NotFound:
-            pass
+        async with game_session.lock:
+            # Seule une manche lancée et sans gagnant peut être annulée, une seule fois
+            if not game_session.is_round_running():
+                return
+            game_session.timer.reset()
+            game_session.round_token = None
+            
+            # Décrémenter parties jouées et streak
+            if game_session.enabled:
+                await game_service.player_service.preload_players(game_session.members)
+                game_service.cancel_game(game_session.members)
+            
+            try:
+                await reaction.message.clear_reactions()
+            except discord.NotFound:
+                pass
+            
+            await channel.send("━━━━━━━━━━━━━━━━━━━━━\n"
+                              "🚫 **PARTIE ANNULÉE**\n"
+                              "━━━━━━━━━━━━━━━━━━━━━")
+            
+            try:
+                await reaction.message.delete()
+                if game_session.chrono_msg:
+                    await game_session.chrono_msg.delete()
+            except discord.NotFound:
+                pass
     
     # 🏁 Terminer la partie
     elif reaction.emoji == "🏁" and reaction.message.author == bot.user:
-        try:
-            await reaction.message.clear_reactions()
-        except discord.NotFound:
-            pass
-        
-        game_session.timer.stop()
-        game_session.winner = user
-        
-        if game_session.enabled:
-            await channel.send(
-                f"> 🎉 **Félicitations {user.mention} !**\n"
-                f"> Vous avez relié **{game_session.parcours[0].title}** "
-                f"à **{game_session.parcours[1].title}**\n"
-                f"> ⏱️ Temps : **{game_session.timer.duration}s**\n\n"
-                f"> 💾 Pour enregistrer votre score : `%win <nombre_de_clics>`"
-            )
-        else:
-            await channel.send(
-                f"> 🎉 **Bravo {user.mention} !**\n"
-                f"> Temps : **{game_session.timer.duration}s**\n"
-                f"> ⚠️ *Partie non classée - score non enregistrable*"
-            )
+        async with game_session.lock:
+            # Le premier 🏁 désigne le gagnant, les suivants sont ignorés
+            if not game_session.is_round_running():
+                return
+            game_session.timer.stop()
+            game_session.winner = user
+            
+            try:
+                await reaction.message.clear_reactions()
+            except discord.NotFound:
+                pass
+            
+            if game_session.enabled:
+                await channel.send(
+                    f"> 🎉 **Félicitations {user.mention} !**\n"
+                    f"> Vous avez relié **{game_session.parcours[0].title}** "
+                    f"à **{game_session.parcours[1].title}**\n"
+                    f"> ⏱️ Temps : **{game_session.timer.duration}s**\n\n"
+                    f"> 💾 Pour enregistrer votre score : `/win <nombre_de_clics>`"
+                )
+            else:
+                await channel.send(
+                    f"> 🎉 **Bravo {user.mention} !**\n"
+                    f"> Temps : **{game_session.timer.duration}s**\n"
+                    f"> ⚠️ *Partie non classée - score non enregistrable*"
+                )
@@ -6,27 +6,29 @@ Gestion des événements vocaux
 """
 
 
-async def on_voice_state_update_handler(member, before, after, game_session, bot):
-    """Détecte quand un joueur quitte le salon vocal"""
+async def on_voice_state_update_handler(member, before, after, session_manager, bot):
+    """Détecte quand un joueur quitte le salon vocal d'une partie"""
     if member.bot:
         return
     
-    # Si le membre quitte le salon vocal
-    if before.channel and not after.channel:
-        if member.name in game_session.members:
-            # Retirer le membre de la session
-            game_session.members.remove(member.name)
+    # Si le membre quitte (ou change de) salon vocal
+    if before.channel and before.channel != after.channel:
+        key = (member.guild.id, before.channel.id)
+        game_session = session_manager.get(key)
+        if game_session is None:
+            return
+        
+        async with game_session.lock:
+            if member.name in game_session.members:
+                # Retirer le membre de la session
+                game_session.members.remove(member.name)
+                
+                # Si c'était le gagnant, réinitialiser
+                if game_session.winner and game_session.winner.name == member.name:
+                    game_session.winner = None
             
-            # Si c'était le gagnant, réinitialiser
-            if game_session.winner and game_session.winner.name == member.name:
-                game_session.winner = None
-            
-            # Si le salon vocal est vide, réinitialiser la session
-            if game_session.channel_id:
-                try:
-                    channel = bot.get_channel(game_session.channel_id)
-                    human_members = [m for m in channel.members if not m.bot]
-                    if not human_members:
-                        game_session.reset()
-                except:
-                    pass
\ No newline at end of file
+            # Si le salon vocal est vide, supprimer la session
+            human_members = [m for m in before.channel.members if not m.bot]
+            if not human_members:
+                game_session.reset()
+                session_manager.discard(key)
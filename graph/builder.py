@@ -0,0 +1,233 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Construction hors ligne du graphe de liens à partir des dumps Wikipédia
+
+Usage :
+    python -m graph.builder --lang fr --dumps ./dumps --out ../graph/fr
+
+Les dumps attendus (compressés ou non) sont ceux publiés sur dumps.wikimedia.org :
+    {lang}wiki-latest-page.sql.gz
+    {lang}wiki-latest-redirect.sql.gz
+    {lang}wiki-latest-pagelinks.sql.gz
+    {lang}wiki-latest-linktarget.sql.gz   (dumps récents uniquement)
+"""
+
+import argparse
+import json
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import Dict, Optional
+
+from graph.dump_reader import iter_rows
+from graph.link_graph import GRAPH_VERSION
+
+
+# Nombre d'arcs accumulés en mémoire avant écriture dans le fichier temporaire
+_EDGE_CHUNK = 1 << 20
+
+
+def _display_title(dump_title: str) -> str:
+    """Convertit un titre de dump (avec underscores) en titre affiché"""
+    return dump_title.replace('_', ' ')
+
+
+def _find_dump(dumps_dir: Path, lang: str, table: str) -> Optional[Path]:
+    """Retrouve le fichier de dump d'une table"""
+    for suffix in ('.sql.gz', '.sql'):
+        candidate = dumps_dir / f"{lang}wiki-latest-{table}{suffix}"
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _write_csr(out_dir: Path, name: str, node_count: int, counts: array,
+               edges_path: Path, reverse: bool) -> int:
+    """
+    Écrit une adjacence CSR (offsets + cibles) à partir du fichier d'arcs temporaire
+    Retourne: le nombre d'arcs écrits
+    """
+    offsets = array('Q', [0]) * (node_count + 1)
+    total = 0
+    for node in range(node_count):
+        offsets[node] = total
+        total += counts[node]
+    offsets[node_count] = total
+    with open(out_dir / f"{name}_offsets.bin", 'wb') as f:
+        offsets.tofile(f)
+
+    targets_path = out_dir / f"{name}_targets.bin"
+    with open(targets_path, 'wb') as f:
+        f.truncate(max(total, 1) * 4)
+    if total == 0:
+        return 0
+
+    # Répartition des arcs : le fichier cible est projeté en mémoire, pas chargé
+    cursor = array('Q', offsets[:node_count])
+    with open(targets_path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mapped:
+        targets = memoryview(mapped).cast('I')
+        try:
+            with open(edges_path, 'rb') as edges_file:
+                while True:
+                    chunk = array('I')
+                    try:
+                        chunk.fromfile(edges_file, _EDGE_CHUNK * 2)
+                    except EOFError:
+                        pass
+                    if not chunk:
+                        break
+                    for i in range(0, len(chunk), 2):
+                        src, dst = chunk[i], chunk[i + 1]
+                        if reverse:
+                            src, dst = dst, src
+                        targets[cursor[src]] = dst
+                        cursor[src] += 1
+        finally:
+            targets.release()
+    return total
+
+
+def build_graph(lang: str, page_dump: Path, redirect_dump: Path, pagelinks_dump: Path,
+                out_dir: Path, linktarget_dump: Optional[Path] = None) -> Dict:
+    """
+    Construit le graphe de liens d'une langue et l'écrit dans out_dir
+    Retourne: les métadonnées du graphe
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # 1. Pages de l'espace principal : articles et redirections
+    article_titles: Dict[str, int] = {}
+    redirect_pages: Dict[int, str] = {}
+    for row in iter_rows(page_dump, 'page'):
+        page_id, namespace, title = row[0], row[1], row[2]
+        # Les anciens dumps ont une colonne page_restrictions avant page_is_redirect
+        is_redirect = row[4] if isinstance(row[3], str) else row[3]
+        if namespace != 0:
+            continue
+        if is_redirect:
+            redirect_pages[page_id] = title
+        else:
+            article_titles[title] = page_id
+    print(f"📄 {len(article_titles)} articles, {len(redirect_pages)} redirections")
+
+    # 2. Interning : identifiants entiers dans l'ordre des titres affichés (octets UTF-8)
+    ordered = sorted(article_titles, key=lambda t: _display_title(t).encode('utf-8'))
+    node_count = len(ordered)
+    title_ids: Dict[str, int] = {}
+    page_to_node: Dict[int, int] = {}
+    page_ids = array('I')
+    title_offsets = array('Q')
+    with open(out_dir / "titles.bin", 'wb') as f:
+        position = 0
+        for node, title in enumerate(ordered):
+            title_ids[title] = node
+            page_id = article_titles[title]
+            page_to_node[page_id] = node
+            page_ids.append(page_id)
+            encoded = _display_title(title).encode('utf-8')
+            title_offsets.append(position)
+            f.write(encoded)
+            position += len(encoded)
+        title_offsets.append(position)
+    with open(out_dir / "title_offsets.bin", 'wb') as f:
+        title_offsets.tofile(f)
+    with open(out_dir / "page_ids.bin", 'wb') as f:
+        page_ids.tofile(f)
+    del article_titles, ordered, page_ids, title_offsets
+
+    # 3. Redirections : titre de la redirection -> article cible
+    for row in iter_rows(redirect_dump, 'redirect'):
+        from_id, namespace, target = row[0], row[1], row[2]
+        source_title = redirect_pages.get(from_id)
+        if source_title is None or namespace != 0:
+            continue
+        node = title_ids.get(target)
+        if node is not None:
+            title_ids[source_title] = node
+    del redirect_pages
+
+    # 4. Cibles de liens (format récent des dumps : pagelinks référence linktarget)
+    link_targets: Dict[int, int] = {}
+    if linktarget_dump is not None:
+        for row in iter_rows(linktarget_dump, 'linktarget'):
+            target_id, namespace, title = row[0], row[1], row[2]
+            if namespace == 0 and title in title_ids:
+                link_targets[target_id] = title_ids[title]
+
+    # 5. Arcs : écrits en flux dans un fichier temporaire, degrés comptés au passage
+    out_degree = array('I', [0]) * node_count
+    in_degree = array('I', [0]) * node_count
+    edges_path = out_dir / "edges.tmp"
+    edge_count = 0
+    buffer = array('I')
+    with open(edges_path, 'wb') as edges_file:
+        for row in iter_rows(pagelinks_dump, 'pagelinks'):
+            src = page_to_node.get(row[0])
+            if src is None:
+                continue
+            if isinstance(row[2], str):
+                # Ancien format : (pl_from, pl_namespace, pl_title, pl_from_namespace)
+                if row[1] != 0:
+                    continue
+                dst = title_ids.get(row[2])
+            else:
+                # Nouveau format : (pl_from, pl_from_namespace, pl_target_id)
+                dst = link_targets.get(row[2])
+            if dst is None or dst == src:
+                continue
+            buffer.append(src)
+            buffer.append(dst)
+            out_degree[src] += 1
+            in_degree[dst] += 1
+            edge_count += 1
+            if len(buffer) >= _EDGE_CHUNK * 2:
+                buffer.tofile(edges_file)
+                buffer = array('I')
+        buffer.tofile(edges_file)
+    del page_to_node, title_ids, link_targets, buffer
+    print(f"🔗 {edge_count} liens")
+
+    # 6. Adjacences CSR sortantes et entrantes
+    _write_csr(out_dir, "out", node_count, out_degree, edges_path, reverse=False)
+    _write_csr(out_dir, "in", node_count, in_degree, edges_path, reverse=True)
+    os.remove(edges_path)
+
+    meta = {
+        'version': GRAPH_VERSION,
+        'lang': lang,
+        'nodes': node_count,
+        'edges': edge_count,
+    }
+    with open(out_dir / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construit le graphe de liens Wikipédia hors ligne")
+    parser.add_argument('--lang', default='fr', help="Langue du wiki (défaut: fr)")
+    parser.add_argument('--dumps', type=Path, required=True, help="Répertoire des dumps SQL")
+    parser.add_argument('--out', type=Path, required=True, help="Répertoire de sortie du graphe")
+    args = parser.parse_args()
+
+    dumps = {
+        table: _find_dump(args.dumps, args.lang, table)
+        for table in ('page', 'redirect', 'pagelinks', 'linktarget')
+    }
+    for table in ('page', 'redirect', 'pagelinks'):
+        if dumps[table] is None:
+            parser.error(f"dump '{table}' introuvable dans {args.dumps}")
+
+    meta = build_graph(
+        args.lang, dumps['page'], dumps['redirect'], dumps['pagelinks'],
+        args.out, dumps['linktarget']
+    )
+    print(f"✅ Graphe écrit dans {args.out} : {meta['nodes']} articles, {meta['edges']} liens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Précalcul des distances vers un échantillon d'articles cibles
+
+Usage :
+    python -m graph.distances --graph ../graph/fr --targets 64
+
+Pour chaque cible, un parcours en largeur sur les liens entrants donne la distance
+(en clics) de chaque article vers la cible. Les tables (un octet par article,
+255 = inatteignable) permettent ensuite de tirer un départ à la difficulté voulue
+par simple lecture, sans recalculer de plus court chemin.
+"""
+
+import argparse
+import json
+import random
+from array import array
+from pathlib import Path
+from typing import Dict, List
+
+from graph.link_graph import LinkGraph, UNREACHABLE
+
+
+def compute_distances(graph: LinkGraph, target: int) -> bytearray:
+    """Distances de tous les articles vers target (BFS sur les liens entrants)"""
+    distances = bytearray([UNREACHABLE]) * len(graph)
+    distances[target] = 0
+    frontier = array('I', [target])
+    depth = 0
+    while frontier and depth < UNREACHABLE - 1:
+        depth += 1
+        next_frontier = array('I')
+        for node in frontier:
+            for source in graph.in_links(node):
+                if distances[source] == UNREACHABLE:
+                    distances[source] = depth
+                    next_frontier.append(source)
+        frontier = next_frontier
+    return distances
+
+
+def build_distance_tables(graph: LinkGraph, target_count: int, min_in_degree: int = 20,
+                          seed: int = None) -> List[Dict]:
+    """
+    Calcule et écrit les tables de distances d'un échantillon de cibles
+    Retourne: l'index des tables (cible et histogramme des distances)
+    """
+    rng = random.Random(seed)
+    out_dir = graph.graph_dir / "distances"
+    out_dir.mkdir(exist_ok=True)
+
+    index = []
+    chosen = set()
+    attempts = 0
+    while len(index) < target_count and attempts < target_count * 1000:
+        attempts += 1
+        target = rng.randrange(len(graph))
+        # Cibles assez citées pour offrir des départs à toutes les difficultés
+        if target in chosen or graph.in_degree(target) < min_in_degree:
+            continue
+        chosen.add(target)
+
+        distances = compute_distances(graph, target)
+        with open(out_dir / f"{target}.bin", 'wb') as f:
+            f.write(distances)
+        histogram = [0] * 256
+        for distance in distances:
+            histogram[distance] += 1
+        index.append({
+            'target': target,
+            'histogram': {str(d): c for d, c in enumerate(histogram) if c and d != UNREACHABLE},
+        })
+        print(f"🎯 {len(index)}/{target_count} : {graph.title(target)}")
+
+    with open(out_dir / "index.json", 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Précalcule les tables de distances du graphe")
+    parser.add_argument('--graph', type=Path, required=True, help="Répertoire du graphe")
+    parser.add_argument('--targets', type=int, default=64, help="Nombre de cibles (défaut: 64)")
+    parser.add_argument('--min-in-degree', type=int, default=20,
+                        help="Nombre minimal de liens entrants d'une cible (défaut: 20)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    graph = LinkGraph(args.graph)
+    index = build_distance_tables(graph, args.targets, args.min_in_degree, args.seed)
+    print(f"✅ {len(index)} table(s) écrite(s) dans {args.graph / 'distances'}")
+
+
+if __name__ == "__main__":
+    main()
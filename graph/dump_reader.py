@@ -0,0 +1,68 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Lecture en flux des dumps SQL de Wikipédia (page, redirect, pagelinks...)
+"""
+
+import gzip
+import re
+from pathlib import Path
+from typing import Iterator, Tuple
+
+
+# Jetons d'une instruction INSERT : chaîne, nombre, NULL, parenthèses
+_TOKEN = re.compile(
+    r"'((?:[^'\\]|\\.)*)'"
+    r"|(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+    r"|(NULL)"
+    r"|(\()"
+    r"|(\))"
+)
+
+_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+_ESCAPE = re.compile(r"\\(.)")
+
+
+def _unescape(value: str) -> str:
+    """Décode les séquences d'échappement MySQL d'une chaîne"""
+    if '\\' not in value:
+        return value
+    return _ESCAPE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), value)
+
+
+def _open(path: Path):
+    """Ouvre un dump compressé (.gz) ou brut en texte"""
+    path = Path(path)
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def iter_rows(path: Path, table: str) -> Iterator[Tuple]:
+    """
+    Parcourt les lignes d'une table d'un dump SQL, instruction par instruction
+    Le fichier n'est jamais chargé en entier : seule la ligne INSERT courante est en mémoire
+    """
+    prefix = f"INSERT INTO `{table}` VALUES "
+    with _open(path) as dump:
+        for line in dump:
+            if not line.startswith(prefix):
+                continue
+            row = None
+            for match in _TOKEN.finditer(line, len(prefix)):
+                string, number, null, opening, closing = match.groups()
+                if opening is not None:
+                    row = []
+                elif closing is not None:
+                    if row is not None:
+                        yield tuple(row)
+                    row = None
+                elif row is None:
+                    continue
+                elif string is not None:
+                    row.append(_unescape(string))
+                elif number is not None:
+                    row.append(float(number) if '.' in number or 'e' in number.lower() else int(number))
+                else:
+                    row.append(None)
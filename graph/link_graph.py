@@ -0,0 +1,211 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Graphe de liens Wikipédia hors ligne, projeté en mémoire depuis le disque
+"""
+
+import json
+import mmap
+import random
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+
+GRAPH_VERSION = 1
+
+# Distance stockée dans les tables précalculées pour un article inatteignable
+UNREACHABLE = 255
+
+
+class LinkGraph:
+    """
+    Graphe d'articles en adjacence CSR (tableaux offsets/cibles) projeté par mmap
+    Les identifiants entiers suivent l'ordre des titres, ce qui permet la recherche
+    d'un titre par dichotomie sans dictionnaire en mémoire
+    """
+
+    def __init__(self, graph_dir: Path):
+        self.graph_dir = Path(graph_dir)
+        with open(self.graph_dir / "meta.json", 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != GRAPH_VERSION:
+            raise ValueError(f"Version de graphe non supportée : {self.meta.get('version')}")
+        self.lang = self.meta['lang']
+        self.node_count = self.meta['nodes']
+
+        self._maps = []
+        self._titles = self._map("titles.bin")
+        self._title_offsets = memoryview(self._map("title_offsets.bin")).cast('Q')
+        self._page_ids = memoryview(self._map("page_ids.bin")).cast('I')
+        self._out_offsets = memoryview(self._map("out_offsets.bin")).cast('Q')
+        self._out_targets = memoryview(self._map("out_targets.bin")).cast('I')
+        self._in_offsets = memoryview(self._map("in_offsets.bin")).cast('Q')
+        self._in_targets = memoryview(self._map("in_targets.bin")).cast('I')
+        self.distance_tables = self._load_distance_tables()
+
+    def _map(self, name: str) -> mmap.mmap:
+        """Projette un fichier du graphe en lecture seule"""
+        with open(self.graph_dir / name, 'rb') as f:
+            if f.seek(0, 2) == 0:
+                # mmap refuse les fichiers vides : graphe sans article ni lien
+                return b''
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def _load_distance_tables(self) -> List[Tuple[int, mmap.mmap, Dict[int, int]]]:
+        """Projette les tables de distances précalculées (`python -m graph.distances`)"""
+        index_path = self.graph_dir / "distances" / "index.json"
+        if not index_path.exists():
+            return []
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        tables = []
+        for entry in index:
+            table = self._map(f"distances/{entry['target']}.bin")
+            histogram = {int(d): c for d, c in entry['histogram'].items()}
+            tables.append((entry['target'], table, histogram))
+        return tables
+
+    @classmethod
+    def open(cls, graph_dir: Path) -> Optional['LinkGraph']:
+        """Ouvre un graphe s'il a été construit dans graph_dir, sinon None"""
+        if graph_dir is None or not (Path(graph_dir) / "meta.json").exists():
+            return None
+        return cls(graph_dir)
+
+    def __len__(self) -> int:
+        return self.node_count
+
+    def title(self, node: int) -> str:
+        """Retourne le titre d'un article"""
+        start, end = self._title_offsets[node], self._title_offsets[node + 1]
+        return self._titles[start:end].decode('utf-8')
+
+    def page_id(self, node: int) -> int:
+        """Retourne l'identifiant MediaWiki d'un article"""
+        return self._page_ids[node]
+
+    def url(self, node: int) -> str:
+        """Retourne l'URL de l'article"""
+        title = self.title(node).replace(' ', '_')
+        return f"https://{self.lang}.wikipedia.org/wiki/{quote(title)}"
+
+    def find(self, title: str) -> Optional[int]:
+        """Retrouve l'identifiant d'un article par son titre (dichotomie)"""
+        wanted = title.replace('_', ' ').encode('utf-8')
+        low, high = 0, self.node_count
+        while low < high:
+            middle = (low + high) // 2
+            start, end = self._title_offsets[middle], self._title_offsets[middle + 1]
+            if self._titles[start:end] < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.node_count and self.title(low).encode('utf-8') == wanted:
+            return low
+        return None
+
+    def out_links(self, node: int) -> memoryview:
+        """Articles liés depuis un article"""
+        return self._out_targets[self._out_offsets[node]:self._out_offsets[node + 1]]
+
+    def in_links(self, node: int) -> memoryview:
+        """Articles qui pointent vers un article"""
+        return self._in_targets[self._in_offsets[node]:self._in_offsets[node + 1]]
+
+    def out_degree(self, node: int) -> int:
+        return self._out_offsets[node + 1] - self._out_offsets[node]
+
+    def in_degree(self, node: int) -> int:
+        return self._in_offsets[node + 1] - self._in_offsets[node]
+
+    def random_node(self, rng: random.Random = random) -> int:
+        """Tire un article ayant au moins un lien sortant"""
+        while True:
+            node = rng.randrange(self.node_count)
+            if self.out_degree(node) > 0:
+                return node
+
+    def random_walk(self, start: int, steps: int, rng: random.Random = random) -> Optional[List[int]]:
+        """Suit `steps` liens au hasard depuis start ; None si une impasse est atteinte"""
+        walk = [start]
+        node = start
+        for _ in range(steps):
+            links = self.out_links(node)
+            if not len(links):
+                return None
+            node = links[rng.randrange(len(links))]
+            walk.append(node)
+        return walk
+
+    def is_reachable(self, source: int, target: int, max_depth: int = 6,
+                     max_visits: int = 500000) -> bool:
+        """Vérifie par parcours en largeur borné que target est atteignable depuis source"""
+        if source == target:
+            return True
+        seen = {source}
+        frontier = deque([(source, 0)])
+        while frontier:
+            node, depth = frontier.popleft()
+            if depth >= max_depth:
+                continue
+            for neighbor in self.out_links(node):
+                if neighbor == target:
+                    return True
+                if neighbor not in seen:
+                    if len(seen) >= max_visits:
+                        return False
+                    seen.add(neighbor)
+                    frontier.append((neighbor, depth + 1))
+        return False
+
+    def sample_path(self, min_steps: int = 3, max_steps: int = 6,
+                    rng: random.Random = random, max_attempts: int = 100) -> Optional[tuple]:
+        """
+        Tire un couple (départ, arrivée) atteignable sans réseau :
+        l'arrivée est le terme d'une marche aléatoire depuis le départ
+        """
+        for _ in range(max_attempts):
+            start = self.random_node(rng)
+            walk = self.random_walk(start, rng.randint(min_steps, max_steps), rng)
+            if walk is None or walk[-1] == start:
+                continue
+            return start, walk[-1]
+        return None
+
+    def sample_path_in_band(self, min_clicks: int, max_clicks: Optional[int] = None,
+                            rng: random.Random = random,
+                            max_trials: int = 20000) -> Optional[Tuple[int, int, int]]:
+        """
+        Tire un couple (départ, arrivée, distance) dont la distance optimale est dans
+        [min_clicks, max_clicks] grâce aux tables précalculées : chaque essai est une lecture
+        """
+        upper = UNREACHABLE - 1 if max_clicks is None else max_clicks
+        weighted = []
+        for target, table, histogram in self.distance_tables:
+            count = sum(c for d, c in histogram.items() if min_clicks <= d <= upper)
+            if count:
+                weighted.append((count, target, table))
+        if not weighted:
+            return None
+
+        # Cible choisie selon son nombre de départs compatibles
+        count, target, table = rng.choices(weighted, weights=[w[0] for w in weighted])[0]
+        for _ in range(max_trials):
+            start = rng.randrange(self.node_count)
+            distance = table[start]
+            if min_clicks <= distance <= upper and start != target:
+                return start, target, distance
+        return None
+
+    def close(self) -> None:
+        """Libère les projections mémoire"""
+        for view in (self._title_offsets, self._page_ids, self._out_offsets,
+                     self._out_targets, self._in_offsets, self._in_targets):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
@@ -0,0 +1,55 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Génération de parcours dans des processus de travail (un graphe projeté par processus)
+"""
+
+import random
+from pathlib import Path
+from typing import Optional, Tuple
+
+from graph.link_graph import LinkGraph
+from services.path_solver import GraphPathSolver, in_band
+
+
+_graph: Optional[LinkGraph] = None
+_solver: Optional[GraphPathSolver] = None
+
+
+def init_worker(graph_dir: Path) -> None:
+    """Ouvre le graphe une fois par processus (les pages mmap sont partagées par l'OS)"""
+    global _graph, _solver
+    _graph = LinkGraph(graph_dir)
+    _solver = GraphPathSolver(_graph)
+
+
+def sample_path(band: Optional[Tuple] = None, max_attempts: int = 10,
+                seed: Optional[int] = None) -> Optional[Tuple[int, int, int, Optional[int]]]:
+    """
+    Tire un parcours, éventuellement dans une bande de difficulté (min, max) en clics
+    Retourne: (départ, arrivée, tentatives, clics optimaux) ou None
+    """
+    rng = random.Random(seed)
+
+    # Tables précalculées : une lecture par essai
+    if band is not None and _graph.distance_tables:
+        for attempt in range(1, max_attempts + 1):
+            found = _graph.sample_path_in_band(band[0], band[1], rng)
+            if found is not None:
+                start, target, distance = found
+                return start, target, attempt, distance
+        return None
+
+    # Sinon : tirage puis vérification par le solveur
+    for attempt in range(1, max_attempts + 1):
+        if band is None:
+            pair = _graph.sample_path(rng=rng)
+        else:
+            pair = (_graph.random_node(rng), _graph.random_node(rng))
+        if pair is None or pair[0] == pair[1]:
+            continue
+        distance = _solver.distance(*pair)
+        if in_band(distance, band):
+            return pair[0], pair[1], attempt, distance
+    return None
@@ -12,24 +12,46 @@ from discord.ext import commands
 
 
 # Imports de configuration
-from config.settings import TOKEN, DATA_DIR, WIKI_LANG, BOT_DESCRIPTION, BOT_ACTIVITY
+from config.settings import (
+    TOKEN, DATA_DIR, DB_PATH, STORAGE_BACKEND, PLAYER_CACHE_SIZE, PLAYER_FLUSH_INTERVAL, SESSION_IDLE_TTL,
+    ARTICLE_INDEX_PATH, PERIOD_ARCHIVE_DIR, EVENT_LOG_DIR, EVENT_LOG_SEGMENT_SIZE, EVENT_LOG_SNAPSHOT_INTERVAL,
+    EVENT_LOG_SYNC_INTERVAL, EVENT_LOG_PRUNE_SEGMENTS, ACHIEVEMENTS_RELOAD_INTERVAL,
+    WIKI_LANG, WIKI_RANDOM_PAGES, WIKI_MAX_CONCURRENCY, WIKI_BACKEND, WIKI_API_URL,
+    WIKI_GRAPH_DIR, WIKI_CACHE_PATH, WIKI_CACHE_MEMORY_SIZE, WIKI_CACHE_MAX_ENTRIES, WIKI_CACHE_TTLS,
+    MAX_GENERATION_ATTEMPTS,
+    PATH_POOL_SIZE, PATH_POOL_TTL, PATH_POOL_WORKERS, BOT_DESCRIPTION, BOT_ACTIVITY
+)
 from config.constants import (
     LEVEL_THRESHOLDS, RANKS, ACHIEVEMENTS, BASE_POINTS, BASE_XP_WIN, 
-    BASE_XP_LOSE, MIN_POINTS, TIME_BONUS_THRESHOLDS, CLICK_BONUS_THRESHOLDS
+    BASE_XP_LOSE, MIN_POINTS, TIME_BONUS_THRESHOLDS, CLICK_BONUS_THRESHOLDS,
+    DIFFICULTY_BANDS, ACHIEVEMENTS_FILE
 )
 
 # Imports des modèles
 from models.timer import Timer
-from models.game_session import GameSession
 
 # Imports des repositories
 from repositories.player_repository import PlayerRepository
+from repositories.sqlite_player_repository import SqlitePlayerRepository
+from repositories.cached_player_repository import CachedPlayerRepository
+from repositories.event_log import EventLog
+from repositories.article_index import ArticleIndex
 
 # Imports des services
 from services.player_service import PlayerService
 from services.game_service import GameService
 from services.stats_service import StatsService
+from services.event_replayer import EventReplayer
+from services.period_leaderboards import PeriodLeaderboards
+from services.achievement_reloader import AchievementReloader
 from services.wikipedia_service import WikipediaService
+from services.mediawiki_client import MediaWikiClient
+from services.wiki_cache import WikiCache
+from services.path_pool import PathPool
+from services.session_manager import SessionManager
+
+# Imports du graphe de liens hors ligne
+from graph.link_graph import LinkGraph
 
 # Imports des utilitaires
 from utils.formatters import Formatters
@@ -72,9 +94,23 @@ def main():
         help_command=None
     )
     
-    game_session = GameSession()
+    session_manager = SessionManager(SESSION_IDLE_TTL)
     
-    player_repository = PlayerRepository(DATA_DIR)
+    if STORAGE_BACKEND == "sqlite":
+        player_repository = SqlitePlayerRepository(DB_PATH)
+        # Migration unique depuis l'ancien répertoire de fichiers JSON
+        if player_repository.count() == 0:
+            imported, skipped = player_repository.import_json_directory(DATA_DIR)
+            if imported:
+                print(f"📦 {imported} joueur(s) importé(s) depuis {DATA_DIR}")
+            if skipped:
+                print(f"⚠️ {len(skipped)} fichier(s) illisible(s) non importé(s) : {', '.join(skipped)}")
+    else:
+        player_repository = PlayerRepository(DATA_DIR)
+    
+    player_repository = CachedPlayerRepository(
+        player_repository, PLAYER_CACHE_SIZE, PLAYER_FLUSH_INTERVAL
+    )
     
     constants = {
         'LEVEL_THRESHOLDS': LEVEL_THRESHOLDS,
@@ -88,10 +124,51 @@ def main():
         'CLICK_BONUS_THRESHOLDS': CLICK_BONUS_THRESHOLDS
     }
 
-    player_service = PlayerService(player_repository, constants)
+    article_index = ArticleIndex(ARTICLE_INDEX_PATH)
+    
+    event_log = None
+    if EVENT_LOG_DIR is not None:
+        event_log = EventLog(
+            EVENT_LOG_DIR, EVENT_LOG_SEGMENT_SIZE, EVENT_LOG_SNAPSHOT_INTERVAL,
+            sync_interval=EVENT_LOG_SYNC_INTERVAL
+        )
+        # Rejoue les événements postérieurs au dernier instantané (arrêt brutal)
+        repaired = EventReplayer(constants, article_index).recover(event_log, player_repository)
+        if repaired:
+            print(f"🔁 {repaired} joueur(s) réparé(s) depuis le journal d'événements")
+
+    period_leaderboards = PeriodLeaderboards(PERIOD_ARCHIVE_DIR)
+    player_service = PlayerService(player_repository, constants, periods=period_leaderboards)
     stats_service = StatsService(constants)
-    game_service = GameService(player_service, stats_service)
-    wikipedia_service = WikipediaService(WIKI_LANG)
+    game_service = GameService(
+        player_service, stats_service, event_log, article_index, EVENT_LOG_PRUNE_SEGMENTS
+    )
+    achievement_reloader = None
+    if ACHIEVEMENTS_RELOAD_INTERVAL is not None:
+        achievement_reloader = AchievementReloader(
+            ACHIEVEMENTS_FILE, player_service, ACHIEVEMENTS_RELOAD_INTERVAL
+        )
+    wiki_cache = WikiCache(
+        WIKI_CACHE_PATH, WIKI_CACHE_MEMORY_SIZE, WIKI_CACHE_MAX_ENTRIES, WIKI_CACHE_TTLS
+    )
+    wiki_client = None
+    if WIKI_BACKEND == "api":
+        wiki_client = MediaWikiClient(
+            WIKI_LANG, WIKI_API_URL, WIKI_MAX_CONCURRENCY, cache=wiki_cache
+        )
+    link_graph = LinkGraph.open(WIKI_GRAPH_DIR)
+    if link_graph is not None:
+        print(f"🕸️ Graphe hors ligne chargé : {len(link_graph)} articles")
+    wikipedia_service = WikipediaService(
+        WIKI_LANG, WIKI_RANDOM_PAGES, WIKI_MAX_CONCURRENCY, wiki_client, wiki_cache, link_graph,
+        workers=PATH_POOL_WORKERS
+    )
+    if link_graph is not None and link_graph.distance_tables:
+        print(f"🎯 Tables de difficulté : {len(link_graph.distance_tables)} cible(s)")
+    path_pool = PathPool(
+        {WIKI_LANG: wikipedia_service}, WIKI_LANG,
+        PATH_POOL_SIZE, PATH_POOL_TTL, MAX_GENERATION_ATTEMPTS, DIFFICULTY_BANDS
+    )
 
     formatters = Formatters()
     calculators = Calculators()
@@ -100,6 +177,29 @@ def main():
     embed_creator = EmbedCreator()
     
     # Configuration des événements
+    @bot.event
+    async def setup_hook():
+        # Index de classement construit une fois, hors de la boucle, avant toute commande
+        await player_service.ensure_rank_index_async()
+        player_repository.start()
+        path_pool.start()
+        if achievement_reloader is not None:
+            achievement_reloader.start()
+    
+    # Arrêt propre des tâches de fond et du client HTTP avant la déconnexion
+    bot_close = bot.close
+    
+    async def close():
+        await path_pool.stop()
+        if achievement_reloader is not None:
+            await achievement_reloader.stop()
+        await wikipedia_service.aclose()
+        await bot_close()
+        # Plus aucune interaction : arrêt du flush périodique et écriture du reste, hors boucle
+        await player_repository.stop()
+    
+    bot.close = close
+    
     @bot.event
     async def on_ready():
         await bot.change_presence(activity=discord.Game(BOT_ACTIVITY))
@@ -117,18 +217,18 @@ def main():
         way_cmd = bot.tree.get_command('way')
         
         await on_reaction_add_handler(
-            reaction, user, bot, game_session, 
-            player_service, way_cmd
+            reaction, user, bot, session_manager, 
+            game_service, way_cmd
         )
     
     @bot.event
     async def on_voice_state_update(member, before, after):
-        await on_voice_state_update_handler(member, before, after, game_session, bot)
+        await on_voice_state_update_handler(member, before, after, session_manager, bot)
     
     # Configuration des commandes (slash commands)
     setup_game_commands(
-        bot, game_session, player_service, game_service, 
-        wikipedia_service, embed_creator, formatters, validators
+        bot, session_manager, player_service, game_service, 
+        wikipedia_service, path_pool, embed_creator, formatters, validators
     )
     
     setup_stats_commands(
@@ -136,12 +236,20 @@ def main():
     )
     
     setup_utility_commands(
-        bot, game_session, wikipedia_service, embed_creator, formatters
+        bot, session_manager, wikipedia_service, path_pool, embed_creator, formatters,
+        achievement_reloader
     )
     
     # Lancement du bot
     print("Démarrage de WikiBot...")
     bot.run(TOKEN)
+    
+    # Arrêt du thread d'écriture (le reste a été écrit par close() ; filet si bot.run a échoué)
+    player_repository.close()
+    if event_log is not None:
+        event_log.close()
+    article_index.close()
+    period_leaderboards.close()
 
 
 if __name__ == "__main__":
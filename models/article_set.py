@@ -0,0 +1,91 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Ensemble compact d'identifiants d'articles visités par un joueur
+"""
+
+import base64
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# Entiers non signés sur 32 bits
+_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+
+
+class ArticleSet:
+    """
+    Identifiants d'articles (voir ArticleIndex) triés dans un tableau d'entiers 32 bits
+    Sérialisé en texte pour les fichiers joueurs : "z1:" + base64(zlib(entiers little-endian))
+    """
+
+    __slots__ = ('ids',)
+
+    PREFIX = "z1:"
+
+    def __init__(self, ids: Optional[Iterable[int]] = None):
+        self.ids = array(_TYPECODE, sorted(set(ids)) if ids else ())
+
+    def add(self, article_id: int) -> bool:
+        """Ajoute un identifiant. Retourne: True s'il était absent"""
+        ids = self.ids
+        index = bisect_left(ids, article_id)
+        if index < len(ids) and ids[index] == article_id:
+            return False
+        ids.insert(index, article_id)
+        return True
+
+    def __contains__(self, article_id: int) -> bool:
+        ids = self.ids
+        index = bisect_left(ids, article_id)
+        return index < len(ids) and ids[index] == article_id
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def encode(self) -> str:
+        """Forme sérialisée, chaîne vide pour un ensemble vide"""
+        if not self.ids:
+            return ""
+        ids = self.ids
+        if sys.byteorder == 'big':
+            ids = array(_TYPECODE, ids)
+            ids.byteswap()
+        return self.PREFIX + base64.b64encode(zlib.compress(ids.tobytes())).decode('ascii')
+
+    @classmethod
+    def decode(cls, value: str) -> 'ArticleSet':
+        """Reconstruit un ensemble depuis sa forme sérialisée"""
+        article_set = cls()
+        if not value:
+            return article_set
+        if not value.startswith(cls.PREFIX):
+            raise ValueError(f"Format d'articles visités inconnu : {value[:8]!r}")
+        article_set.ids.frombytes(zlib.decompress(base64.b64decode(value[len(cls.PREFIX):])))
+        if sys.byteorder == 'big':
+            article_set.ids.byteswap()
+        return article_set
+
+    @classmethod
+    def from_field(cls, value: Any, article_index) -> 'ArticleSet':
+        """
+        Lit le champ articles_visited d'un joueur
+        Les anciens fichiers contiennent une liste de titres : ils sont internés au passage
+        """
+        if isinstance(value, list):
+            return cls(article_index.intern(title) for title in value)
+        return cls.decode(value or "")
+
+
+def articles_count(player_data: Dict) -> int:
+    """Nombre d'articles visités d'un joueur, y compris pour un ancien fichier"""
+    if 'articles_count' in player_data:
+        return player_data['articles_count']
+    visited = player_data.get('articles_visited')
+    return len(visited) if isinstance(visited, list) else 0
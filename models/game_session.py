@@ -5,8 +5,11 @@
 Modèle GameSession pour gérer l'état d'une partie
 """
 
+import asyncio
+import uuid
 import discord
 from models.timer import Timer
+from models.path_endpoint import PathEndpoint
 from typing import Optional, List
 from datetime import datetime
 
@@ -15,7 +18,7 @@ class GameSession:
     """Gestion d'une session de jeu"""
     
     def __init__(self):
-        self.parcours: List = []
+        self.parcours: List[PathEndpoint] = []
         self.enabled: bool = False
         self.members: List[str] = []
         self.timer: Timer = Timer()
@@ -23,6 +26,10 @@ class GameSession:
         self.chrono_msg: Optional[discord.Message] = None
         self.channel_id: Optional[int] = None
         self.start_time: Optional[datetime] = None
+        # Sérialise les interactions concurrentes sur cette session uniquement
+        self.lock: asyncio.Lock = asyncio.Lock()
+        # Jeton de la manche en cours, consommé par l'enregistrement de la victoire
+        self.round_token: Optional[str] = None
     
     def reset(self) -> None:
         """Réinitialise la session"""
@@ -34,6 +41,7 @@ class GameSession:
         self.chrono_msg = None
         self.channel_id = None
         self.start_time = None
+        self.round_token = None
     
     def is_active(self) -> bool:
         """Vérifie si une partie est active"""
@@ -43,9 +51,26 @@ class GameSession:
         """Vérifie si un parcours existe"""
         return len(self.parcours) == 2
     
+    @property
+    def optimal_clicks(self) -> Optional[int]:
+        """Nombre minimal de clics du parcours en cours, s'il est connu"""
+        if not self.has_path():
+            return None
+        return self.parcours[1].optimal
+    
+    def start_round(self) -> None:
+        """Lance le chronomètre et ouvre une nouvelle manche"""
+        self.timer.start()
+        self.round_token = uuid.uuid4().hex
+    
+    def is_round_running(self) -> bool:
+        """Vérifie si une manche est lancée et sans gagnant"""
+        return self.timer.start_time is not None and self.winner is None
+    
     def reset_round(self) -> None:
         """Réinitialise uniquement le tour actuel (pas toute la session)"""
         self.parcours = []
         self.timer.reset()
         self.winner = None
-        self.chrono_msg = None
\ No newline at end of file
+        self.chrono_msg = None
+        self.round_token = None
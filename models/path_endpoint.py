@@ -0,0 +1,51 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Modèle PathEndpoint : extrémité compacte d'un parcours Wikipédia
+"""
+
+from typing import List, Optional
+
+
+class PathEndpoint:
+    """
+    Référence légère vers un article (départ ou arrivée d'un parcours)
+    Seuls l'identifiant, le titre et l'URL sont conservés, jamais le contenu de la page
+    """
+    
+    __slots__ = ('page_id', 'title', 'url', 'lang', 'optimal')
+    
+    def __init__(self, page_id: int, title: str, url: str, lang: str,
+                 optimal: Optional[int] = None):
+        self.page_id = page_id
+        self.title = title
+        self.url = url
+        self.lang = lang
+        # Nombre minimal de clics depuis le départ (renseigné sur l'arrivée)
+        self.optimal = optimal
+    
+    @classmethod
+    def from_wikipedia_page(cls, page, lang: str) -> 'PathEndpoint':
+        """Extrait la référence d'un objet WikipediaPage de la bibliothèque wikipedia"""
+        return cls(int(page.pageid), page.title, page.url, lang)
+    
+    def to_list(self) -> List:
+        """Sérialise la référence (cache, journaux)"""
+        return [self.page_id, self.title, self.url, self.lang]
+    
+    @classmethod
+    def from_list(cls, values: List) -> 'PathEndpoint':
+        """Reconstruit une référence sérialisée par to_list"""
+        return cls(*values)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PathEndpoint):
+            return NotImplemented
+        return (self.lang, self.page_id) == (other.lang, other.page_id)
+    
+    def __hash__(self) -> int:
+        return hash((self.lang, self.page_id))
+    
+    def __repr__(self) -> str:
+        return f"PathEndpoint({self.page_id}, {self.title!r}, lang={self.lang!r})"
@@ -36,7 +36,8 @@ class Player:
         
         # Achievements
         self.achievements = data.get('achievements', [])
-        self.articles_visited = data.get('articles_visited', [])
+        self.articles_visited = data.get('articles_visited', "")
+        self.articles_count = data.get('articles_count', 0)
         
         # Historique
         self.last_played = data.get('last_played')
@@ -63,6 +64,7 @@ class Player:
             'best_win_streak': self.best_win_streak,
             'achievements': self.achievements,
             'articles_visited': self.articles_visited,
+            'articles_count': self.articles_count,
             'last_played': self.last_played,
             'created_at': self.created_at
         }
@@ -88,7 +90,9 @@ class Player:
             'win_streak': 0,
             'best_win_streak': 0,
             'achievements': [],
-            'articles_visited': [],
+            # Identifiants d'articles sérialisés (voir ArticleSet) et leur nombre
+            'articles_visited': "",
+            'articles_count': 0,
             'last_played': None,
             'created_at': datetime.now().isoformat()
         }
@@ -0,0 +1,90 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Table d'internement des titres d'articles : titre <-> identifiant entier
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ArticleIndex:
+    """
+    Attribue à chaque titre d'article un identifiant stable, partagé par tous les joueurs
+    Persistée en ajout seul : la ligne n du fichier contient le titre d'identifiant n
+    Sans chemin, la table reste en mémoire
+    """
+
+    def __init__(self, path: Optional[Path] = None, fsync: bool = True):
+        self.path = Path(path) if path is not None else None
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._titles: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._file = None
+        if self.path is not None:
+            self._load()
+            self._file = open(self.path, 'ab')
+
+    def _load(self) -> None:
+        """Charge les titres connus et tronque une éventuelle ligne incomplète"""
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            return
+        valid_size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                title = line[:-1].decode('utf-8')
+                self._ids.setdefault(title, len(self._titles))
+                self._titles.append(title)
+                valid_size += len(line)
+        if valid_size < self.path.stat().st_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_size)
+
+    def intern(self, title: str) -> int:
+        """Retourne l'identifiant d'un titre, en l'ajoutant à la table s'il est nouveau"""
+        article_id = self._ids.get(title)
+        if article_id is None and '\n' in title:
+            # Un titre par ligne dans le fichier
+            title = title.replace('\n', ' ')
+            article_id = self._ids.get(title)
+        if article_id is not None:
+            return article_id
+        with self._lock:
+            article_id = self._ids.get(title)
+            if article_id is not None:
+                return article_id
+            # Écrit sur disque avant que l'identifiant n'apparaisse dans un fichier joueur
+            if self._file is not None:
+                self._file.write(title.encode('utf-8') + b'\n')
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            article_id = len(self._titles)
+            self._titles.append(title)
+            self._ids[title] = article_id
+            return article_id
+
+    def get_id(self, title: str) -> Optional[int]:
+        """Identifiant d'un titre déjà interné, ou None"""
+        return self._ids.get(title)
+
+    def title(self, article_id: int) -> str:
+        """Titre correspondant à un identifiant"""
+        return self._titles[article_id]
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def close(self) -> None:
+        """Ferme le fichier de la table"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
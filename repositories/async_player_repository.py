@@ -0,0 +1,61 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Accès asynchrone à un repository de joueurs, hors de la boucle d'événements
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+
+class AsyncPlayerRepository:
+    """
+    Exécute les opérations d'un repository synchrone dans un thread dédié
+    Un seul thread : les écritures sont appliquées dans l'ordre où elles sont demandées,
+    et la sérialisation JSON comme les accès disque se font hors de la boucle
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="player-io")
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def exists(self, player_name: str) -> bool:
+        return await self._run(self.backend.exists, player_name)
+
+    async def load(self, player_name: str) -> Optional[Dict]:
+        return await self._run(self.backend.load, player_name)
+
+    async def load_many(self, player_names: Iterable[str]) -> Dict[str, Dict]:
+        return await self._run(self.backend.load_many, list(player_names))
+
+    async def save(self, player_name: str, data: Dict) -> None:
+        await self._run(self.backend.save, player_name, data)
+
+    async def save_many(self, players: Dict[str, Dict]) -> None:
+        await self._run(self.backend.save_many, players)
+
+    async def get_all(self) -> List[Dict]:
+        return await self._run(self.backend.get_all)
+
+    async def delete(self, player_name: str) -> bool:
+        return await self._run(self.backend.delete, player_name)
+
+    def submit(self, func, *args) -> "asyncio.Future":
+        """
+        Soumet immédiatement une fonction quelconque au thread dédié, à la suite des
+        opérations en cours, et retourne le future de son résultat
+        """
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def run_sync(self, func, *args):
+        """Exécute une opération dans le thread dédié et attend son résultat (hors boucle)"""
+        return self._executor.submit(func, *args).result()
+
+    def close(self) -> None:
+        """Attend la fin des opérations en cours et arrête le thread"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,254 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Cache mémoire à écriture différée devant un repository de joueurs
+"""
+
+import asyncio
+import copy
+from collections import OrderedDict
+from typing import Optional, List, Dict, Iterable, Set
+
+from repositories.async_player_repository import AsyncPlayerRepository
+
+
+class CachedPlayerRepository:
+    """
+    Cache LRU borné avec suivi des joueurs modifiés et flush périodique
+    Les écritures passent toutes par le thread d'un AsyncPlayerRepository : elles restent
+    ordonnées et le flush périodique ne bloque pas la boucle d'événements
+    Les dicts du cache ne sont jamais modifiés sur place (copies à la lecture et à l'écriture),
+    le thread d'écriture peut donc les sérialiser pendant que la boucle continue
+    Depuis la boucle, les variantes *_async attendent le backend sans la bloquer ; les
+    méthodes synchrones restent pour le démarrage, l'arrêt et les outils
+    """
+
+    def __init__(self, backend, capacity: int = 512, flush_interval: float = 5.0):
+        self.backend = backend
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._dirty: Set[str] = set()
+        # Joueurs modifiés évincés du cache, en attente du prochain flush
+        self._evicted: Dict[str, Dict] = {}
+        self._writer = AsyncPlayerRepository(backend)
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _remember(self, player_name: str, data: Dict) -> None:
+        """Place un joueur en tête du cache et évince les plus anciens"""
+        # De retour dans le cache : l'éventuelle copie évincée est périmée
+        self._evicted.pop(player_name, None)
+        self._cache[player_name] = data
+        self._cache.move_to_end(player_name)
+        while len(self._cache) > self.capacity:
+            old_name, old_data = self._cache.popitem(last=False)
+            if old_name in self._dirty:
+                # Pas d'écriture synchrone ici : le joueur part avec le prochain lot
+                self._evicted[old_name] = old_data
+
+    def _pending(self, player_name: str) -> Optional[Dict]:
+        """Données en mémoire d'un joueur (cache ou évincé en attente d'écriture)"""
+        data = self._cache.get(player_name)
+        if data is None:
+            data = self._evicted.get(player_name)
+        return data
+
+    def exists(self, player_name: str) -> bool:
+        """Vérifie si un joueur existe"""
+        return (
+            self._pending(player_name) is not None
+            or self._writer.run_sync(self.backend.exists, player_name)
+        )
+
+    def load(self, player_name: str) -> Optional[Dict]:
+        """Charge les données d'un joueur, depuis la mémoire si possible"""
+        data = self._cache.get(player_name)
+        if data is None:
+            # Lectures du backend dans le thread d'écriture : jamais avant un lot en cours
+            data = self._evicted.get(player_name) or self._writer.run_sync(self.backend.load, player_name)
+            if data is None:
+                return None
+            self._remember(player_name, data)
+        else:
+            self._cache.move_to_end(player_name)
+        # Copie : l'appelant peut modifier le dict sans altérer le cache
+        return copy.deepcopy(data)
+
+    async def exists_async(self, player_name: str) -> bool:
+        """Comme exists(), sans bloquer la boucle"""
+        return self._pending(player_name) is not None or await self._writer.exists(player_name)
+
+    async def load_async(self, player_name: str) -> Optional[Dict]:
+        """Comme load(), sans bloquer la boucle"""
+        if self._pending(player_name) is None:
+            data = await self._writer.load(player_name)
+            # Chargé entre-temps par la boucle : la version en mémoire est plus récente
+            if data is not None and self._pending(player_name) is None:
+                self._remember(player_name, data)
+        return self.load(player_name) if self._pending(player_name) is not None else None
+
+    def save(self, player_name: str, data: Dict) -> None:
+        """Enregistre un joueur en mémoire ; l'écriture disque est différée"""
+        self._dirty.add(player_name)
+        self._remember(player_name, copy.deepcopy(data))
+
+    def load_many(self, player_names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Charge plusieurs joueurs : ceux absents du cache en un seul appel au backend
+        Retourne: {nom: données} pour les joueurs existants
+        """
+        players = {}
+        missing = []
+        for player_name in dict.fromkeys(player_names):
+            data = self._cache.get(player_name)
+            if data is None:
+                data = self._evicted.get(player_name)
+                if data is None:
+                    missing.append(player_name)
+                    continue
+                self._remember(player_name, data)
+            else:
+                self._cache.move_to_end(player_name)
+            players[player_name] = copy.deepcopy(data)
+        if missing:
+            for player_name, data in self._writer.run_sync(self.backend.load_many, missing).items():
+                self._remember(player_name, data)
+                players[player_name] = copy.deepcopy(data)
+        return players
+
+    async def load_many_async(self, player_names: Iterable[str]) -> Dict[str, Dict]:
+        """Comme load_many(), sans bloquer la boucle"""
+        player_names = list(dict.fromkeys(player_names))
+        missing = [name for name in player_names if self._pending(name) is None]
+        if missing:
+            for player_name, data in (await self._writer.load_many(missing)).items():
+                if self._pending(player_name) is None:
+                    self._remember(player_name, data)
+        return self.load_many(name for name in player_names if self._pending(name) is not None)
+    
+    def save_many(self, players: Dict[str, Dict]) -> None:
+        """Enregistre plusieurs joueurs en mémoire ; l'écriture disque est différée"""
+        for player_name, data in players.items():
+            self.save(player_name, data)
+    
+    def get_all(self) -> List[Dict]:
+        """Retourne tous les joueurs (après écriture des modifications en attente)"""
+        self.flush()
+        return self._writer.run_sync(self.backend.get_all)
+
+    async def get_all_async(self) -> List[Dict]:
+        """Comme get_all(), sans bloquer la boucle"""
+        return await self.run_after_flush(self.backend.get_all)
+
+    def run_after_flush(self, func, *args) -> "asyncio.Future":
+        """
+        Écrit les joueurs modifiés puis exécute func dans le thread d'écriture
+        Les deux sont soumis dès l'appel : func voit le backend dans l'état qu'avait la boucle
+        à cet instant, sans les modifications ultérieures, même si le future est attendu plus tard
+        Retourne: le future du résultat de func
+        """
+        batch = self._take_batch()
+        backend = self.backend
+
+        def job():
+            if batch:
+                backend.save_many(batch)
+            return func(*args)
+
+        def settle(future: "asyncio.Future") -> None:
+            # Annulation comprise : le lot reste à écrire
+            error = asyncio.CancelledError() if future.cancelled() else future.exception()
+            self._written(batch, error)
+
+        future = self._writer.submit(job)
+        future.add_done_callback(settle)
+        return future
+
+    def delete(self, player_name: str) -> bool:
+        """Supprime un joueur"""
+        cached = self._cache.pop(player_name, None) is not None
+        cached = self._evicted.pop(player_name, None) is not None or cached
+        self._dirty.discard(player_name)
+        return self._writer.run_sync(self.backend.delete, player_name) or cached
+
+    def _take_batch(self) -> Dict[str, Dict]:
+        """Retire les joueurs modifiés du suivi et retourne le lot à écrire"""
+        batch = {}
+        for player_name in self._dirty:
+            data = self._pending(player_name)
+            if data is not None:
+                batch[player_name] = data
+        self._dirty.clear()
+        return batch
+
+    def _written(self, batch: Dict[str, Dict], error: Optional[BaseException]) -> None:
+        """Solde un lot : libère les évincés écrits, ou remarque le lot modifié en cas d'échec"""
+        if error is not None:
+            self._dirty.update(batch)
+            return
+        for player_name, data in batch.items():
+            if self._evicted.get(player_name) is data:
+                del self._evicted[player_name]
+
+    def flush(self) -> int:
+        """
+        Écrit tous les joueurs modifiés dans le backend et attend la fin de l'écriture
+        Retourne: le nombre de joueurs écrits
+        """
+        batch = self._take_batch()
+        if not batch:
+            return 0
+        try:
+            # Une seule transaction (SQLite) ou un seul passage (fichiers) pour tout le lot
+            self._writer.run_sync(self.backend.save_many, batch)
+        except BaseException as e:
+            self._written(batch, e)
+            raise
+        self._written(batch, None)
+        return len(batch)
+
+    async def flush_async(self) -> int:
+        """Comme flush(), mais la sérialisation et l'écriture se font hors de la boucle"""
+        batch = self._take_batch()
+        if not batch:
+            return 0
+        try:
+            await self._writer.save_many(batch)
+        except BaseException as e:
+            # Annulation comprise (arrêt pendant l'écriture) : le lot est remarqué modifié
+            # et repart avec le prochain flush plutôt que d'être perdu
+            self._written(batch, e)
+            raise
+        self._written(batch, None)
+        return len(batch)
+
+    async def _flush_loop(self) -> None:
+        """Regroupe les écritures toutes les `flush_interval` secondes"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush_async()
+            except Exception as e:
+                print(f"❌ Erreur lors de l'écriture des joueurs: {e}")
+
+    def start(self) -> None:
+        """Démarre la tâche de flush périodique (boucle asyncio en cours requise)"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Arrête la tâche de flush et écrit tout ce qui reste"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush_async()
+
+    def close(self) -> None:
+        """Écrit tout ce qui reste (arrêt du bot) et arrête le thread d'écriture"""
+        self.flush()
+        self._writer.close()
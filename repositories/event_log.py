@@ -0,0 +1,250 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Journal d'événements de jeu en ajout seul (JSON lines), avec instantanés des agrégats
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Décodeur partagé : raw_decode sur du texte évite la détection d'encodage de json.loads
+_DECODER = json.JSONDecoder()
+
+
+class EventLog:
+    """
+    Journal append-only découpé en segments `events-<seq>.jsonl`
+    Chaque événement est écrit et synchronisé sur disque avant d'être appliqué aux joueurs ;
+    avec sync_interval, les fsync sont regroupés par un thread dédié (un par intervalle au plus)
+    et un arrêt brutal peut perdre les événements de ce dernier intervalle ; des instantanés `snapshot-<seq>.json` des agrégats bornent la relecture au démarrage
+    """
+
+    def __init__(self, log_dir: Path, segment_size: int = 100000, snapshot_interval: int = 1000,
+                 fsync: bool = True, sync_interval: float = 0.0):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+        self._segment_count = 0
+        self.last_seq = self._recover_tail()
+        self.last_snapshot_seq = self.latest_snapshot_seq() or 0
+        # Synchronisation groupée : événements écrits mais pas encore synchronisés
+        self.sync_interval = sync_interval
+        self._unsynced = False
+        self._sync_stop = threading.Event()
+        self._sync_thread = None
+        if fsync and sync_interval > 0:
+            self._sync_thread = threading.Thread(
+                target=self._sync_loop, name="event-log-sync", daemon=True
+            )
+            self._sync_thread.start()
+
+    # --- Segments ---
+
+    def _segments(self) -> List[Tuple[int, Path]]:
+        """Segments triés par premier numéro de séquence"""
+        segments = []
+        for path in self.log_dir.glob("events-*.jsonl"):
+            segments.append((int(path.stem.split('-')[1]), path))
+        return sorted(segments)
+
+    def _recover_tail(self) -> int:
+        """
+        Retrouve le dernier numéro de séquence et tronque une éventuelle ligne
+        incomplète laissée par un arrêt brutal pendant une écriture
+        """
+        segments = self._segments()
+        if not segments:
+            return 0
+        first_seq, path = segments[-1]
+        last_seq = first_seq - 1
+        count = 0
+        valid_size = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break
+                last_seq = event['seq']
+                count += 1
+                valid_size += len(line)
+        if valid_size < path.stat().st_size:
+            with open(path, 'r+b') as f:
+                f.truncate(valid_size)
+        self._segment_count = count
+        return last_seq
+
+    def _open_segment(self) -> None:
+        """Ouvre le segment courant, ou en commence un nouveau s'il est plein"""
+        segments = self._segments()
+        if segments and self._segment_count < self.segment_size:
+            path = segments[-1][1]
+        else:
+            path = self.log_dir / f"events-{self.last_seq + 1:012d}.jsonl"
+            self._segment_count = 0
+        self._file = open(path, 'ab')
+
+    def append(self, event_type: str, **payload) -> Dict:
+        """Ajoute un événement au journal et le retourne avec son numéro et son horodatage"""
+        with self._lock:
+            if self._file is None or self._segment_count >= self.segment_size:
+                if self._file is not None:
+                    if self._unsynced:
+                        os.fsync(self._file.fileno())
+                        self._unsynced = False
+                    self._file.close()
+                    self._file = None
+                self._open_segment()
+            event = {'seq': self.last_seq + 1, 'ts': time.time(), 'type': event_type, **payload}
+            line = json.dumps(event, separators=(',', ':'), ensure_ascii=False) + '\n'
+            self._file.write(line.encode('utf-8'))
+            self._file.flush()
+            if self._sync_thread is not None:
+                self._unsynced = True
+            elif self.fsync:
+                os.fsync(self._file.fileno())
+            self.last_seq = event['seq']
+            self._segment_count += 1
+            return event
+
+    def sync(self) -> None:
+        """Synchronise sur disque les événements écrits depuis la dernière synchronisation"""
+        with self._lock:
+            if not self._unsynced or self._file is None:
+                return
+            self._unsynced = False
+            # Copie du descripteur : le fsync se fait hors du verrou, sans bloquer append
+            fd = os.dup(self._file.fileno())
+        try:
+            os.fsync(fd)
+        except OSError:
+            self._unsynced = True
+            raise
+        finally:
+            os.close(fd)
+
+    def _sync_loop(self) -> None:
+        """Synchronise le segment courant toutes les `sync_interval` secondes"""
+        while not self._sync_stop.wait(self.sync_interval):
+            try:
+                self.sync()
+            except OSError as e:
+                print(f"❌ Erreur de synchronisation du journal: {e}")
+
+    def iter_events(self, after_seq: int = 0) -> Iterator[Dict]:
+        """Parcourt les événements de numéro strictement supérieur à after_seq"""
+        segments = self._segments()
+        for index, (first_seq, path) in enumerate(segments):
+            # Segment entièrement déjà appliqué : le suivant commence au plus tard après after_seq
+            if index + 1 < len(segments) and segments[index + 1][0] <= after_seq + 1:
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        break
+                    event = _DECODER.raw_decode(line)[0]
+                    if event['seq'] > after_seq:
+                        yield event
+
+    # --- Instantanés ---
+
+    def _snapshots(self) -> List[Tuple[int, Path]]:
+        snapshots = []
+        for path in self.log_dir.glob("snapshot-*.json"):
+            snapshots.append((int(path.stem.split('-')[1]), path))
+        return sorted(snapshots)
+
+    def latest_snapshot_seq(self) -> Optional[int]:
+        """Numéro de séquence du dernier instantané, ou None"""
+        snapshots = self._snapshots()
+        return snapshots[-1][0] if snapshots else None
+
+    def earliest_snapshot_seq(self) -> Optional[int]:
+        """Numéro de séquence du premier instantané (base d'une relecture complète), ou None"""
+        snapshots = self._snapshots()
+        return snapshots[0][0] if snapshots else None
+
+    def load_snapshot(self, seq: Optional[int] = None) -> Optional[Dict]:
+        """
+        Charge le dernier instantané de numéro inférieur ou égal à seq (le plus récent par défaut)
+        Retourne: {'seq': ..., 'ts': ..., 'players': {nom: données}} ou None
+        """
+        candidates = [p for s, p in self._snapshots() if seq is None or s <= seq]
+        if not candidates:
+            return None
+        with open(candidates[-1], 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_snapshot(self, players: Dict[str, Dict], seq: Optional[int] = None) -> Path:
+        """Écrit atomiquement un instantané des agrégats au numéro de séquence donné"""
+        seq = self.last_seq if seq is None else seq
+        path = self.log_dir / f"snapshot-{seq:012d}.json"
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'seq': seq, 'ts': time.time(), 'players': players}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self.last_snapshot_seq = seq
+        return path
+
+    def snapshot_due(self) -> bool:
+        """Vérifie si assez d'événements se sont accumulés depuis le dernier instantané"""
+        return self.last_seq - self.last_snapshot_seq >= self.snapshot_interval
+
+    def compact(self, keep_snapshots: int = 2, prune_segments: bool = False) -> int:
+        """
+        Supprime les instantanés intermédiaires : le premier (base d'une relecture complète)
+        et les keep_snapshots plus récents sont conservés
+        Avec prune_segments, le plus ancien instantané conservé devient la base et les segments
+        qu'il couvre entièrement sont supprimés : l'historique antérieur est alors perdu, et un
+        recalcul après changement de formule ne peut plus repartir des événements bruts
+        Retourne: le nombre de fichiers supprimés
+        """
+        removed = 0
+        with self._lock:
+            snapshots = self._snapshots()
+            if not snapshots:
+                return 0
+            keep = {s for s, _ in snapshots[-keep_snapshots:]}
+            if not prune_segments:
+                keep.add(snapshots[0][0])
+            for seq, path in snapshots:
+                if seq not in keep:
+                    path.unlink()
+                    removed += 1
+            if prune_segments:
+                base_seq = min(keep)
+                segments = self._segments()
+                for index, (first_seq, path) in enumerate(segments[:-1]):
+                    # Segment entièrement couvert : le suivant commence juste après la base
+                    if segments[index + 1][0] <= base_seq + 1:
+                        path.unlink()
+                        removed += 1
+        return removed
+
+    def close(self) -> None:
+        """Arrête la synchronisation groupée, synchronise et ferme le segment courant"""
+        if self._sync_thread is not None:
+            self._sync_stop.set()
+            self._sync_thread.join()
+            self._sync_thread = None
+        with self._lock:
+            if self._file is not None:
+                if self._unsynced:
+                    os.fsync(self._file.fileno())
+                    self._unsynced = False
+                self._file.close()
+                self._file = None
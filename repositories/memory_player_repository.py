@@ -0,0 +1,47 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Repository de joueurs entièrement en mémoire (relecture du journal, outils)
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+
+class MemoryPlayerRepository:
+    """Joueurs conservés dans un dictionnaire, même interface que PlayerRepository"""
+
+    def __init__(self, players: Optional[Dict[str, Dict]] = None):
+        self.players: Dict[str, Dict] = {
+            name: dict(data) for name, data in (players or {}).items()
+        }
+
+    def exists(self, player_name: str) -> bool:
+        """Vérifie si un joueur existe"""
+        return player_name in self.players
+
+    def load(self, player_name: str) -> Optional[Dict]:
+        """Charge les données d'un joueur (copie superficielle)"""
+        data = self.players.get(player_name)
+        return dict(data) if data is not None else None
+
+    def save(self, player_name: str, data: Dict) -> None:
+        """Sauvegarde les données d'un joueur"""
+        self.players[player_name] = data
+
+    def load_many(self, player_names: Iterable[str]) -> Dict[str, Dict]:
+        """Charge plusieurs joueurs: {nom: données} pour les joueurs existants"""
+        players = self.players
+        return {name: dict(players[name]) for name in player_names if name in players}
+
+    def save_many(self, players: Dict[str, Dict]) -> None:
+        """Sauvegarde plusieurs joueurs"""
+        self.players.update(players)
+
+    def get_all(self) -> List[Dict]:
+        """Retourne tous les joueurs"""
+        return [{**data, 'name': name} for name, data in self.players.items()]
+
+    def delete(self, player_name: str) -> bool:
+        """Supprime un joueur"""
+        return self.players.pop(player_name, None) is not None
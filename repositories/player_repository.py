@@ -6,45 +6,128 @@ Repository pour la persistance des données joueurs
 """
 
 import json
+import os
+import time
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable
 
 
 class PlayerRepository:
-    """Gestion de la persistance des données joueurs"""
+    """
+    Gestion de la persistance des données joueurs (un fichier JSON par joueur)
+    Les écritures passent par un fichier temporaire renommé atomiquement : un arrêt brutal
+    laisse l'ancienne ou la nouvelle version, jamais un fichier tronqué
+    """
+
+    # Sous-répertoire où sont déplacés les fichiers illisibles
+    CORRUPT_DIR = "corrupt"
     
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, fsync: bool = True):
         self.data_dir = data_dir
         self.data_dir.mkdir(exist_ok=True)
+        self.fsync = fsync
+        # Fichiers temporaires d'écritures interrompues
+        for tmp_file in self.data_dir.glob("*.json.tmp"):
+            tmp_file.unlink()
     
     def get_filepath(self, player_name: str) -> Path:
         """Retourne le chemin du fichier JSON du joueur"""
         return self.data_dir / f"{player_name}.json"
     
+    def _read(self, filepath: Path) -> Optional[Dict]:
+        """Lit un fichier joueur ; un fichier illisible est mis à l'écart et ignoré"""
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, UnicodeDecodeError) as e:
+            self._quarantine(filepath, e)
+            return None
+    
+    def _quarantine(self, filepath: Path, error: Exception) -> None:
+        """Déplace un fichier corrompu dans CORRUPT_DIR pour qu'il ne bloque plus les lectures"""
+        corrupt_dir = self.data_dir / self.CORRUPT_DIR
+        corrupt_dir.mkdir(exist_ok=True)
+        target = corrupt_dir / f"{filepath.name}.{int(time.time())}"
+        try:
+            os.replace(filepath, target)
+        except OSError:
+            pass
+        print(f"⚠️ Fichier joueur illisible {filepath.name} déplacé dans {corrupt_dir} : {error}")
+    
+    def _write(self, filepath: Path, data: Dict) -> Path:
+        """Écrit un fichier temporaire complet (synchronisé) à côté du fichier final"""
+        tmp_path = filepath.with_name(filepath.name + ".tmp")
+        payload = json.dumps(data, indent=2, ensure_ascii=False)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        return tmp_path
+    
+    def _sync_directory(self) -> None:
+        """Rend durables les renommages du répertoire (une fois par lot)"""
+        if not self.fsync or not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(self.data_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
     def exists(self, player_name: str) -> bool:
         """Vérifie si un joueur existe"""
         return self.get_filepath(player_name).exists()
     
     def load(self, player_name: str) -> Optional[Dict]:
         """Charge les données d'un joueur"""
-        filepath = self.get_filepath(player_name)
-        if filepath.exists():
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        return self._read(self.get_filepath(player_name))
     
     def save(self, player_name: str, data: Dict) -> None:
         """Sauvegarde les données d'un joueur"""
-        filepath = self.get_filepath(player_name)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self.save_many({player_name: data})
+    
+    def load_many(self, player_names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Charge plusieurs joueurs : un fichier ouvert par joueur demandé (fichier absent ignoré),
+        sans parcourir le répertoire
+        Retourne: {nom: données} pour les joueurs existants
+        """
+        players = {}
+        for player_name in dict.fromkeys(player_names):
+            data = self._read(self.get_filepath(player_name))
+            if data is not None:
+                players[player_name] = data
+        return players
+    
+    def save_many(self, players: Dict[str, Dict]) -> None:
+        """
+        Sauvegarde plusieurs joueurs : tous les fichiers temporaires sont écrits,
+        puis renommés, puis le répertoire est synchronisé une seule fois
+        """
+        if not players:
+            return
+        written = []
+        try:
+            for player_name, data in players.items():
+                filepath = self.get_filepath(player_name)
+                written.append((self._write(filepath, data), filepath))
+        except BaseException:
+            for tmp_path, _ in written:
+                tmp_path.unlink()
+            raise
+        for tmp_path, filepath in written:
+            os.replace(tmp_path, filepath)
+        self._sync_directory()
     
     def get_all(self) -> List[Dict]:
-        """Retourne tous les joueurs"""
+        """Retourne tous les joueurs (les fichiers illisibles sont ignorés)"""
         players = []
         for file in self.data_dir.glob("*.json"):
-            with open(file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._read(file)
+            if data is not None:
                 data['name'] = file.stem
                 players.append(data)
         return players
@@ -55,4 +138,4 @@ class PlayerRepository:
         if filepath.exists():
             filepath.unlink()
             return True
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,151 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Repository SQLite pour la persistance des données joueurs
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable, Tuple
+
+
+# Limite de paramètres d'une requête SQLite (SQLITE_MAX_VARIABLE_NUMBER des anciennes versions)
+_MAX_VARIABLES = 999
+
+_UPSERT_QUERY = "INSERT OR REPLACE INTO players (name, data) VALUES (?, ?)"
+
+# Index des colonnes de statistiques des premières bases : aucune requête ne les utilisait
+# (les classements sont tenus en mémoire par LeaderboardIndex), ils ne faisaient que
+# ralentir chaque écriture
+_LEGACY_INDEXED_FIELDS = ('points', 'xp', 'level', 'parties_gagnees', 'parties_jouees')
+
+
+class SqlitePlayerRepository:
+    """Gestion de la persistance des données joueurs dans une base SQLite"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Crée la table si nécessaire et supprime les index inutilisés des anciennes bases"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS players (name TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            for field in _LEGACY_INDEXED_FIELDS:
+                self._conn.execute(f"DROP INDEX IF EXISTS idx_players_{field}")
+
+    @staticmethod
+    def _row_values(player_name: str, data: Dict) -> tuple:
+        """Prépare les valeurs d'une ligne à partir des données joueur"""
+        payload = {k: v for k, v in data.items() if k != 'name'}
+        return (player_name, json.dumps(payload, ensure_ascii=False))
+
+    def exists(self, player_name: str) -> bool:
+        """Vérifie si un joueur existe"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM players WHERE name = ?", (player_name,)
+            ).fetchone()
+        return row is not None
+
+    def load(self, player_name: str) -> Optional[Dict]:
+        """Charge les données d'un joueur"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM players WHERE name = ?", (player_name,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def save(self, player_name: str, data: Dict) -> None:
+        """Sauvegarde les données d'un joueur"""
+        with self._lock, self._conn:
+            self._conn.execute(_UPSERT_QUERY, self._row_values(player_name, data))
+
+    def load_many(self, player_names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Charge plusieurs joueurs en une seule transaction de lecture
+        Retourne: {nom: données} pour les joueurs existants
+        """
+        names = list(dict.fromkeys(player_names))
+        players = {}
+        with self._lock, self._conn:
+            for start in range(0, len(names), _MAX_VARIABLES):
+                chunk = names[start:start + _MAX_VARIABLES]
+                rows = self._conn.execute(
+                    f"SELECT name, data FROM players WHERE name IN ({', '.join('?' for _ in chunk)})",
+                    chunk
+                ).fetchall()
+                for name, payload in rows:
+                    players[name] = json.loads(payload)
+        return players
+
+    def save_many(self, players: Dict[str, Dict]) -> None:
+        """Sauvegarde plusieurs joueurs en une seule transaction"""
+        if not players:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                _UPSERT_QUERY,
+                [self._row_values(name, data) for name, data in players.items()]
+            )
+
+    def get_all(self) -> List[Dict]:
+        """Retourne tous les joueurs"""
+        with self._lock:
+            rows = self._conn.execute("SELECT name, data FROM players").fetchall()
+        players = []
+        for name, payload in rows:
+            data = json.loads(payload)
+            data['name'] = name
+            players.append(data)
+        return players
+
+    def delete(self, player_name: str) -> bool:
+        """Supprime un joueur"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM players WHERE name = ?", (player_name,))
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        """Retourne le nombre de joueurs enregistrés"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def import_json_directory(self, data_dir: Path) -> Tuple[int, List[str]]:
+        """
+        Importe en une seule transaction les fichiers JSON d'un PlayerRepository
+        Un fichier illisible (corrompu, tronqué) est signalé et ignoré sans interrompre la migration
+        Retourne: (nombre de joueurs importés, noms des fichiers ignorés)
+        """
+        imported = 0
+        skipped = []
+        with self._lock, self._conn:
+            for file in Path(data_dir).glob("*.json"):
+                try:
+                    with open(file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    # ValueError couvre json.JSONDecodeError et UnicodeDecodeError
+                    print(f"⚠️ Fichier joueur {file.name} ignoré lors de la migration : {e}")
+                    skipped.append(file.name)
+                    continue
+                self._conn.execute(_UPSERT_QUERY, self._row_values(file.stem, data))
+                imported += 1
+        return imported, skipped
+
+    def close(self) -> None:
+        """Ferme la connexion à la base"""
+        with self._lock:
+            self._conn.close()
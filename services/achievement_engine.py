@@ -0,0 +1,163 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Moteur de règles des achievements : conditions compilées et indexées par champ
+"""
+
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+
+Check = Callable[[Dict[str, Any]], bool]
+
+
+def compile_condition(condition: Dict[str, Any]) -> Tuple[Check, Set[str]]:
+    """
+    Compile une condition de achievements.json
+    Retourne: (fonction de vérification, champs du joueur dont elle dépend)
+    """
+    ctype = condition.get("type")
+
+    if ctype in ("and", "or"):
+        compiled = [compile_condition(c) for c in condition.get("conditions", [])]
+        checks = tuple(check for check, _ in compiled)
+        fields = set().union(*(f for _, f in compiled)) if compiled else set()
+        if not checks:
+            return (lambda stats: False), fields
+        if ctype == "and":
+            return (lambda stats: all(check(stats) for check in checks)), fields
+        return (lambda stats: any(check(stats) for check in checks)), fields
+
+    field = condition.get("field")
+    value = condition.get("value")
+    fields = {field} if field else set()
+
+    if ctype == "lt":
+        return (lambda stats: stats.get(field, float('inf')) < value), fields
+    if ctype == "le":
+        return (lambda stats: stats.get(field, float('inf')) <= value), fields
+    if ctype == "gt":
+        return (lambda stats: stats.get(field, float('-inf')) > value), fields
+    if ctype == "ge":
+        return (lambda stats: stats.get(field, float('-inf')) >= value), fields
+    if ctype == "eq":
+        return (lambda stats: stats.get(field) == value), fields
+    if ctype == "len_ge":
+        return (lambda stats: len(stats.get(field, [])) >= value), fields
+
+    # Condition inconnue : jamais vraie
+    return (lambda stats: False), fields
+
+
+def _condition_progress(condition: Dict[str, Any], child_checks: Tuple[Check, ...],
+                        player_data: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Avancement (actuel, objectif) d'une condition, calculé sur les données en mémoire"""
+    ctype = condition.get("type")
+
+    if ctype in ("and", "or"):
+        # Conditions composées : nombre de sous-conditions remplies
+        done = sum(1 for check in child_checks if check(player_data))
+        return done, (len(child_checks) if ctype == "and" else 1)
+
+    value = condition.get("value")
+    current = player_data.get(condition.get("field"))
+    if ctype == "len_ge":
+        current = len(current or [])
+    elif ctype in ("lt", "le") and current == float('inf'):
+        # Record encore jamais établi
+        current = None
+    return current, value
+
+
+class AchievementRule:
+    """Achievement compilé : vérification, champs lus et condition d'origine"""
+
+    __slots__ = ('achievement_id', 'achievement', 'check', 'fields', 'condition', 'child_checks')
+
+    def __init__(self, achievement_id: str, achievement: Dict):
+        self.achievement_id = achievement_id
+        self.achievement = achievement
+        self.condition = achievement.get('condition')
+        self.child_checks: Tuple[Check, ...] = ()
+        if self.condition:
+            self.check, self.fields = compile_condition(self.condition)
+            if self.condition.get("type") in ("and", "or"):
+                self.child_checks = tuple(
+                    compile_condition(c)[0] for c in self.condition.get("conditions", [])
+                )
+        else:
+            # Achievement défini avec une simple fonction : réévalué à chaque vérification
+            self.check = achievement.get('check', lambda stats: False)
+            self.fields = None
+
+
+class AchievementEngine:
+    """
+    Table de règles compilée et immuable qui évalue les achievements d'un joueur
+    Les règles sont indexées par champ : après une mise à jour, seules celles qui lisent
+    un champ modifié sont vérifiées
+    Pour changer de règles, on construit une nouvelle table et on remplace la référence
+    """
+
+    def __init__(self, achievements: Dict[str, Dict]):
+        self.achievements: Mapping[str, Dict] = MappingProxyType(dict(achievements))
+        self.rules: Tuple[AchievementRule, ...] = tuple(
+            AchievementRule(achievement_id, achievement)
+            for achievement_id, achievement in achievements.items()
+        )
+        by_field: Dict[str, List[int]] = {}
+        always: List[int] = []
+        for index, rule in enumerate(self.rules):
+            if rule.fields is None:
+                always.append(index)
+                continue
+            for field in rule.fields:
+                by_field.setdefault(field, []).append(index)
+        self._by_field: Mapping[str, Tuple[int, ...]] = MappingProxyType(
+            {field: tuple(indexes) for field, indexes in by_field.items()}
+        )
+        self._always: Tuple[int, ...] = tuple(always)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @property
+    def indexed_fields(self) -> int:
+        """Nombre de champs joueur couverts par l'index"""
+        return len(self._by_field)
+
+    def candidates(self, changed_fields: Optional[Iterable[str]] = None) -> Sequence[AchievementRule]:
+        """Règles à vérifier pour ces champs modifiés (toutes si None), dans l'ordre de définition"""
+        if changed_fields is None:
+            return self.rules
+        indexes = set(self._always)
+        for field in changed_fields:
+            indexes.update(self._by_field.get(field, ()))
+        return [self.rules[index] for index in sorted(indexes)]
+
+    def evaluate(self, player_data: Dict,
+                 changed_fields: Optional[Iterable[str]] = None) -> List[Tuple[str, Dict]]:
+        """Retourne les achievements nouvellement remplis: [(id, achievement)]"""
+        unlocked = set(player_data.get('achievements', []))
+        return [
+            (rule.achievement_id, rule.achievement)
+            for rule in self.candidates(changed_fields)
+            if rule.achievement_id not in unlocked and rule.check(player_data)
+        ]
+
+    def progress(self, player_data: Dict) -> Dict[str, Dict]:
+        """
+        Avancement de chaque achievement, sans accès au stockage
+        Retourne: {id: {'current': ..., 'target': ..., 'done': bool}}
+        """
+        unlocked = set(player_data.get('achievements', []))
+        result = {}
+        for rule in self.rules:
+            done = rule.achievement_id in unlocked or rule.check(player_data)
+            if rule.condition:
+                current, target = _condition_progress(rule.condition, rule.child_checks, player_data)
+            else:
+                current, target = int(done), 1
+            result[rule.achievement_id] = {'current': current, 'target': target, 'done': done}
+        return result
@@ -0,0 +1,111 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Rechargement à chaud de achievements.json
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import config.constants as constants_module
+from config.constants import load_achievements
+from services.achievement_engine import AchievementEngine
+
+
+class AchievementReloader:
+    """
+    Surveille achievements.json et remplace la table de règles du PlayerService
+    La nouvelle table est compilée entièrement avant d'être installée ; un fichier invalide
+    laisse la table en service intacte
+    """
+
+    def __init__(self, path: Path, player_service, interval: float = 2.0):
+        self.path = Path(path)
+        self.player_service = player_service
+        self.interval = interval
+        self._signature = self._stat()
+        self._task: Optional[asyncio.Task] = None
+        engine = player_service.achievement_engine
+        self.metrics: Dict = {
+            'reloads': 0,
+            'errors': 0,
+            'rules': len(engine),
+            'indexed_fields': engine.indexed_fields,
+            'reload_time_last': 0.0,
+            'reloaded_at': None,
+            'last_error': None,
+        }
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Signature du fichier (date de modification, taille), None s'il est absent"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self) -> bool:
+        """
+        Recompile le fichier et installe la nouvelle table
+        Retourne: True si la table a été remplacée
+        """
+        started = time.perf_counter()
+        try:
+            achievements = load_achievements(self.path)
+            engine = AchievementEngine(achievements)
+        except Exception as e:
+            self.metrics['errors'] += 1
+            self.metrics['last_error'] = str(e)
+            print(f"❌ Rechargement de {self.path.name} ignoré : {e}")
+            return False
+
+        self.player_service.set_achievements(engine)
+        # Les embeds relisent config.constants.ACHIEVEMENTS à chaque appel
+        constants_module.ACHIEVEMENTS = achievements
+
+        elapsed = time.perf_counter() - started
+        self.metrics.update({
+            'reloads': self.metrics['reloads'] + 1,
+            'rules': len(engine),
+            'indexed_fields': engine.indexed_fields,
+            'reload_time_last': elapsed,
+            'reloaded_at': time.time(),
+            'last_error': None,
+        })
+        print(f"🔄 {len(engine)} achievement(s) rechargé(s) en {elapsed * 1000:.1f} ms")
+        return True
+
+    def check(self) -> bool:
+        """Recharge si le fichier a changé depuis la dernière vérification"""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        return self.reload()
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
+
+    def start(self) -> None:
+        """Démarre la surveillance (boucle asyncio en cours requise)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self) -> None:
+        """Arrête la surveillance"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_metrics(self) -> Dict:
+        """Retourne les métriques de rechargement"""
+        return dict(self.metrics)
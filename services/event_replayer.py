@@ -0,0 +1,194 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Relecture du journal d'événements : reconstruction et réparation des agrégats joueurs
+
+Usage :
+    python -m services.event_replayer --log ../events --out ../data_rebuilt
+"""
+
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from models.article_set import ArticleSet
+from models.player import Player
+from repositories.article_index import ArticleIndex
+from repositories.memory_player_repository import MemoryPlayerRepository
+from services.game_service import GameService
+from services.player_service import PlayerService
+from services.stats_service import StatsService
+
+
+class _ReplayGameService(GameService):
+    """
+    GameService de relecture : les articles visités restent décodés pendant la relecture
+    et ne sont sérialisés qu'une fois, par finalize()
+    """
+
+    def __init__(self, player_service, stats_service, article_index):
+        super().__init__(player_service, stats_service, article_index=article_index)
+        self._visited: Dict[str, ArticleSet] = {}
+        # Horodatage de l'événement rejoué, repris pour les agrégats par période
+        self.event_ts: Optional[float] = None
+
+    def _record(self, event_type: str, **payload) -> float:
+        return self.event_ts if self.event_ts is not None else super()._record(event_type, **payload)
+
+    def _visit_articles(self, player_name: str, player_data: Dict, articles: Tuple[str, str]) -> None:
+        visited = self._visited.get(player_name)
+        if visited is None:
+            visited = self._visited[player_name] = ArticleSet.from_field(
+                player_data.get('articles_visited'), self.article_index
+            )
+        for title in articles:
+            visited.add(self.article_index.intern(title))
+        player_data['articles_count'] = len(visited)
+
+    def finalize(self, repository: MemoryPlayerRepository) -> None:
+        """Écrit les ensembles d'articles dans les joueurs rejoués"""
+        for player_name, visited in self._visited.items():
+            repository.players[player_name]['articles_visited'] = visited.encode()
+
+
+class EventReplayer:
+    """Rejoue les événements sur des joueurs en mémoire avec les formules actuelles"""
+
+    def __init__(self, constants: Dict, article_index: Optional[ArticleIndex] = None):
+        self.constants = constants
+        # Doit être la table des joueurs réparés : les identifiants y sont résolus
+        self.article_index = article_index if article_index is not None else ArticleIndex()
+
+    def _ensure_players(self, repository: MemoryPlayerRepository, names: Iterable[str],
+                        ts: float) -> None:
+        """Crée les joueurs inconnus, datés de l'événement qui les fait apparaître"""
+        for name in names:
+            if not repository.exists(name):
+                data = Player.create_default_data()
+                data['created_at'] = datetime.fromtimestamp(ts).isoformat()
+                repository.save(name, data)
+
+    def replay(self, players: Dict[str, Dict],
+               events: Iterable[Dict]) -> Tuple[MemoryPlayerRepository, Set[str], int]:
+        """
+        Applique des événements à partir d'un état initial
+        Retourne: (joueurs obtenus, noms des joueurs modifiés, nombre d'événements appliqués)
+        """
+        repository = MemoryPlayerRepository(players)
+        player_service = PlayerService(repository, self.constants, track_ranks=False)
+        game_service = _ReplayGameService(
+            player_service, StatsService(self.constants), self.article_index
+        )
+        touched = set()
+        count = 0
+
+        for event in events:
+            event_type = event['type']
+            if event_type == 'game_start':
+                self._ensure_players(repository, event['members'], event['ts'])
+                player_service.increment_played_games(event['members'], event['ts'])
+                touched.update(event['members'])
+            elif event_type == 'game_cancel':
+                player_service.decrement_played_games(event['members'], event['ts'])
+                touched.update(event['members'])
+            elif event_type == 'win':
+                self._ensure_players(repository, [event['winner']], event['ts'])
+                game_service.event_ts = event['ts']
+                game_service.register_win(
+                    event['winner'], event['temps'], event['clicks'],
+                    tuple(event['articles']), event['members'], event.get('token')
+                )
+                touched.add(event['winner'])
+                touched.update(event['members'])
+            else:
+                # xp_award : résultat d'une victoire, recalculé avec la victoire elle-même
+                continue
+            count += 1
+
+        game_service.finalize(repository)
+        return repository, touched, count
+
+    def rebuild(self, event_log) -> MemoryPlayerRepository:
+        """Reconstruit tous les joueurs depuis l'instantané de base et le journal complet"""
+        base = event_log.load_snapshot(event_log.earliest_snapshot_seq())
+        players = base['players'] if base else {}
+        after_seq = base['seq'] if base else 0
+        repository, _, _ = self.replay(players, event_log.iter_events(after_seq))
+        return repository
+
+    def recover(self, event_log, repository) -> int:
+        """
+        Répare le repository après un arrêt brutal : rejoue les événements postérieurs au
+        dernier instantané et réécrit les joueurs dont l'état diffère
+        Au premier démarrage, les joueurs existants deviennent l'instantané de base
+        created_at n'est pas comparé : la relecture date le joueur de l'événement qui le fait
+        apparaître, le jeu de sa création (/partie, avant la manche)
+        Retourne: le nombre de joueurs réécrits
+        """
+        snapshot = event_log.load_snapshot()
+        if snapshot is None:
+            players = {p.pop('name'): p for p in repository.get_all()}
+            event_log.write_snapshot(players)
+            return 0
+
+        replayed, touched, _ = self.replay(snapshot['players'], event_log.iter_events(snapshot['seq']))
+        repaired = 0
+        for name in touched:
+            data = replayed.players[name]
+            stored = repository.load(name)
+            if stored is not None and 'created_at' in stored:
+                data = {**data, 'created_at': stored['created_at']}
+            if stored != data:
+                repository.save(name, data)
+                repaired += 1
+        return repaired
+
+
+def main():
+    from config.constants import (
+        LEVEL_THRESHOLDS, RANKS, ACHIEVEMENTS, BASE_POINTS, BASE_XP_WIN,
+        BASE_XP_LOSE, MIN_POINTS, TIME_BONUS_THRESHOLDS, CLICK_BONUS_THRESHOLDS
+    )
+    from config.settings import ARTICLE_INDEX_PATH
+    from repositories.event_log import EventLog
+    from repositories.player_repository import PlayerRepository
+
+    parser = argparse.ArgumentParser(description="Reconstruit les fichiers joueurs depuis le journal")
+    parser.add_argument('--log', type=Path, required=True, help="Répertoire du journal d'événements")
+    parser.add_argument('--out', type=Path, required=True, help="Répertoire des fichiers joueurs à écrire")
+    parser.add_argument('--articles', type=Path, default=ARTICLE_INDEX_PATH,
+                        help="Table des titres d'articles référencée par les joueurs")
+    args = parser.parse_args()
+
+    constants = {
+        'LEVEL_THRESHOLDS': LEVEL_THRESHOLDS,
+        'RANKS': RANKS,
+        'ACHIEVEMENTS': ACHIEVEMENTS,
+        'BASE_POINTS': BASE_POINTS,
+        'BASE_XP_WIN': BASE_XP_WIN,
+        'BASE_XP_LOSE': BASE_XP_LOSE,
+        'MIN_POINTS': MIN_POINTS,
+        'TIME_BONUS_THRESHOLDS': TIME_BONUS_THRESHOLDS,
+        'CLICK_BONUS_THRESHOLDS': CLICK_BONUS_THRESHOLDS
+    }
+
+    started = time.perf_counter()
+    event_log = EventLog(args.log)
+    article_index = ArticleIndex(args.articles)
+    rebuilt = EventReplayer(constants, article_index).rebuild(event_log)
+    article_index.close()
+    elapsed = time.perf_counter() - started
+    print(f"🔁 {event_log.last_seq} événement(s) relus en {elapsed:.1f}s")
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    output = PlayerRepository(args.out)
+    for name, data in rebuilt.players.items():
+        output.save(name, data)
+    print(f"✅ {len(rebuilt.players)} joueur(s) écrit(s) dans {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,94 +5,198 @@
 Service de gestion de la logique de jeu
 """
 
-from typing import Dict, Tuple
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from models.article_set import ArticleSet
+from repositories.article_index import ArticleIndex
+from utils.periods import add_to_periods
 
 
 class GameService:
     """Service de gestion de la logique de jeu"""
     
-    def __init__(self, player_service, stats_service):
+    # Nombre de victoires récentes mémorisées pour détecter les doublons
+    COMPLETED_WINS_SIZE = 1024
+    
+    # Champs modifiés au lancement de la manche (start_game), dans une autre sauvegarde,
+    # à réévaluer avec ceux de la victoire pour les achievements
+    ROUND_FIELDS = ('parties_jouees', 'current_streak', 'last_played')
+    
+    def __init__(self, player_service, stats_service, event_log=None, article_index=None,
+                 prune_segments: bool = False):
         self.player_service = player_service
         self.stats_service = stats_service
+        # Table des titres d'articles, en mémoire si aucune n'est fournie
+        self.article_index = article_index if article_index is not None else ArticleIndex()
+        # Journal d'événements optionnel : chaque action y est écrite avant d'être appliquée
+        self.event_log = event_log
+        # Compactage : supprimer aussi les segments couverts par l'instantané de base
+        # (irréversible : plus de recalcul complet depuis le journal)
+        self.prune_segments = prune_segments
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._completed_wins: "OrderedDict[str, Dict]" = OrderedDict()
+    
+    def _record(self, event_type: str, **payload) -> float:
+        """Écrit un événement dans le journal. Retourne: son horodatage"""
+        if self.event_log is None:
+            return time.time()
+        return self.event_log.append(event_type, **payload)['ts']
+    
+    def _write_snapshot(self, players: List[Dict], seq: int) -> None:
+        """Écrit l'instantané des agrégats au numéro seq puis compacte le journal (bloquant)"""
+        self.event_log.write_snapshot({p.pop('name'): p for p in players}, seq)
+        self.event_log.compact(prune_segments=self.prune_segments)
+    
+    async def _await_snapshot(self, future: "asyncio.Future") -> None:
+        try:
+            await future
+        except Exception as e:
+            print(f"❌ Erreur lors de l'instantané du journal: {e}")
+    
+    def _maybe_snapshot(self) -> None:
+        """
+        Écrit un instantané des agrégats quand le journal en demande un
+        Depuis la boucle, la lecture des joueurs et l'écriture se font dans le thread d'écriture
+        du cache, soumises avant tout événement suivant : l'instantané correspond à last_seq
+        """
+        if self.event_log is None or not self.event_log.snapshot_due():
+            return
+        if self._snapshot_task is not None and not self._snapshot_task.done():
+            return
+        repository = self.player_service.repository
+        seq = self.event_log.last_seq
+        run_after_flush = getattr(repository, 'run_after_flush', None)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            run_after_flush = None
+        if run_after_flush is None:
+            self._write_snapshot(repository.get_all(), seq)
+            return
+        backend = repository.backend
+        future = run_after_flush(lambda: self._write_snapshot(backend.get_all(), seq))
+        self._snapshot_task = asyncio.ensure_future(self._await_snapshot(future))
+    
+    def start_game(self, members: List[str]) -> None:
+        """Lance une manche classée : partie jouée comptée pour chaque membre"""
+        played_at = self._record('game_start', members=members)
+        self.player_service.increment_played_games(members, played_at)
+        self._maybe_snapshot()
+    
+    def cancel_game(self, members: List[str]) -> None:
+        """Annule une manche classée : la partie jouée est décomptée"""
+        cancelled_at = self._record('game_cancel', members=members)
+        self.player_service.decrement_played_games(members, cancelled_at)
+        self._maybe_snapshot()
+    
+    def _visit_articles(self, player_name: str, player_data: Dict, articles: Tuple[str, str]) -> None:
+        """Ajoute les articles d'un parcours à l'ensemble compact des articles du joueur"""
+        field = player_data.get('articles_visited')
+        visited = ArticleSet.from_field(field, self.article_index)
+        added = False
+        for title in articles:
+            added |= visited.add(self.article_index.intern(title))
+        if added or not isinstance(field, str):
+            player_data['articles_visited'] = visited.encode()
+        player_data['articles_count'] = len(visited)
     
     def register_win(self, winner_name: str, temps: float, clicks: int, 
-                    articles: Tuple[str, str], session_members: list) -> Dict:
+                    articles: Tuple[str, str], session_members: list,
+                    token: Optional[str] = None) -> Dict:
         """
         Enregistre une victoire et retourne les informations de récompense
+        Une victoire déjà enregistrée avec le même jeton n'est pas réappliquée :
+        le résultat initial est renvoyé avec 'duplicate' à True
         """
-        # Calculs
-        points = self.stats_service.calculate_points(temps, clicks)
-        xp_gained = self.stats_service.calculate_xp_gain(temps, clicks, True)
-        
-        # Charger les données
-        player_data = self.player_service.get_player(winner_name)
-        old_level = player_data['level']
+        if token is not None and token in self._completed_wins:
+            return {**self._completed_wins[token], 'duplicate': True}
         
-        # Mettre à jour les stats
-        player_data['points'] += points
-        player_data['parties_gagnees'] += 1
-        player_data['clics_total'] += clicks
-        player_data['moyenne_clics'] = self.stats_service.calculate_average(
-            clicks, 
-            player_data['parties_gagnees'], 
-            player_data['moyenne_clics']
+        # Écrit avant application : une victoire interrompue est rejouée au redémarrage
+        won_at = self._record(
+            'win', winner=winner_name, temps=temps, clicks=clicks,
+            articles=list(articles), members=list(session_members), token=token
         )
-        player_data['temps_total'] += temps
-        player_data['temps_moyen'] = self.stats_service.calculate_average(
-            temps,
-            player_data['parties_gagnees'],
-            player_data['temps_moyen']
-        )
-        
-        # Records personnels
-        records_beaten = []
-        if temps < player_data.get('best_time', float('inf')):
-            player_data['best_time'] = temps
-            if player_data['parties_gagnees'] > 1:
-                records_beaten.append('time')
-        
-        if clicks < player_data.get('best_clicks', float('inf')):
-            player_data['best_clicks'] = clicks
-            if player_data['parties_gagnees'] > 1:
-                records_beaten.append('clicks')
-        
-        if points > player_data.get('best_score', 0):
-            player_data['best_score'] = points
-            if player_data['parties_gagnees'] > 1:
-                records_beaten.append('score')
-        
-        # Win streak
-        player_data['win_streak'] = player_data.get('win_streak', 0) + 1
-        player_data['best_win_streak'] = max(
-            player_data.get('best_win_streak', 0),
-            player_data['win_streak']
-        )
-        
-        # Ajouter les articles visités
-        articles_visited = set(player_data.get('articles_visited', []))
-        articles_visited.add(articles[0])
-        articles_visited.add(articles[1])
-        player_data['articles_visited'] = list(articles_visited)
-        
-        # Sauvegarder avant d'ajouter XP
-        self.player_service.save_player(winner_name, player_data)
         
-        # Ajouter XP gameplay et vérifier level up
-        level_up, old_lvl, new_lvl = self.player_service.add_xp(winner_name, xp_gained)
+        # Calculs
+        points = self.stats_service.calculate_points(temps, clicks)
+        xp_gained = self.stats_service.calculate_xp_gain(temps, clicks, True)
         
-        # Vérifier et débloquer les achievements
-        new_achievements, achievement_xp = self.player_service.check_achievements(winner_name)
+        # Charger les données une seule fois
+        with self.player_service.session(winner_name) as session:
+            player_data = session.data
+            
+            # Mettre à jour les stats
+            player_data['points'] += points
+            player_data['parties_gagnees'] += 1
+            player_data['clics_total'] += clicks
+            player_data['moyenne_clics'] = self.stats_service.calculate_average(
+                clicks, 
+                player_data['parties_gagnees'], 
+                player_data['moyenne_clics']
+            )
+            player_data['temps_total'] += temps
+            player_data['temps_moyen'] = self.stats_service.calculate_average(
+                temps,
+                player_data['parties_gagnees'],
+                player_data['temps_moyen']
+            )
+            
+            # Records personnels
+            records_beaten = []
+            if temps < player_data.get('best_time', float('inf')):
+                player_data['best_time'] = temps
+                if player_data['parties_gagnees'] > 1:
+                    records_beaten.append('time')
+            
+            if clicks < player_data.get('best_clicks', float('inf')):
+                player_data['best_clicks'] = clicks
+                if player_data['parties_gagnees'] > 1:
+                    records_beaten.append('clicks')
+            
+            if points > player_data.get('best_score', 0):
+                player_data['best_score'] = points
+                if player_data['parties_gagnees'] > 1:
+                    records_beaten.append('score')
+            
+            # Win streak
+            player_data['win_streak'] = player_data.get('win_streak', 0) + 1
+            player_data['best_win_streak'] = max(
+                player_data.get('best_win_streak', 0),
+                player_data['win_streak']
+            )
+            
+            # Ajouter les articles visités
+            self._visit_articles(winner_name, player_data, articles)
+            
+            # Ajouter XP gameplay puis débloquer les achievements, en mémoire
+            session.add_xp(xp_gained)
+            new_achievements, achievement_xp = session.check_achievements(self.ROUND_FIELDS)
+            
+            # Agrégats des classements par période, datés par l'événement journalisé
+            add_to_periods(
+                player_data, won_at,
+                points=points, xp=xp_gained + achievement_xp, wins=1
+            )
+            
+        # Les montées de niveau incluent l'XP des achievements
+        old_lvl = session.old_level
+        new_lvl = player_data['level']
+        level_up = new_lvl > old_lvl
         
         # Réinitialiser win streak pour les autres joueurs
         self.player_service.reset_win_streaks_except(session_members, winner_name)
         
-        # Mettre à jour les classements
-        self.player_service.update_rankings()
-        
-        # Recharger les données finales
-        player_data = self.player_service.get_player(winner_name)
+        # Trace de l'XP attribuée (dérivée de la victoire, recalculée lors d'une relecture)
+        self._record(
+            'xp_award', player=winner_name, xp=xp_gained + achievement_xp,
+            level=new_lvl,
+            achievements=player_data['achievements'][len(player_data['achievements']) - len(new_achievements):]
+        )
         
-        return {
+        result = {
             'points': points,
             'xp_gained': xp_gained,
             'achievement_xp': achievement_xp,
@@ -102,5 +206,14 @@ class GameService:
             'new_level': new_lvl,
             'new_achievements': new_achievements,
             'records_beaten': records_beaten,
-            'player_data': player_data
+            'player_data': player_data,
+            'duplicate': False
         }
+        
+        if token is not None:
+            self._completed_wins[token] = result
+            while len(self._completed_wins) > self.COMPLETED_WINS_SIZE:
+                self._completed_wins.popitem(last=False)
+        
+        self._maybe_snapshot()
+        return result
@@ -0,0 +1,206 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Index de classement en mémoire, mis à jour joueur par joueur
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from services.rank_tree import FenwickTree
+
+
+class SortedKeys:
+    """
+    Liste triée découpée en blocs d'au plus 2 * LOAD clés, avec un arbre de Fenwick
+    sur la taille des blocs : insertion, suppression, rang et accès par position en
+    O(log N), plus un décalage borné par la taille d'un bloc (au lieu de O(N) sur une liste)
+    """
+
+    LOAD = 512
+
+    def __init__(self, keys: Iterable[Tuple] = ()):
+        keys = sorted(keys)
+        self._blocks: List[List[Tuple]] = [
+            keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)
+        ]
+        self._maxes: List[Tuple] = [block[-1] for block in self._blocks]
+        self._len = len(keys)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Reconstruit l'arbre des tailles de blocs (après un découpage ou une suppression de bloc)"""
+        self._counts = FenwickTree(max(1, len(self._blocks)))
+        for position, block in enumerate(self._blocks):
+            self._counts.add(position, len(block))
+
+    def _locate(self, key: Tuple) -> int:
+        """Bloc pouvant contenir la clé"""
+        return min(bisect_left(self._maxes, key), len(self._blocks) - 1)
+
+    def add(self, key: Tuple) -> None:
+        self._len += 1
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._reindex()
+            return
+        position = self._locate(key)
+        block = self._blocks[position]
+        insort(block, key)
+        self._maxes[position] = block[-1]
+        if len(block) > 2 * self.LOAD:
+            self._blocks[position:position + 1] = [block[:self.LOAD], block[self.LOAD:]]
+            self._maxes[position:position + 1] = [block[self.LOAD - 1], block[-1]]
+            self._reindex()
+        else:
+            self._counts.add(position, 1)
+
+    def remove(self, key: Tuple) -> None:
+        """Retire une clé présente"""
+        position = self._locate(key)
+        block = self._blocks[position]
+        del block[bisect_left(block, key)]
+        self._len -= 1
+        if block:
+            self._maxes[position] = block[-1]
+            self._counts.add(position, -1)
+        else:
+            del self._blocks[position]
+            del self._maxes[position]
+            self._reindex()
+
+    def index(self, key: Tuple) -> int:
+        """Position (0-indexée) d'une clé présente"""
+        position = self._locate(key)
+        return self._counts.count_le(position - 1) + bisect_left(self._blocks[position], key)
+
+    def slice(self, offset: int, limit: int) -> Iterator[Tuple]:
+        """Clés de offset (0-indexé) à offset + limit"""
+        if offset < 0 or offset >= self._len or limit <= 0:
+            return
+        position = self._counts.kth_smallest(offset + 1)
+        start = offset - self._counts.count_le(position - 1)
+        for block in self._blocks[position:]:
+            for key in block[start:start + limit]:
+                yield key
+                limit -= 1
+            if limit <= 0:
+                return
+            start = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+
+# Champs de classement conservés par joueur pour les lignes des pages -> valeur par défaut
+RECORD_FIELDS = {
+    'points': 0,
+    'xp': 0,
+    'level': 1,
+    'parties_gagnees': 0,
+    'parties_jouees': 0,
+}
+
+
+class LeaderboardIndex:
+    """
+    Classements triés par catégorie, maintenus incrémentalement en O(log N) par joueur
+    Les champs de classement de chaque joueur sont conservés : une page (top K compris)
+    se lit en O(log N + K) sans charger les fiches complètes
+    """
+
+    CATEGORIES = ('points', 'level', 'xp', 'winrate')
+
+    def __init__(self):
+        # Clés triées par ordre croissant : (-valeur, nom) => meilleur joueur en tête
+        self._sorted: Dict[str, SortedKeys] = {c: SortedKeys() for c in self.CATEGORIES}
+        self._keys: Dict[str, Dict[str, Tuple]] = {}
+        self._records: Dict[str, Tuple[int, ...]] = {}
+
+    @staticmethod
+    def _win_rate(data: Dict) -> float:
+        """Calcule le taux de victoire brut d'un joueur"""
+        played = data.get('parties_jouees', 0)
+        if played <= 0:
+            return 0.0
+        return data.get('parties_gagnees', 0) / played * 100
+
+    def _make_keys(self, player_name: str, data: Dict) -> Dict[str, Tuple]:
+        """Construit les clés de tri d'un joueur pour chaque catégorie"""
+        return {
+            'points': (-data.get('points', 0), player_name),
+            'level': (-data.get('level', 1), player_name),
+            'xp': (-data.get('xp', 0), player_name),
+            'winrate': (-self._win_rate(data), player_name),
+        }
+
+    @staticmethod
+    def _make_record(data: Dict) -> Tuple[int, ...]:
+        return tuple(int(data.get(field, default) or 0) for field, default in RECORD_FIELDS.items())
+
+    def build(self, players: Iterable[Dict]) -> None:
+        """Reconstruit entièrement l'index (au démarrage)"""
+        players = list(players)
+        self._keys = {p['name']: self._make_keys(p['name'], p) for p in players}
+        self._records = {p['name']: self._make_record(p) for p in players}
+        for category in self.CATEGORIES:
+            self._sorted[category] = SortedKeys(k[category] for k in self._keys.values())
+
+    def update(self, player_name: str, data: Dict) -> None:
+        """Met à jour la position d'un seul joueur"""
+        self._records[player_name] = self._make_record(data)
+        new_keys = self._make_keys(player_name, data)
+        old_keys = self._keys.get(player_name)
+        if old_keys == new_keys:
+            return
+
+        for category in self.CATEGORIES:
+            keys = self._sorted[category]
+            if old_keys is not None:
+                keys.remove(old_keys[category])
+            keys.add(new_keys[category])
+
+        self._keys[player_name] = new_keys
+
+    def remove(self, player_name: str) -> None:
+        """Retire un joueur de l'index"""
+        self._records.pop(player_name, None)
+        old_keys = self._keys.pop(player_name, None)
+        if old_keys is None:
+            return
+        for category in self.CATEGORIES:
+            self._sorted[category].remove(old_keys[category])
+
+    def get_rank(self, player_name: str, category: str = 'points') -> int:
+        """Retourne la position (1-indexée) d'un joueur, 0 s'il est inconnu"""
+        keys = self._keys.get(player_name)
+        if keys is None:
+            return 0
+        return self._sorted[category].index(keys[category]) + 1
+
+    def page(self, category: str, offset: int, limit: int) -> List[str]:
+        """Noms des joueurs classés de offset (0-indexé) à offset + limit"""
+        return [name for _, name in self._sorted[category].slice(offset, limit)]
+
+    def record(self, player_name: str) -> Optional[Dict]:
+        """Champs de classement d'un joueur (avec 'name' et 'win_rate'), None s'il est inconnu"""
+        values = self._records.get(player_name)
+        if values is None:
+            return None
+        record = dict(zip(RECORD_FIELDS, values))
+        record['name'] = player_name
+        games = record['parties_jouees']
+        record['win_rate'] = record['parties_gagnees'] * 100.0 / games if games > 0 else 0.0
+        return record
+
+    def records(self, category: str, offset: int, limit: int) -> List[Dict]:
+        """Lignes des joueurs classés de offset (0-indexé) à offset + limit"""
+        return [self.record(name) for name in self.page(category, offset, limit)]
+
+    def __contains__(self, player_name: str) -> bool:
+        return player_name in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,216 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Client HTTP asynchrone pour l'API MediaWiki
+"""
+
+import aiohttp
+from typing import Dict, List, Optional, Tuple
+
+from models.path_endpoint import PathEndpoint
+
+
+class MediaWikiClient:
+    """Client MediaWiki sur une session HTTP persistante (keep-alive, pool de connexions)"""
+
+    USER_AGENT = "WikiBot/2.0 (Discord Wikipedia Challenge)"
+
+    def __init__(self, lang: str = "fr", base_url: Optional[str] = None,
+                 max_connections: int = 8, timeout: float = 10.0, cache=None):
+        self.lang = lang
+        # Cache WikiCache optionnel pour les liens et les pages résolues
+        self.cache = cache
+        # base_url permet de viser un serveur MediaWiki local (tests, miroir)
+        self.base_url = base_url or f"https://{lang}.wikipedia.org/w/api.php"
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Crée la session HTTP au premier appel (dans la boucle en cours)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': self.USER_AGENT},
+            )
+        return self._session
+
+    async def query(self, **params) -> Dict:
+        """Exécute une requête action=query et retourne le JSON décodé"""
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': '2',
+            **{k: str(v) for k, v in params.items()},
+        }
+        async with self._get_session().get(self.base_url, params=params) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def query_pages(self, aliases: Optional[Dict[str, str]] = None, **params) -> List[Dict]:
+        """
+        Exécute une requête et fusionne les pages sur toutes les continuations
+        des propriétés (liens, etc.), sans relancer le générateur
+        `aliases` reçoit, s'il est fourni, les normalisations et redirections (titre -> cible)
+        """
+        pages: Dict[int, Dict] = {}
+        order: List[int] = []
+        while True:
+            data = await self.query(**params)
+            if aliases is not None:
+                query = data.get('query', {})
+                for entry in query.get('normalized', []) + query.get('redirects', []):
+                    aliases[entry['from']] = entry['to']
+            for page in data.get('query', {}).get('pages', []):
+                key = page.get('pageid', page.get('title'))
+                if key not in pages:
+                    pages[key] = page
+                    order.append(key)
+                    continue
+                merged = pages[key]
+                for field, value in page.items():
+                    if isinstance(value, list) and isinstance(merged.get(field), list):
+                        merged[field].extend(value)
+                    else:
+                        merged.setdefault(field, value)
+
+            cont = data.get('continue')
+            # Seules les continuations de propriétés sont suivies : continuer
+            # le générateur ramènerait de nouvelles pages
+            if not cont or not any(k != 'continue' and not k.startswith('g') for k in cont):
+                break
+            params.update(cont)
+        return [pages[key] for key in order]
+
+    @staticmethod
+    def is_valid_page(page: Dict) -> bool:
+        """Écarte les pages manquantes, invalides et d'homonymie"""
+        if page.get('missing') or page.get('invalid'):
+            return False
+        return 'disambiguation' not in page.get('pageprops', {})
+
+    def to_endpoint(self, page: Dict) -> PathEndpoint:
+        """Construit la référence d'une page renvoyée par l'API"""
+        return PathEndpoint(page['pageid'], page['title'], page['fullurl'], self.lang)
+
+    async def random_pages_with_links(self, count: int = 2) -> List[Dict]:
+        """
+        Tire des articles aléatoires avec leurs URL et leurs liens internes
+        en une seule requête (plus les éventuelles continuations de liens)
+        """
+        return await self.query_pages(
+            generator='random', grnnamespace=0, grnlimit=count,
+            prop='info|links|pageprops', inprop='url', ppprop='disambiguation',
+            plnamespace=0, pllimit='max',
+        )
+
+    async def resolve(self, titles: List[str]) -> List[PathEndpoint]:
+        """Résout des titres (redirections comprises) en pages valides, en une requête"""
+        resolved = []
+        missing = []
+        for title in titles[:50]:
+            cached = await self.cache.aget(self.lang, 'page', title) if self.cache else None
+            if cached is not None:
+                resolved.append(PathEndpoint(*cached, lang=self.lang))
+            else:
+                missing.append(title)
+        if not missing:
+            return resolved
+
+        aliases: Dict[str, str] = {}
+        pages = await self.query_pages(
+            aliases, titles='|'.join(missing), redirects=1,
+            prop='info|pageprops', inprop='url', ppprop='disambiguation',
+        )
+        by_title = {}
+        for page in pages:
+            if self.is_valid_page(page):
+                endpoint = self.to_endpoint(page)
+                by_title[endpoint.title] = endpoint
+                resolved.append(endpoint)
+        if self.cache:
+            # Mis en cache sous le titre résolu et sous chaque titre demandé
+            # (normalisation puis redirection), pour que la recherche suivante aboutisse
+            for title in set(missing) | set(by_title):
+                target = aliases.get(title, title)
+                target = aliases.get(target, target)
+                endpoint = by_title.get(target)
+                if endpoint is not None:
+                    await self.cache.aset(
+                        self.lang, 'page', title, [endpoint.page_id, endpoint.title, endpoint.url]
+                    )
+        return resolved
+
+    async def get_links(self, title: str) -> List[str]:
+        """Retourne tous les liens internes (espace principal) d'un article"""
+        if self.cache:
+            cached = await self.cache.aget(self.lang, 'links', title)
+            if cached is not None:
+                return cached
+
+        pages = await self.query_pages(
+            titles=title, redirects=1, prop='links', plnamespace=0, pllimit='max'
+        )
+        links = [link['title'] for link in pages[0].get('links', [])] if pages else []
+        if self.cache:
+            await self.cache.aset(self.lang, 'links', title, links)
+        return links
+
+    async def get_links_many(self, titles: List[str]) -> Dict[str, List[str]]:
+        """
+        Liens sortants de plusieurs articles (50 au plus) en une requête et ses continuations
+        Les articles déjà en cache ne sont pas redemandés
+        """
+        result = {}
+        missing = []
+        for title in titles[:50]:
+            cached = await self.cache.aget(self.lang, 'links', title) if self.cache else None
+            if cached is not None:
+                result[title] = cached
+            else:
+                missing.append(title)
+        if not missing:
+            return result
+
+        pages = await self.query_pages(
+            titles='|'.join(missing), prop='links', plnamespace=0, pllimit='max'
+        )
+        for page in pages:
+            links = [link['title'] for link in page.get('links', [])]
+            result[page['title']] = links
+            if self.cache:
+                await self.cache.aset(self.lang, 'links', page['title'], links)
+        return result
+
+    async def get_backlinks_many(self, titles: List[str]) -> Dict[str, List[str]]:
+        """Articles pointant vers plusieurs articles (50 au plus) en une requête et ses continuations"""
+        pages = await self.query_pages(
+            titles='|'.join(titles[:50]), prop='linkshere', lhnamespace=0, lhlimit='max'
+        )
+        return {p['title']: [link['title'] for link in p.get('linkshere', [])] for p in pages}
+
+    async def get_summary(self, article: str, sentences: int = 2) -> Optional[Tuple[str, str]]:
+        """
+        Recherche un article et récupère son introduction en une seule requête
+        Retourne: (article_name, summary) ou None
+        """
+        pages = await self.query_pages(
+            generator='search', gsrsearch=article, gsrnamespace=0, gsrlimit=10,
+            prop='extracts|pageprops', ppprop='disambiguation',
+            exintro=1, explaintext=1, exsentences=sentences, exlimit='max',
+        )
+        pages = [p for p in pages if self.is_valid_page(p) and p.get('extract')]
+        if not pages:
+            return None
+
+        pages.sort(key=lambda p: p.get('index', 0))
+        wanted = article.lower().replace('_', ' ')
+        chosen = next((p for p in pages if p['title'].lower() == wanted), pages[0])
+        return chosen['title'], chosen['extract']
+
+    async def close(self) -> None:
+        """Ferme la session HTTP"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,220 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Réserve de parcours Wikipedia pré-générés en arrière-plan
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+# Clé d'une réserve : (langue, difficulté), difficulté None = parcours quelconque
+PoolKey = Tuple[str, Optional[str]]
+
+
+class PathPool:
+    """
+    Réserve de parcours prêts à l'emploi, par langue et difficulté, remplie en tâche de fond
+    Une réserve par difficulté n'existe que si la langue dispose de tables de distances hors
+    ligne ; sinon la difficulté est générée à la demande, une génération à la fois, et
+    suspendue après un échec pendant un délai qui double à chaque nouvel échec
+    """
+
+    # Délai d'attente après un échec de génération (secondes), doublé jusqu'au maximum
+    MIN_BACKOFF = 1.0
+    MAX_BACKOFF = 300.0
+
+    def __init__(self, services: Dict, default_lang: str, size: int = 5,
+                 ttl: float = 3600.0, max_attempts: int = 10,
+                 bands: Optional[Dict[str, Tuple]] = None):
+        self.services = services
+        self.default_lang = default_lang
+        self.size = size
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.bands = bands or {}
+        keys = [
+            (lang, difficulty) for lang, service in services.items()
+            for difficulty in (None, *(self.bands if service.has_distance_tables else ()))
+        ]
+        self._pools: Dict[PoolKey, Deque[Tuple[float, Tuple]]] = {key: deque() for key in keys}
+        self._refill: Dict[PoolKey, asyncio.Event] = {}
+        self._tasks: Dict[PoolKey, asyncio.Task] = {}
+        # Génération à la demande des difficultés sans réserve : une à la fois par clé
+        self._on_demand: Dict[PoolKey, asyncio.Lock] = {}
+        # Échecs consécutifs : (instant de la prochaine tentative, délai courant)
+        self._backoff: Dict[PoolKey, Tuple[float, float]] = {}
+        self.metrics: Dict[PoolKey, Dict] = {
+            (lang, difficulty): self._new_metrics()
+            for lang in services for difficulty in (None, *self.bands)
+        }
+
+    @staticmethod
+    def _new_metrics() -> Dict:
+        """Compteurs de génération et d'utilisation d'une réserve"""
+        return {
+            'generated': 0,
+            'failed': 0,
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'generation_time_total': 0.0,
+            'generation_time_last': 0.0,
+        }
+
+    @staticmethod
+    def _label(key: PoolKey) -> str:
+        """Nom d'une réserve pour les logs et les métriques"""
+        lang, difficulty = key
+        return f"{lang}/{difficulty or 'any'}"
+
+    def _key(self, lang: Optional[str], difficulty: Optional[str]) -> PoolKey:
+        """Résout la réserve demandée"""
+        key = (lang or self.default_lang, difficulty)
+        if key not in self.metrics:
+            raise ValueError(f"Réserve inconnue : {self._label(key)}")
+        return key
+
+    def _failed(self, key: PoolKey) -> float:
+        """Enregistre un échec de génération. Retourne: le délai avant la prochaine tentative"""
+        _, delay = self._backoff.get(key, (0.0, self.MIN_BACKOFF / 2))
+        delay = min(self.MAX_BACKOFF, delay * 2)
+        self._backoff[key] = (time.monotonic() + delay, delay)
+        return delay
+
+    def _evict_expired(self, key: PoolKey) -> None:
+        """Retire les parcours plus anciens que le TTL"""
+        pool = self._pools[key]
+        limit = time.monotonic() - self.ttl
+        while pool and pool[0][0] < limit:
+            pool.popleft()
+            self.metrics[key]['expired'] += 1
+
+    def _request_refill(self, key: PoolKey) -> None:
+        """Réveille le producteur d'une réserve"""
+        event = self._refill.get(key)
+        if event is not None:
+            event.set()
+
+    async def _generate(self, key: PoolKey, solve: bool = True) -> Optional[Tuple]:
+        """
+        Génère un parcours et met à jour les métriques
+        Retourne: (page_start, page_end, attempts, optimal_clicks) ou None
+        (optimal_clicks None si solve est faux pour un parcours sans difficulté)
+        """
+        lang, difficulty = key
+        metrics = self.metrics[key]
+        started = time.monotonic()
+        result = await self.services[lang].generate_challenge_async(
+            self.bands.get(difficulty), self.max_attempts, solve
+        )
+        elapsed = time.monotonic() - started
+        metrics['generation_time_last'] = elapsed
+        metrics['generation_time_total'] += elapsed
+        if result is None:
+            metrics['failed'] += 1
+            return None
+        metrics['generated'] += 1
+        self._backoff.pop(key, None)
+        return result
+
+    def pop(self, lang: Optional[str] = None, difficulty: Optional[str] = None) -> Optional[Tuple]:
+        """Retire immédiatement un parcours prêt, ou None si la réserve est vide"""
+        key = self._key(lang, difficulty)
+        if key not in self._pools:
+            return None
+        self._evict_expired(key)
+        pool = self._pools[key]
+        self._request_refill(key)
+        if not pool:
+            self.metrics[key]['misses'] += 1
+            return None
+        self.metrics[key]['hits'] += 1
+        return pool.popleft()[1]
+
+    async def get(self, lang: Optional[str] = None, difficulty: Optional[str] = None) -> Optional[Tuple]:
+        """
+        Retourne un parcours prêt, ou en génère un à la volée si la réserve est vide
+        (sans difficulté demandée, le minimum de clics n'est alors pas calculé)
+        Retourne None sans rien générer si la difficulté est en attente après un échec
+        """
+        key = self._key(lang, difficulty)
+        if key in self._pools:
+            result = self.pop(*key)
+            if result is None:
+                result = await self._generate(key, solve=difficulty is not None)
+            return result
+
+        self.metrics[key]['misses'] += 1
+        async with self._on_demand.setdefault(key, asyncio.Lock()):
+            if time.monotonic() < self._backoff.get(key, (0.0, 0.0))[0]:
+                return None
+            result = await self._generate(key)
+            if result is None:
+                self._failed(key)
+            return result
+
+    async def _producer(self, key: PoolKey) -> None:
+        """Maintient une réserve à sa taille cible"""
+        event = self._refill[key]
+        pool = self._pools[key]
+        while True:
+            event.clear()
+            self._evict_expired(key)
+            while len(pool) < self.size:
+                try:
+                    # Minimum de clics calculé d'avance seulement s'il ne coûte aucune requête :
+                    # sinon il l'est à la remise du parcours (/way), pas pour chaque parcours en réserve
+                    result = await self._generate(key, solve=self.services[key[0]].has_local_solver)
+                except Exception as e:
+                    print(f"❌ Erreur de génération de parcours ({self._label(key)}): {e}")
+                    result = None
+                if result is None:
+                    # Évite de marteler l'API en cas d'échecs répétés
+                    await asyncio.sleep(self._failed(key))
+                    continue
+                pool.append((time.monotonic(), result))
+            # Réveil sur demande, ou à mi-TTL pour renouveler les parcours périmés
+            # (asyncio.wait plutôt que wait_for, qui peut avaler une annulation simultanée)
+            waiter = asyncio.ensure_future(event.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=self.ttl / 2)
+            finally:
+                waiter.cancel()
+
+    def start(self) -> None:
+        """Démarre un producteur par réserve (boucle asyncio en cours requise)"""
+        loop = asyncio.get_running_loop()
+        for key in self._pools:
+            if key not in self._tasks or self._tasks[key].done():
+                self._refill[key] = asyncio.Event()
+                self._tasks[key] = loop.create_task(self._producer(key))
+
+    async def stop(self) -> None:
+        """Arrête les producteurs"""
+        for task in self._tasks.values():
+            task.cancel()
+        for task in self._tasks.values():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks.clear()
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Retourne les métriques de chaque réserve, avec sa taille actuelle"""
+        snapshot = {}
+        for key, metrics in self.metrics.items():
+            entry = dict(metrics)
+            # Difficulté sans réserve (générée à la demande) : cible 0
+            entry['ready'] = len(self._pools.get(key, ()))
+            entry['target'] = self.size if key in self._pools else 0
+            attempts = metrics['generated'] + metrics['failed']
+            entry['generation_time_avg'] = (
+                metrics['generation_time_total'] / attempts if attempts else 0.0
+            )
+            snapshot[self._label(key)] = entry
+        return snapshot
@@ -0,0 +1,144 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Calcul du nombre minimal de clics entre deux articles (BFS bidirectionnel)
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def in_band(distance: Optional[int], band: Optional[Tuple[int, Optional[int]]]) -> bool:
+    """Vérifie qu'une distance appartient à une bande de difficulté (min, max ou None)"""
+    if distance is None:
+        return False
+    if band is None:
+        return True
+    low, high = band
+    return distance >= low and (high is None or distance <= high)
+
+
+def _expand(frontier: List, seen: Dict, other_seen: Dict,
+            neighbors: Callable[[object], Iterable]) -> tuple:
+    """
+    Étend toute une couche du parcours
+    Retourne: (nouvelle frontière, meilleure distance via une rencontre ou None)
+    """
+    best = None
+    next_frontier = []
+    for node in frontier:
+        depth = seen[node] + 1
+        for neighbor in neighbors(node):
+            if neighbor in other_seen:
+                total = depth + other_seen[neighbor]
+                if best is None or total < best:
+                    best = total
+            if neighbor not in seen:
+                seen[neighbor] = depth
+                next_frontier.append(neighbor)
+    return next_frontier, best
+
+
+class GraphPathSolver:
+    """Plus court chemin exact sur le graphe de liens local"""
+
+    def __init__(self, graph, max_depth: int = 12):
+        self.graph = graph
+        self.max_depth = max_depth
+
+    def distance(self, source: int, target: int) -> Optional[int]:
+        """Nombre minimal de clics entre deux articles du graphe, None si inatteignable"""
+        if source == target:
+            return 0
+        forward = {source: 0}
+        backward = {target: 0}
+        forward_frontier = [source]
+        backward_frontier = [target]
+
+        for _ in range(self.max_depth):
+            if not forward_frontier or not backward_frontier:
+                return None
+            # On étend le côté le moins coûteux (somme des degrés de la frontière)
+            forward_cost = sum(self.graph.out_degree(n) for n in forward_frontier)
+            backward_cost = sum(self.graph.in_degree(n) for n in backward_frontier)
+            if forward_cost <= backward_cost:
+                forward_frontier, best = _expand(
+                    forward_frontier, forward, backward, self.graph.out_links
+                )
+            else:
+                backward_frontier, best = _expand(
+                    backward_frontier, backward, forward, self.graph.in_links
+                )
+            if best is not None:
+                return best
+        return None
+
+    def shortest_distance(self, source_title: str, target_title: str) -> Optional[int]:
+        """Nombre minimal de clics entre deux titres, None si inconnu ou inatteignable"""
+        source = self.graph.find(source_title)
+        target = self.graph.find(target_title)
+        if source is None or target is None:
+            return None
+        return self.distance(source, target)
+
+
+class ApiPathSolver:
+    """
+    Plus court chemin via l'API MediaWiki, couches interrogées par lots de 50 titres
+    Le résultat est exact tant que le budget de requêtes n'est pas épuisé, None sinon
+    (les liens passant par une redirection ne sont pas suivis)
+    """
+
+    def __init__(self, client, max_depth: int = 6, max_frontier: int = 2000,
+                 max_requests: int = 40):
+        self.client = client
+        self.max_depth = max_depth
+        self.max_frontier = max_frontier
+        self.max_requests = max_requests
+
+    async def _neighbors(self, titles: List[str], backward: bool, budget: List[int]) -> Dict[str, List[str]]:
+        """Récupère liens sortants ou entrants d'une couche, par lots"""
+        result = {}
+        for i in range(0, len(titles), 50):
+            if budget[0] <= 0:
+                raise TimeoutError("budget de requêtes épuisé")
+            budget[0] -= 1
+            batch = titles[i:i + 50]
+            if backward:
+                result.update(await self.client.get_backlinks_many(batch))
+            else:
+                result.update(await self.client.get_links_many(batch))
+        return result
+
+    async def shortest_distance(self, source_title: str, target_title: str) -> Optional[int]:
+        """Nombre minimal de clics entre deux titres, None si non trouvé dans le budget"""
+        if source_title == target_title:
+            return 0
+        forward = {source_title: 0}
+        backward = {target_title: 0}
+        forward_frontier = [source_title]
+        backward_frontier = [target_title]
+        budget = [self.max_requests]
+
+        try:
+            for _ in range(self.max_depth):
+                if not forward_frontier or not backward_frontier:
+                    return None
+                if len(forward_frontier) > self.max_frontier and len(backward_frontier) > self.max_frontier:
+                    return None
+                expand_forward = len(forward_frontier) <= len(backward_frontier)
+                frontier = forward_frontier if expand_forward else backward_frontier
+                adjacency = await self._neighbors(frontier, not expand_forward, budget)
+                if expand_forward:
+                    forward_frontier, best = _expand(
+                        frontier, forward, backward, lambda t: adjacency.get(t, ())
+                    )
+                else:
+                    backward_frontier, best = _expand(
+                        frontier, backward, forward, lambda t: adjacency.get(t, ())
+                    )
+                if best is not None:
+                    return best
+        except TimeoutError:
+            return None
+        return None
@@ -0,0 +1,167 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Classements par période (jour, semaine, mois, saison) avec archivage des périodes terminées
+"""
+
+import json
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.leaderboard_index import LeaderboardIndex
+from utils.periods import PERIODS, current_bucket, period_keys
+
+
+class PeriodLeaderboards:
+    """
+    Un classement par période, limité aux joueurs actifs dans la période en cours, tenu
+    à jour en O(log N) par sauvegarde comme le classement général
+    Au changement de période, le classement terminé est archivé dans un fichier JSON
+    (écrit hors de la boucle) et repart à vide ; les fichiers joueurs ne sont pas réécrits
+    """
+
+    # Périodes dont le classement final est archivé
+    ARCHIVED_PERIODS = ('week', 'month', 'season')
+
+    def __init__(self, archive_dir: Optional[Path] = None,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.archive_dir = Path(archive_dir) if archive_dir is not None else None
+        self.clock = clock
+        self._keys: Dict[str, str] = {}
+        self._boards: Dict[str, LeaderboardIndex] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="period-archive")
+
+    @staticmethod
+    def _row(player_data: Dict, bucket: Dict) -> Dict:
+        """Ligne de classement d'un joueur à partir de son bucket"""
+        return {
+            'points': bucket['points'],
+            'xp': bucket['xp'],
+            'level': player_data.get('level', 1),
+            'parties_gagnees': bucket['wins'],
+            'parties_jouees': bucket['games'],
+        }
+
+    def _board(self, period: str, key: str) -> LeaderboardIndex:
+        """Classement de la période de clé `key`, après archivage de la précédente si elle est finie"""
+        old_key = self._keys.get(period)
+        if old_key != key:
+            board = self._boards.get(period)
+            if board is not None and old_key is not None and old_key < key and len(board):
+                self._archive(period, old_key, board.records('points', 0, len(board)))
+            if old_key is None or old_key < key:
+                self._boards[period] = LeaderboardIndex()
+                self._keys[period] = key
+        return self._boards[period]
+
+    def _current(self, period: str) -> LeaderboardIndex:
+        """Classement de la période en cours"""
+        if period not in PERIODS:
+            raise ValueError(f"Période inconnue : {period}")
+        return self._board(period, period_keys(self.clock())[PERIODS.index(period)])
+
+    def _archive(self, period: str, key: str, standings: List[Dict]) -> Optional[Future]:
+        """Fait écrire le classement final d'une période terminée par le thread d'archivage"""
+        if self.archive_dir is None or period not in self.ARCHIVED_PERIODS:
+            return None
+        future = self._executor.submit(self._write_archive, period, key, standings)
+        future.add_done_callback(self._archived)
+        return future
+
+    @staticmethod
+    def _archived(future: Future) -> None:
+        if future.exception() is not None:
+            print(f"❌ Erreur lors de l'archivage d'un classement: {future.exception()}")
+
+    def _write_archive(self, period: str, key: str, standings: List[Dict]) -> Path:
+        """Écrit atomiquement une archive (thread d'archivage), sauf si elle existe déjà"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / f"{period}-{key}.json"
+        if path.exists():
+            return path
+        for position, record in enumerate(standings, 1):
+            record['position'] = position
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'period': period, 'key': key, 'archived_at': time.time(),
+                       'players': standings}, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        print(f"🗄️ Classement {period} {key} archivé ({len(standings)} joueur(s))")
+        return path
+
+    def build(self, players: Iterable[Dict]) -> None:
+        """
+        Reconstruit les classements en cours (au démarrage)
+        Les périodes terminées pendant un arrêt du bot, pas encore archivées, le sont ici
+        """
+        self._keys = {}
+        self._boards = {}
+        for period in PERIODS:
+            self._current(period)
+        finished: Dict[Tuple[str, str], LeaderboardIndex] = {}
+        for player in players:
+            for period in PERIODS:
+                bucket = (player.get('periods') or {}).get(period)
+                if bucket is None:
+                    continue
+                if bucket['key'] == self._keys[period]:
+                    self._boards[period].update(player['name'], self._row(player, bucket))
+                elif bucket['key'] < self._keys[period] and period in self.ARCHIVED_PERIODS:
+                    stale = finished.setdefault((period, bucket['key']), LeaderboardIndex())
+                    stale.update(player['name'], self._row(player, bucket))
+        for (period, key), board in finished.items():
+            # Classement partiel si des joueurs ont déjà entamé une période plus récente ;
+            # une archive déjà écrite n'est pas remplacée
+            self._archive(period, key, board.records('points', 0, len(board)))
+
+    def update(self, player_name: str, player_data: Dict) -> None:
+        """Reporte une sauvegarde dans les classements des périodes en cours"""
+        # Clés calculées une fois pour les quatre périodes
+        for period, key in zip(PERIODS, period_keys(self.clock())):
+            board = self._board(period, key)
+            bucket = current_bucket(player_data, period, self._keys[period])
+            if bucket is not None:
+                board.update(player_name, self._row(player_data, bucket))
+
+    def current_key(self, period: str) -> str:
+        """Clé de la période en cours"""
+        self._current(period)
+        return self._keys[period]
+
+    def get_page(self, period: str, sort_by: str = 'points', page: int = 0,
+                 page_size: int = 10) -> Dict:
+        """
+        Une page du classement d'une période : seules les lignes de la page sont lues
+        Retourne: {'players': [... avec 'position'], 'page', 'pages', 'total', 'key'}
+        """
+        board = self._current(period)
+        if sort_by not in LeaderboardIndex.CATEGORIES:
+            sort_by = 'points'
+        total = len(board)
+        pages = max(1, -(-total // page_size))
+        page = min(max(page, 0), pages - 1)
+        offset = page * page_size
+        players = board.records(sort_by, offset, page_size)
+        for position, record in enumerate(players, offset + 1):
+            record['position'] = position
+        return {'players': players, 'page': page, 'pages': pages, 'total': total,
+                'key': self._keys[period]}
+
+    def page_of(self, player_name: str, period: str, sort_by: str = 'points',
+                page_size: int = 10) -> Optional[int]:
+        """Page (0-indexée) où figure un joueur dans une période, None s'il n'y a pas joué"""
+        if sort_by not in LeaderboardIndex.CATEGORIES:
+            sort_by = 'points'
+        rank = self._current(period).get_rank(player_name, sort_by)
+        return (rank - 1) // page_size if rank else None
+
+    def close(self) -> None:
+        """Attend l'écriture des archives en cours et arrête le thread d'archivage"""
+        self._executor.shutdown(wait=True)
@@ -5,142 +5,415 @@
 Service de gestion des joueurs
 """
 
-from typing import Optional, List, Dict, Tuple
+from typing import Iterable, Optional, List, Dict, Set, Tuple
 from datetime import datetime
 
+from services.achievement_engine import AchievementEngine
+from services.leaderboard_index import LeaderboardIndex
+from services.rank_tree import MetricRank
+from utils.periods import add_to_periods
+from utils.progression import ProgressionTable
+
+
+class PlayerSession:
+    """
+    Unité de travail sur un joueur : un seul chargement, une seule sauvegarde
+    Toutes les modifications sont appliquées en mémoire puis validées par commit()
+    """
+    
+    def __init__(self, service, player_name: str, data: Dict):
+        self.service = service
+        self.player_name = player_name
+        self.data = data
+        self.old_level = data['level']
+        # État initial (longueur pour les listes) pour retrouver les champs modifiés
+        self._initial = {
+            key: len(value) if isinstance(value, list) else value
+            for key, value in data.items()
+        }
+    
+    def changed_fields(self) -> Set[str]:
+        """Champs modifiés depuis l'ouverture de la session"""
+        initial = self._initial
+        changed = set()
+        for key, value in self.data.items():
+            if isinstance(value, list):
+                value = len(value)
+            if key not in initial or initial[key] != value:
+                changed.add(key)
+        return changed
+    
+    def add_xp(self, xp_amount: int) -> Tuple[bool, int, int]:
+        """Ajoute de l'XP en mémoire. Retourne: (level_up, old_level, new_level)"""
+        return self.service._apply_xp(self.data, xp_amount)
+    
+    def check_achievements(self, extra_fields: Iterable[str] = ()) -> Tuple[List[Dict], int]:
+        """
+        Débloque en mémoire les achievements qui dépendent des champs modifiés dans la session
+        (et de extra_fields, modifiés ailleurs). Retourne: (nouveaux achievements, XP gagné)
+        """
+        changed = self.changed_fields()
+        changed.update(extra_fields)
+        return self.service._apply_achievements(self.data, changed)
+    
+    def commit(self) -> None:
+        """Écrit le joueur en une seule sauvegarde"""
+        self.service.save_player(self.player_name, self.data)
+        self.data['classement'] = self.service.get_rank(self.player_name)
+    
+    def __enter__(self) -> 'PlayerSession':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        # En cas d'erreur, rien n'est écrit : pas de mise à jour partielle
+        if exc_type is None:
+            self.commit()
+        return False
+
 
 class PlayerService:
     """Service de gestion des joueurs"""
     
-    def __init__(self, repository, constants):
+    def __init__(self, repository, constants, track_ranks: bool = True, periods=None):
         self.repository = repository
         self.LEVEL_THRESHOLDS = constants['LEVEL_THRESHOLDS']
         self.RANKS = constants['RANKS']
-        self.ACHIEVEMENTS = constants['ACHIEVEMENTS']
+        self.progression = ProgressionTable(self.LEVEL_THRESHOLDS, self.RANKS)
+        self.achievement_engine = AchievementEngine(constants['ACHIEVEMENTS'])
+        # Sans suivi des classements (relecture du journal), get_rank retourne 0
+        self.track_ranks = track_ranks
+        self.rank_index = LeaderboardIndex()
+        # Rang, percentile et écart au suivant, par statistique (meilleur temps au centième)
+        self.metric_ranks = {
+            'points': MetricRank('points'),
+            'xp': MetricRank('xp'),
+            'best_time': MetricRank('best_time', higher_is_better=False, scale=100),
+        }
+        # Classements par période (PeriodLeaderboards), facultatifs
+        self.periods = periods
+        self._rank_index_ready = False
+        # Sauvegardes survenues pendant une construction asynchrone de l'index
+        self._index_backlog: Optional[Dict[str, Dict]] = None
+    
+    @property
+    def ACHIEVEMENTS(self) -> Dict[str, Dict]:
+        """Achievements de la table en service"""
+        return self.achievement_engine.achievements
+    
+    def _ensure_rank_index(self) -> LeaderboardIndex:
+        """
+        Index de classement construit au démarrage (ensure_rank_index_async ou build_rank_index)
+        Aucun chargement implicite de tous les joueurs ici : depuis la boucle, il la bloquerait
+        """
+        if not self._rank_index_ready:
+            raise RuntimeError(
+                "Index de classement non construit : appeler ensure_rank_index_async() au démarrage"
+            )
+        return self.rank_index
+    
+    def build_rank_index(self) -> LeaderboardIndex:
+        """Construit les structures de classement de façon bloquante (outils, hors boucle)"""
+        if not self._rank_index_ready:
+            self._build_indexes(self.repository.get_all())
+        return self.rank_index
+    
+    def _build_indexes(self, players: List[Dict]) -> None:
+        self.rank_index.build(players)
+        for metric_rank in self.metric_ranks.values():
+            metric_rank.build(players)
+        if self.periods is not None:
+            self.periods.build(players)
+        self._rank_index_ready = True
+    
+    async def ensure_rank_index_async(self) -> LeaderboardIndex:
+        """
+        Comme build_rank_index, sans bloquer la boucle (démarrage du bot) : les joueurs sont lus
+        par le repository hors de la boucle, les sauvegardes faites entre-temps sont reportées ensuite
+        """
+        get_all_async = getattr(self.repository, 'get_all_async', None)
+        if self._rank_index_ready or get_all_async is None:
+            return self.build_rank_index()
+        if self._index_backlog is None:
+            self._index_backlog = {}
+        try:
+            players = await get_all_async()
+            if not self._rank_index_ready:
+                self._build_indexes(players)
+                for player_name, data in (self._index_backlog or {}).items():
+                    self._update_indexes(player_name, data)
+        finally:
+            self._index_backlog = None
+        return self.rank_index
+    
+    async def preload_players(self, player_names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Charge à l'avance des joueurs sans bloquer la boucle : les méthodes synchrones
+        appelées ensuite (victoire, manche) les trouvent en mémoire
+        Retourne: {nom: données} pour les joueurs existants
+        """
+        load_many_async = getattr(self.repository, 'load_many_async', None)
+        if load_many_async is None:
+            return self.repository.load_many(player_names)
+        return await load_many_async(player_names)
+    
+    async def get_player_async(self, player_name: str) -> Optional[Dict]:
+        """Comme get_player, sans bloquer la boucle"""
+        await self.preload_players([player_name])
+        return self.get_player(player_name)
+    
+    async def create_players_async(self, player_names: List[str]) -> List[str]:
+        """Comme create_players, sans bloquer la boucle"""
+        return self._create_missing(player_names, await self.preload_players(player_names))
     
     def create_player(self, player_name: str) -> Dict:
         """Crée un nouveau joueur ou charge ses données"""
         if not self.repository.exists(player_name):
             from models.player import Player
             data = Player.create_default_data()
-            self.repository.save(player_name, data)
+            self.save_player(player_name, data)
             return data
-        return self.repository.load(player_name)
+        return self.get_player(player_name)
+    
+    def create_players(self, player_names: List[str]) -> List[str]:
+        """
+        Crée en un seul lot les joueurs qui n'existent pas encore
+        Retourne: les noms des joueurs créés
+        """
+        return self._create_missing(player_names, self.repository.load_many(player_names))
+    
+    def _create_missing(self, player_names: List[str], existing: Dict[str, Dict]) -> List[str]:
+        from models.player import Player
+        created = {
+            name: Player.create_default_data()
+            for name in dict.fromkeys(player_names) if name not in existing
+        }
+        self.save_players(created)
+        return list(created)
     
     def get_player(self, player_name: str) -> Optional[Dict]:
-        """Récupère un joueur"""
-        return self.repository.load(player_name)
+        """Récupère un joueur, avec son classement calculé à la lecture"""
+        data = self.repository.load(player_name)
+        if data is not None:
+            data['classement'] = self.get_rank(player_name)
+        return data
     
     def save_player(self, player_name: str, data: Dict) -> None:
-        """Sauvegarde un joueur"""
-        self.repository.save(player_name, data)
+        """Sauvegarde un joueur et met à jour l'index de classement"""
+        # Le classement est dérivé de l'index, il n'est pas persisté
+        stored = dict(data)
+        stored.pop('classement', None)
+        stored.pop('name', None)
+        self.repository.save(player_name, stored)
+        if self._rank_index_ready:
+            self._update_indexes(player_name, stored)
+        elif self._index_backlog is not None:
+            self._index_backlog[player_name] = stored
     
-    def get_all_players(self, sort_by: str = 'points') -> List[Dict]:
-        """Retourne tous les joueurs triés"""
-        players = self.repository.get_all()
-        
-        if sort_by == 'level':
-            return sorted(players, key=lambda x: x['level'], reverse=True)
-        elif sort_by == 'xp':
-            return sorted(players, key=lambda x: x['xp'], reverse=True)
-        elif sort_by == 'winrate':
-            for p in players:
-                p['win_rate'] = (p['parties_gagnees'] / p['parties_jouees'] * 100) if p['parties_jouees'] > 0 else 0
-            return sorted(players, key=lambda x: x['win_rate'], reverse=True)
-        else:
-            return sorted(players, key=lambda x: x['points'], reverse=True)
-    
-    def update_rankings(self) -> None:
-        """Met à jour le classement de tous les joueurs"""
-        players = self.get_all_players()
-        for i, player in enumerate(players, 1):
-            player_data = self.get_player(player['name'])
-            if player_data:
-                player_data['classement'] = i
-                self.save_player(player['name'], player_data)
+    def save_players(self, players: Dict[str, Dict]) -> None:
+        """Sauvegarde plusieurs joueurs en une seule opération du repository"""
+        if not players:
+            return
+        stored = {}
+        for player_name, data in players.items():
+            data = dict(data)
+            data.pop('classement', None)
+            data.pop('name', None)
+            stored[player_name] = data
+        self.repository.save_many(stored)
+        if self._rank_index_ready:
+            for player_name, data in stored.items():
+                self._update_indexes(player_name, data)
+        elif self._index_backlog is not None:
+            self._index_backlog.update(stored)
+    
+    def _update_indexes(self, player_name: str, data: Dict) -> None:
+        """Reporte une sauvegarde dans les structures de classement"""
+        self.rank_index.update(player_name, data)
+        for metric_rank in self.metric_ranks.values():
+            metric_rank.update(player_name, data)
+        if self.periods is not None:
+            self.periods.update(player_name, data)
+    
+    def get_rank_stats(self, player_name: str) -> Dict[str, Optional[Dict]]:
+        """
+        Position actuelle d'un joueur par statistique (points, xp, best_time)
+        Retourne: {statistique: {'rank', 'total', 'percentile', 'gap'} ou None}
+        """
+        if not self.track_ranks:
+            return {metric: None for metric in self.metric_ranks}
+        self._ensure_rank_index()
+        return {
+            metric: metric_rank.stats(player_name)
+            for metric, metric_rank in self.metric_ranks.items()
+        }
+    
+    def get_rank(self, player_name: str, category: str = 'points') -> int:
+        """Retourne la position actuelle d'un joueur dans un classement"""
+        if not self.track_ranks:
+            return 0
+        return self._ensure_rank_index().get_rank(player_name, category)
+    
+    def get_leaderboard_page(self, sort_by: str = 'points', page: int = 0,
+                             page_size: int = 10, period: Optional[str] = None) -> Dict:
+        """
+        Une page d'un classement : seules les lignes de la page sont lues dans l'index
+        Avec `period` ('day', 'week', 'month', 'season'), classement de la période en cours
+        Retourne: {'players': [... avec 'position'], 'page', 'pages', 'total'} (+ 'key' par période)
+        """
+        index = self._ensure_rank_index()
+        if period is not None and self.periods is not None:
+            return self.periods.get_page(period, sort_by, page, page_size)
+        if sort_by not in index.CATEGORIES:
+            sort_by = 'points'
+        total = len(index)
+        pages = max(1, -(-total // page_size))
+        page = min(max(page, 0), pages - 1)
+        offset = page * page_size
+        players = []
+        for position, record in enumerate(index.records(sort_by, offset, page_size), offset + 1):
+            record['position'] = position
+            players.append(record)
+        return {'players': players, 'page': page, 'pages': pages, 'total': total}
+    
+    def get_leaderboard_page_of(self, player_name: str, sort_by: str = 'points',
+                                page_size: int = 10, period: Optional[str] = None) -> Optional[int]:
+        """Page (0-indexée) où figure un joueur, None s'il n'est pas classé"""
+        if period is not None and self.periods is not None:
+            if not self.track_ranks:
+                return None
+            self._ensure_rank_index()
+            return self.periods.page_of(player_name, period, sort_by, page_size)
+        rank = self.get_rank(player_name, sort_by if sort_by in LeaderboardIndex.CATEGORIES else 'points')
+        return (rank - 1) // page_size if rank else None
+    
+    def session(self, player_name: str) -> PlayerSession:
+        """
+        Ouvre une unité de travail sur un joueur (créé en mémoire s'il n'existe pas)
+        À utiliser avec `with` : la sauvegarde unique a lieu en sortie de bloc
+        """
+        player_data = self.get_player(player_name)
+        if player_data is None:
+            from models.player import Player
+            player_data = Player.create_default_data()
+        return PlayerSession(self, player_name, player_data)
     
     def add_xp(self, player_name: str, xp_amount: int) -> Tuple[bool, int, int]:
         """
         Ajoute de l'XP à un joueur et gère les montées de niveau
         Retourne: (level_up, old_level, new_level)
         """
-        player_data = self.get_player(player_name)
-        if not player_data:
+        if not self.repository.exists(player_name):
             return False, 0, 0
         
+        with self.session(player_name) as session:
+            return session.add_xp(xp_amount)
+    
+    def check_achievements(self, player_name: str) -> Tuple[List[Dict], int]:
+        """
+        Vérifie et débloque les achievements d'un joueur
+        Retourne: (liste des nouveaux achievements, XP total gagné)
+        """
+        if not self.repository.exists(player_name):
+            return [], 0
+        
+        # Vérification complète : aucun champ n'a été modifié dans cette session
+        with self.session(player_name) as session:
+            return self._apply_achievements(session.data)
+    
+    def _apply_xp(self, player_data: Dict, xp_amount: int) -> Tuple[bool, int, int]:
+        """Applique un gain d'XP sur des données déjà chargées"""
         old_level = player_data['level']
         player_data['xp'] += xp_amount
         
         # Vérifier les montées de niveau
-        new_level = old_level
-        for level, required_xp in sorted(self.LEVEL_THRESHOLDS.items()):
-            if player_data['xp'] >= required_xp:
-                new_level = level
-        
+        new_level = self.progression.level_for_xp(player_data['xp'])
         player_data['level'] = new_level
-        self.save_player(player_name, player_data)
         
         return new_level > old_level, old_level, new_level
     
-    def check_achievements(self, player_name: str) -> Tuple[List[Dict], int]:
+    def _apply_achievements(self, player_data: Dict,
+                            changed_fields: Optional[Iterable[str]] = None) -> Tuple[List[Dict], int]:
         """
-        Vérifie et débloque les achievements d'un joueur
-        Retourne: (liste des nouveaux achievements, XP total gagné)
+        Débloque les achievements sur des données déjà chargées
+        Seules les règles lisant un champ de changed_fields sont évaluées (toutes si None)
         """
-        player_data = self.get_player(player_name)
-        if not player_data:
-            return [], 0
-        
         unlocked = []
         current_achievements = player_data.get('achievements', [])
         total_xp_from_achievements = 0
         
-        for achievement_id, achievement in self.ACHIEVEMENTS.items():
-            if achievement_id not in current_achievements:
-                if achievement['check'](player_data):
-                    current_achievements.append(achievement_id)
-                    unlocked.append(achievement)
-                    total_xp_from_achievements += achievement['xp']
+        for achievement_id, achievement in self.achievement_engine.evaluate(player_data, changed_fields):
+            current_achievements.append(achievement_id)
+            unlocked.append(achievement)
+            total_xp_from_achievements += achievement['xp']
         
         player_data['achievements'] = current_achievements
-        self.save_player(player_name, player_data)
         
         if total_xp_from_achievements > 0:
-            self.add_xp(player_name, total_xp_from_achievements)
+            self._apply_xp(player_data, total_xp_from_achievements)
         
         return unlocked, total_xp_from_achievements
     
+    def set_achievements(self, engine: AchievementEngine) -> None:
+        """
+        Remplace la table des achievements (rechargement à chaud)
+        Une seule affectation : une évaluation en cours garde l'ancienne table jusqu'au bout
+        """
+        self.achievement_engine = engine
+    
+    def achievement_progress(self, player_data: Dict) -> Dict[str, Dict]:
+        """Avancement de chaque achievement: {id: {'current', 'target', 'done'}}"""
+        return self.achievement_engine.progress(player_data)
+    
     def get_rank_info(self, level: int) -> Dict:
         """Retourne les informations du rang selon le niveau"""
-        for level_range, rank_info in self.RANKS.items():
-            if level in level_range:
-                return rank_info
-        return self.RANKS[range(1, 5)]
+        return self.progression.rank_for_level(level)
     
-    def increment_played_games(self, player_names: List[str]) -> None:
+    def recompute_levels(self) -> int:
+        """
+        Recalcule le niveau de tous les joueurs d'après leur XP (changement de paliers,
+        remise à zéro de saison). Retourne: le nombre de joueurs modifiés
+        """
+        players = self.repository.get_all()
+        levels = self.progression.levels_for_xp(p['xp'] for p in players)
+        changed = {}
+        for player, level in zip(players, levels):
+            if player['level'] != level:
+                player['level'] = level
+                changed[player['name']] = player
+        self.save_players(changed)
+        return len(changed)
+    
+    def increment_played_games(self, player_names: List[str],
+                               played_at: Optional[float] = None) -> None:
         """Incrémente le compteur de parties jouées pour plusieurs joueurs"""
-        for player_name in player_names:
-            player_data = self.get_player(player_name)
-            if player_data:
-                player_data['parties_jouees'] += 1
-                player_data['current_streak'] += 1
-                player_data['last_played'] = datetime.now().isoformat()
-                self.save_player(player_name, player_data)
-    
-    def decrement_played_games(self, player_names: List[str]) -> None:
+        last_played = (
+            datetime.fromtimestamp(played_at) if played_at is not None else datetime.now()
+        ).isoformat()
+        players = self.repository.load_many(player_names)
+        for player_data in players.values():
+            player_data['parties_jouees'] += 1
+            player_data['current_streak'] += 1
+            player_data['last_played'] = last_played
+            add_to_periods(player_data, played_at, games=1)
+        self.save_players(players)
+    
+    def decrement_played_games(self, player_names: List[str],
+                               cancelled_at: Optional[float] = None) -> None:
         """Décrémente le compteur de parties jouées pour plusieurs joueurs"""
-        for player_name in player_names:
-            player_data = self.get_player(player_name)
-            if player_data:
-                player_data['parties_jouees'] = max(0, player_data['parties_jouees'] - 1)
-                player_data['current_streak'] = max(0, player_data['current_streak'] - 1)
-                self.save_player(player_name, player_data)
+        players = self.repository.load_many(player_names)
+        for player_data in players.values():
+            player_data['parties_jouees'] = max(0, player_data['parties_jouees'] - 1)
+            player_data['current_streak'] = max(0, player_data['current_streak'] - 1)
+            add_to_periods(player_data, cancelled_at, games=-1)
+        self.save_players(players)
     
     def reset_win_streaks_except(self, player_names: List[str], exception: str) -> None:
         """Réinitialise les win streaks de tous les joueurs sauf un"""
-        for player_name in player_names:
-            if player_name != exception:
-                player_data = self.get_player(player_name)
-                if player_data:
-                    player_data['win_streak'] = 0
-                    self.save_player(player_name, player_data)
+        players = self.repository.load_many(name for name in player_names if name != exception)
+        # Seuls les joueurs dont la série était en cours sont réécrits
+        changed = {}
+        for player_name, player_data in players.items():
+            if player_data.get('win_streak', 0):
+                player_data['win_streak'] = 0
+                changed[player_name] = player_data
+        self.save_players(changed)
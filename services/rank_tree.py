@@ -0,0 +1,152 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Arbres de Fenwick sur les valeurs des joueurs : rang, percentile et écart au suivant
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+
+class FenwickTree:
+    """
+    Nombre de joueurs par valeur entière positive, avec sommes préfixes en O(log M)
+    Le domaine double automatiquement quand une valeur le dépasse
+    """
+
+    def __init__(self, size: int = 1024):
+        self.size = max(1, size)
+        self._tree = [0] * (self.size + 1)
+        self.total = 0
+
+    def _grow(self, value: int) -> None:
+        """Agrandit le domaine pour contenir value (reconstruction en O(M))"""
+        counts = [self.count_at(v) for v in range(self.size)]
+        size = self.size
+        while size <= value:
+            size *= 2
+        counts.extend([0] * (size - self.size))
+        self.size = size
+        tree = [0] + counts
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def add(self, value: int, delta: int) -> None:
+        """Ajoute delta joueurs à la valeur donnée"""
+        if value >= self.size:
+            self._grow(value)
+        self.total += delta
+        index = value + 1
+        tree = self._tree
+        while index <= self.size:
+            tree[index] += delta
+            index += index & -index
+
+    def count_le(self, value: int) -> int:
+        """Nombre de joueurs de valeur inférieure ou égale"""
+        if value < 0:
+            return 0
+        index = min(value, self.size - 1) + 1
+        tree = self._tree
+        count = 0
+        while index > 0:
+            count += tree[index]
+            index -= index & -index
+        return count
+
+    def count_at(self, value: int) -> int:
+        return self.count_le(value) - self.count_le(value - 1)
+
+    def kth_smallest(self, k: int) -> Optional[int]:
+        """Valeur du k-ième joueur par ordre croissant (1-indexé), None hors bornes"""
+        if k <= 0 or k > self.total:
+            return None
+        position = 0
+        step = 1 << self.size.bit_length()
+        tree = self._tree
+        while step:
+            following = position + step
+            if following <= self.size and tree[following] < k:
+                position = following
+                k -= tree[following]
+            step >>= 1
+        return position
+
+
+class MetricRank:
+    """
+    Rang des joueurs sur une statistique, maintenu à chaque sauvegarde
+    Les valeurs sont ramenées à des entiers (`scale` unités par point) ; avec
+    higher_is_better=False (meilleur temps), la plus petite valeur est première
+    """
+
+    def __init__(self, field: str, higher_is_better: bool = True, scale: int = 1):
+        self.field = field
+        self.higher_is_better = higher_is_better
+        self.scale = scale
+        self.tree = FenwickTree()
+        self._values: Dict[str, int] = {}
+
+    def _quantize(self, data: Dict) -> Optional[int]:
+        """Valeur entière d'un joueur, None s'il n'est pas classé (ex. aucun temps)"""
+        value = data.get(self.field)
+        if value is None or (isinstance(value, float) and not math.isfinite(value)):
+            return None
+        return max(0, int(round(value * self.scale)))
+
+    def build(self, players: Iterable[Dict]) -> None:
+        """Reconstruit entièrement le classement (au démarrage)"""
+        self.tree = FenwickTree()
+        self._values = {}
+        for player in players:
+            self.update(player['name'], player)
+
+    def update(self, player_name: str, data: Dict) -> None:
+        """Met à jour la valeur d'un joueur"""
+        new_value = self._quantize(data)
+        old_value = self._values.get(player_name)
+        if new_value == old_value:
+            return
+        if old_value is not None:
+            self.tree.add(old_value, -1)
+            del self._values[player_name]
+        if new_value is not None:
+            self.tree.add(new_value, 1)
+            self._values[player_name] = new_value
+
+    def remove(self, player_name: str) -> None:
+        old_value = self._values.pop(player_name, None)
+        if old_value is not None:
+            self.tree.add(old_value, -1)
+
+    def stats(self, player_name: str) -> Optional[Dict]:
+        """
+        Rang exact (ex aequo au même rang), part des joueurs classés devant ou à égalité,
+        et écart à combler pour dépasser le joueur juste devant
+        Retourne: {'rank', 'total', 'percentile', 'gap'} ou None si le joueur n'est pas classé
+        """
+        value = self._values.get(player_name)
+        if value is None:
+            return None
+        tree = self.tree
+        below_or_equal = tree.count_le(value)
+        if self.higher_is_better:
+            ahead = tree.total - below_or_equal
+            # Valeur immédiatement supérieure : premier joueur après ceux <= value
+            next_value = tree.kth_smallest(below_or_equal + 1)
+            gap = next_value - value + 1 if next_value is not None else None
+        else:
+            ahead = tree.count_le(value - 1)
+            next_value = tree.kth_smallest(ahead)
+            gap = value - next_value + 1 if next_value is not None else None
+        rank = ahead + 1
+        return {
+            'rank': rank,
+            'total': tree.total,
+            'percentile': rank / tree.total * 100,
+            'gap': gap / self.scale if gap is not None and self.scale != 1 else gap,
+        }
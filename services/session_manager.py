@@ -0,0 +1,120 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Sessions de jeu indépendantes par serveur et par salon
+"""
+
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+import discord
+
+from models.game_session import GameSession
+
+
+# Clé d'une session : (guild_id, channel_id), 0 pour les messages privés
+SessionKey = Tuple[int, int]
+
+
+class SessionManager:
+    """
+    Registre des sessions de jeu, une par (serveur, salon)
+    Les sessions non classées inutilisées depuis idle_ttl secondes (parcours /way dans un
+    salon textuel, que rien d'autre ne supprime) sont retirées lors des créations suivantes
+    """
+
+    # Intervalle minimal entre deux purges des sessions inactives (secondes)
+    PRUNE_INTERVAL = 60.0
+
+    def __init__(self, idle_ttl: Optional[float] = 3600.0):
+        self.idle_ttl = idle_ttl
+        self._sessions: Dict[SessionKey, GameSession] = {}
+        # Dernière utilisation de chaque session (horloge monotone)
+        self._last_used: Dict[SessionKey, float] = {}
+        self._last_prune = time.monotonic()
+        # Message du parcours en cours => session, pour les réactions
+        self._messages: Dict[int, SessionKey] = {}
+        self._message_of: Dict[SessionKey, int] = {}
+
+    @staticmethod
+    def key_for(interaction: discord.Interaction) -> SessionKey:
+        """
+        Résout la session d'une interaction : le salon vocal de l'utilisateur s'il y est
+        connecté (les parties classées s'y rattachent), sinon le salon textuel
+        """
+        voice = getattr(interaction.user, 'voice', None)
+        if voice is not None and voice.channel is not None:
+            channel_id = voice.channel.id
+        else:
+            channel_id = interaction.channel_id
+        return (interaction.guild_id or 0, channel_id)
+
+    def get(self, key: SessionKey) -> Optional[GameSession]:
+        """Retourne la session d'une clé, ou None si elle n'existe pas"""
+        session = self._sessions.get(key)
+        if session is not None:
+            self._last_used[key] = time.monotonic()
+        return session
+
+    def get_or_create(self, key: SessionKey) -> GameSession:
+        """Retourne la session d'une clé, en la créant au besoin"""
+        session = self.get(key)
+        if session is None:
+            self.prune()
+            session = GameSession()
+            self._sessions[key] = session
+            self._last_used[key] = time.monotonic()
+        return session
+
+    def for_interaction(self, interaction: discord.Interaction,
+                        create: bool = True) -> Optional[GameSession]:
+        """Retourne la session concernée par une interaction"""
+        key = self.key_for(interaction)
+        return self.get_or_create(key) if create else self.get(key)
+
+    def bind_message(self, key: SessionKey, message_id: int) -> None:
+        """Associe le message du parcours en cours à sa session (remplace le précédent)"""
+        previous = self._message_of.pop(key, None)
+        if previous is not None:
+            self._messages.pop(previous, None)
+        self._messages[message_id] = key
+        self._message_of[key] = message_id
+
+    def for_message(self, message_id: int) -> Optional[GameSession]:
+        """Retourne la session dont message_id est le message de parcours"""
+        key = self._messages.get(message_id)
+        return self.get(key) if key is not None else None
+
+    def discard(self, key: SessionKey) -> None:
+        """Supprime une session et son message de parcours"""
+        self._sessions.pop(key, None)
+        self._last_used.pop(key, None)
+        message_id = self._message_of.pop(key, None)
+        if message_id is not None:
+            self._messages.pop(message_id, None)
+
+    def prune(self, force: bool = False) -> int:
+        """
+        Supprime les sessions non classées inactives depuis plus de idle_ttl
+        (au plus une fois par PRUNE_INTERVAL sauf si force). Retourne: le nombre supprimé
+        """
+        now = time.monotonic()
+        if self.idle_ttl is None or (not force and now - self._last_prune < self.PRUNE_INTERVAL):
+            return 0
+        self._last_prune = now
+        limit = now - self.idle_ttl
+        stale = [
+            key for key, session in self._sessions.items()
+            if self._last_used.get(key, now) < limit
+            and not session.enabled and not session.lock.locked()
+        ]
+        for key in stale:
+            self.discard(key)
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __iter__(self) -> Iterator[Tuple[SessionKey, GameSession]]:
+        return iter(list(self._sessions.items()))
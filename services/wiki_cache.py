@@ -0,0 +1,222 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Cache à deux niveaux (mémoire + SQLite) pour les réponses Wikipedia
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+class WikiCache:
+    """
+    Cache LRU en mémoire adossé à une base SQLite persistante, clé (lang, kind, title)
+    Les écritures et les dates d'accès sont validées par lots ; depuis la boucle,
+    aget/aset exécutent les accès disque sur le thread dédié du cache
+    Deux verrous : _lock ne protège que l'état en mémoire (LRU, lots en attente) et n'est
+    jamais tenu pendant un accès SQLite ; _db_lock sérialise les accès à la connexion
+    """
+
+    DEFAULT_TTLS = {
+        'summary': 7 * 24 * 3600,
+        'links': 24 * 3600,
+        'page': 24 * 3600,
+        'search': 24 * 3600,
+    }
+
+    # Nombre d'écritures et d'accès en attente déclenchant une validation groupée
+    WRITE_BATCH = 100
+
+    def __init__(self, db_path: Path, memory_size: int = 2048, max_entries: int = 100000,
+                 ttls: Optional[Dict[str, float]] = None):
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._writes_since_eviction = 0
+        # Lignes à écrire et dates d'accès à reporter, validées ensemble par flush()
+        self._pending: Dict[Tuple[str, str, str], Tuple[str, float, float]] = {}
+        # Lot en cours d'écriture par flush(), encore lisible par get() jusqu'à sa validation
+        self._flushing: Dict[Tuple[str, str, str], Tuple[str, float, float]] = {}
+        self._touched: Dict[Tuple[str, str, str], float] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wiki-cache")
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "lang TEXT NOT NULL, kind TEXT NOT NULL, title TEXT NOT NULL, "
+                "value TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL, "
+                "PRIMARY KEY (lang, kind, title))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed)")
+
+    def _remember(self, key: Tuple[str, str, str], expires: float, value: Any) -> None:
+        """Place une entrée en tête du niveau mémoire"""
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _get_memory(self, key: Tuple[str, str, str], now: float) -> Optional[Any]:
+        """Niveau mémoire seul (appelé verrou tenu)"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return entry[1]
+            del self._memory[key]
+        return None
+
+    def get(self, lang: str, kind: str, title: str) -> Optional[Any]:
+        """Retourne la valeur en cache, ou None si absente ou expirée (appel bloquant)"""
+        key = (lang, kind, title)
+        now = time.time()
+        with self._lock:
+            value = self._get_memory(key, now)
+            if value is not None:
+                return value
+            row = self._pending.get(key) or self._flushing.get(key)
+
+        if row is None:
+            # Lecture disque hors du verrou mémoire : aget/aset ne l'attendent pas
+            with self._db_lock:
+                row = self._conn.execute(
+                    "SELECT value, expires FROM cache WHERE lang = ? AND kind = ? AND title = ?", key
+                ).fetchone()
+
+        with self._lock:
+            # Valeur enregistrée pendant la lecture disque : plus récente que la ligne lue
+            row = self._pending.get(key) or self._flushing.get(key) or row
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            if row[1] <= now:
+                # La ligne expirée est supprimée par la prochaine éviction
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            value = json.loads(row[0])
+            # Date d'accès reportée au prochain lot plutôt qu'une écriture par lecture
+            self._touched[key] = now
+            self._remember(key, row[1], value)
+            self.stats['disk_hits'] += 1
+            return value
+
+    async def aget(self, lang: str, kind: str, title: str) -> Optional[Any]:
+        """get() sans bloquer la boucle : seul un défaut du niveau mémoire passe par le thread du cache"""
+        with self._lock:
+            value = self._get_memory((lang, kind, title), time.time())
+        if value is not None:
+            return value
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get, lang, kind, title)
+
+    def _stage(self, lang: str, kind: str, title: str, value: Any) -> bool:
+        """
+        Place une valeur en mémoire et dans le lot en attente
+        Retourne: True si le lot doit être validé
+        """
+        key = (lang, kind, title)
+        now = time.time()
+        expires = now + self.ttls.get(kind, 24 * 3600)
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, expires, value)
+            self._pending[key] = (payload, expires, now)
+            self._touched.pop(key, None)
+            return len(self._pending) + len(self._touched) >= self.WRITE_BATCH
+
+    def set(self, lang: str, kind: str, title: str, value: Any) -> None:
+        """Enregistre une valeur dans les deux niveaux avec le TTL de son type (appel bloquant)"""
+        if self._stage(lang, kind, title, value):
+            self.flush()
+
+    async def aset(self, lang: str, kind: str, title: str, value: Any) -> None:
+        """set() sans bloquer la boucle : la validation du lot a lieu sur le thread du cache"""
+        if self._stage(lang, kind, title, value):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self.flush)
+
+    def flush(self) -> None:
+        """Valide en une transaction les écritures et les dates d'accès en attente"""
+        # _db_lock d'abord : les flush sont sérialisés et un seul lot est en cours d'écriture
+        with self._db_lock:
+            with self._lock:
+                if not self._pending and not self._touched:
+                    return
+                pending, self._pending = self._pending, {}
+                touched, self._touched = self._touched, {}
+                self._flushing = pending
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO cache (lang, kind, title, value, expires, accessed) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [key + row for key, row in pending.items()]
+                    )
+                    self._conn.executemany(
+                        "UPDATE cache SET accessed = ? WHERE lang = ? AND kind = ? AND title = ?",
+                        [(accessed,) + key for key, accessed in touched.items()]
+                    )
+            except BaseException:
+                # Lot remis en attente, sans écraser une valeur plus récente
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                    self._flushing = {}
+                raise
+            with self._lock:
+                self._flushing = {}
+            self._writes_since_eviction += len(pending)
+            if self._writes_since_eviction >= 1000:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Supprime les entrées expirées puis les moins récemment utilisées au-delà de la limite
+        (appelé _db_lock tenu)
+        """
+        self._writes_since_eviction = 0
+        with self._conn:
+            self._conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE rowid IN "
+                    "(SELECT rowid FROM cache ORDER BY accessed LIMIT ?)", (excess,)
+                )
+                with self._lock:
+                    self.stats['evicted'] += excess
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retourne les compteurs de succès/échecs et la taille des deux niveaux"""
+        with self._db_lock:
+            disk_size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        with self._lock:
+            return {
+                **self.stats, 'memory_size': len(self._memory),
+                'disk_size': disk_size, 'pending': len(self._pending),
+            }
+
+    def close(self) -> None:
+        """Valide le lot en attente et ferme la base du cache"""
+        self._executor.shutdown(wait=True)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
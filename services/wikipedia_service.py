@@ -5,18 +5,256 @@
 Service d'interaction avec l'API Wikipedia
 """
 
+import asyncio
+import os
 import wikipedia
 import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from wikipedia.exceptions import DisambiguationError, PageError
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
+
+from models.path_endpoint import PathEndpoint
+from graph import sampler
+from services.path_solver import GraphPathSolver, ApiPathSolver, in_band
 
 
 class WikipediaService:
     """Service d'interaction avec Wikipedia"""
     
-    def __init__(self, lang: str = "fr", random_pages: int = 10):
+    def __init__(self, lang: str = "fr", random_pages: int = 10, max_concurrency: int = 4,
+                 client=None, cache=None, graph=None, workers: int = 2):
         wikipedia.set_lang(lang)
+        self.lang = lang
+        # Cache WikiCache optionnel pour les sommaires
+        self.cache = cache
+        # Graphe de liens hors ligne optionnel : génération de parcours sans réseau
+        self.graph = graph
+        # Solveur du nombre minimal de clics : graphe local en priorité, sinon API
+        self._process_pool = None
+        if graph is not None:
+            self.solver = GraphPathSolver(graph)
+            # Tirages hors ligne répartis sur des processus : un parcours difficile
+            # ne bloque ni la boucle ni les autres producteurs
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=workers, initializer=sampler.init_worker, initargs=(graph.graph_dir,)
+            )
+        elif client is not None:
+            self.solver = ApiPathSolver(client)
+        else:
+            self.solver = None
         self.random_pages = random_pages
+        # Client MediaWiki asynchrone optionnel ; sans lui, la bibliothèque wikipedia est utilisée
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # La bibliothèque wikipedia est bloquante : ses appels tournent dans
+        # un pool de threads dont la taille borne le nombre de requêtes simultanées
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="wikipedia"
+        )
+    
+    @property
+    def has_distance_tables(self) -> bool:
+        """Tirage direct dans une bande de difficulté possible (tables de distances hors ligne)"""
+        return self.graph is not None and bool(self.graph.distance_tables)
+    
+    @property
+    def has_local_solver(self) -> bool:
+        """Minimum de clics calculable sans appel réseau (graphe hors ligne chargé)"""
+        return isinstance(self.solver, GraphPathSolver)
+    
+    async def _run(self, func, *args, **kwargs):
+        """Exécute un appel bloquant hors de la boucle d'événements"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+    
+    async def generate_path_async(self, max_attempts: int = 10) -> Optional[Tuple]:
+        """Version non bloquante de generate_path"""
+        if self.graph is not None:
+            return await self._run(self.generate_path_offline, max_attempts)
+        
+        if self.client is None:
+            return await self._run(self.generate_path, max_attempts)
+        
+        async with self._semaphore:
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    result = await self._generate_path_api()
+                except Exception:
+                    continue
+                if result is not None:
+                    return result[0], result[1], attempt
+        return None
+    
+    async def _generate_path_api(self) -> Optional[Tuple]:
+        """
+        Génère un parcours via le client MediaWiki en deux requêtes :
+        deux articles aléatoires avec leurs liens, puis la résolution de quelques liens
+        """
+        pages = await self.client.random_pages_with_links(2)
+        pages = [p for p in pages if self.client.is_valid_page(p)]
+        if len(pages) < 2:
+            return None
+        
+        # Article de départ
+        page_start = self.client.to_endpoint(pages[0])
+        
+        # Article d'arrivée (via un lien de la seconde page)
+        source = pages[1]
+        links = [link['title'] for link in source.get('links', [])]
+        page_target = None
+        if links:
+            candidates = await self.client.resolve(random.sample(links, min(5, len(links))))
+            if candidates:
+                page_target = random.choice(candidates)
+        if page_target is None:
+            page_target = self.client.to_endpoint(source)
+        
+        return page_start, page_target
+    
+    def generate_path_offline(self, max_attempts: int = 10) -> Optional[Tuple]:
+        """
+        Génère un parcours depuis le graphe de liens local, sans appel réseau
+        Retourne: (page_start, page_end, attempts) ou None
+        """
+        for attempt in range(1, max_attempts + 1):
+            pair = self.graph.sample_path()
+            if pair is not None:
+                start, target = pair
+                return self._graph_page(start), self._graph_page(target), attempt
+        return None
+    
+    def _graph_page(self, node: int) -> PathEndpoint:
+        """Construit la référence d'un article du graphe"""
+        return PathEndpoint(self.graph.page_id(node), self.graph.title(node), self.graph.url(node), self.lang)
+    
+    async def generate_challenge_async(self, band: Optional[Tuple] = None, max_attempts: int = 10,
+                                       solve: bool = True) -> Optional[Tuple]:
+        """
+        Génère un parcours, éventuellement dans une bande de difficulté (min, max) en clics
+        Retourne: (page_start, page_end, attempts, optimal_clicks) ou None
+        """
+        if self._process_pool is not None:
+            loop = asyncio.get_running_loop()
+            found = await loop.run_in_executor(
+                self._process_pool,
+                partial(sampler.sample_path, band, max_attempts, int.from_bytes(os.urandom(8), 'big'))
+            )
+            if found is None:
+                return None
+            start, target, attempt, optimal = found
+            page_target = self._graph_page(target)
+            page_target.optimal = optimal
+            return self._graph_page(start), page_target, attempt, optimal
+        
+        if band is None:
+            result = await self.generate_path_async(max_attempts)
+            if result is None:
+                return None
+            page_start, page_target, attempt = result
+            if solve:
+                page_target.optimal = await self.shortest_distance_async(page_start.title, page_target.title)
+            return page_start, page_target, attempt, page_target.optimal
+        
+        # Pas de données de distance locales : tirage puis rejet selon le solveur,
+        # au plus max_attempts tirages et résolutions au total
+        if self.solver is None:
+            return None
+        for attempt in range(1, max_attempts + 1):
+            result = await self.generate_path_async(1)
+            if result is None:
+                continue
+            optimal = await self.shortest_distance_async(result[0].title, result[1].title)
+            if in_band(optimal, band):
+                result[1].optimal = optimal
+                return result[0], result[1], attempt, optimal
+        return None
+    
+    async def shortest_distance_async(self, start_title: str, target_title: str) -> Optional[int]:
+        """
+        Calcule le nombre minimal de clics entre deux articles
+        Retourne None si aucun solveur n'est disponible ou si le chemin est introuvable
+        """
+        if isinstance(self.solver, GraphPathSolver):
+            return await self._run(self.solver.shortest_distance, start_title, target_title)
+        if isinstance(self.solver, ApiPathSolver):
+            async with self._semaphore:
+                try:
+                    return await self.solver.shortest_distance(start_title, target_title)
+                except Exception:
+                    return None
+        return None
+    
+    async def get_summary_async(self, article: str, sentences: int = 2) -> Optional[Tuple[str, str]]:
+        """Version non bloquante de get_summary"""
+        cache_key = f"{sentences}:{article.lower()}"
+        if self.cache:
+            cached = await self.cache.aget(self.lang, 'summary', cache_key)
+            if cached is not None:
+                return tuple(cached)
+        
+        if self.client is None:
+            result = await self._run(self.get_summary, article, sentences)
+        else:
+            async with self._semaphore:
+                try:
+                    result = await self.client.get_summary(article, sentences)
+                except Exception:
+                    result = None
+        
+        if result is not None and self.cache:
+            await self.cache.aset(self.lang, 'summary', cache_key, list(result))
+        return result
+    
+    async def aclose(self) -> None:
+        """Ferme le client HTTP et libère le pool de threads"""
+        if self.client is not None:
+            await self.client.close()
+        self.close()
+    
+    def close(self) -> None:
+        """Libère le pool de threads et ferme le cache"""
+        self._executor.shutdown(wait=False)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        if self.cache:
+            self.cache.close()
+        if self.graph is not None:
+            self.graph.close()
+    
+    def _search(self, query: str) -> List[str]:
+        """wikipedia.search avec cache (appel bloquant, depuis le pool de threads)"""
+        if self.cache:
+            cached = self.cache.get(self.lang, 'search', query)
+            if cached is not None:
+                return cached
+        results = wikipedia.search(query)
+        if self.cache:
+            self.cache.set(self.lang, 'search', query, results)
+        return results
+    
+    def _page(self, title: str, with_links: bool = False) -> Tuple[PathEndpoint, List[str]]:
+        """
+        Référence d'un article, et ses liens si demandés, avec cache (appel bloquant)
+        Une page d'homonymie est remplacée par sa première option
+        """
+        cached = self.cache.get(self.lang, 'page', title) if self.cache else None
+        links = self.cache.get(self.lang, 'links', title) if self.cache and with_links else None
+        if cached is not None and (links is not None or not with_links):
+            return PathEndpoint(*cached, lang=self.lang), links or []
+        
+        try:
+            page = wikipedia.page(title)
+        except DisambiguationError as e:
+            page = wikipedia.page(e.options[0])
+        endpoint = PathEndpoint.from_wikipedia_page(page, self.lang)
+        links = page.links if with_links else []
+        if self.cache:
+            # Même format que les pages résolues par le client MediaWiki
+            self.cache.set(self.lang, 'page', title, [endpoint.page_id, endpoint.title, endpoint.url])
+            if with_links:
+                self.cache.set(self.lang, 'links', title, links)
+        return endpoint, links
     
     def generate_path(self, max_attempts: int = 10) -> Optional[Tuple]:
         """
@@ -30,33 +268,24 @@ class WikipediaService:
                 art1 = random.choice(pages)
                 art2 = random.choice(pages)
                 
-                # Article de départ
-                try:
-                    page1 = wikipedia.page(wikipedia.search(art1)[0])
-                except DisambiguationError as e:
-                    page1 = wikipedia.page(e.options[0])
+                # Article de départ (recherches, pages et liens passent par le cache ;
+                # seules les références sont conservées, pas le contenu des pages)
+                page1, _ = self._page(self._search(art1)[0])
                 
                 # Article d'arrivée (via un lien)
-                try:
-                    page2 = wikipedia.page(art2)
-                except DisambiguationError as e:
-                    page2 = wikipedia.page(e.options[0])
+                page2, links = self._page(art2, with_links=True)
                 
-                if page2.links:
-                    target = random.choice(page2.links)
-                    target_search = wikipedia.search(target)
+                if links:
+                    target = random.choice(links)
+                    target_search = self._search(target)
                     if target_search:
-                        target_final = random.choice(target_search)
-                        try:
-                            page_target = wikipedia.page(target_final)
-                        except DisambiguationError as e:
-                            page_target = wikipedia.page(e.options[0])
+                        page_target, _ = self._page(random.choice(target_search))
                     else:
                         page_target = page2
                 else:
                     page_target = page2
                 
-                return (page1, page_target, attempt)
+                return page1, page_target, attempt
                 
             except PageError:
                 continue
@@ -69,7 +298,7 @@ class WikipediaService:
         Retourne: (article_name, summary) ou None
         """
         try:
-            results = wikipedia.search(article)
+            results = self._search(article)
             
             if not results:
                 return None
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+"""
+Configuration commune des tests : les modules du bot s'importent depuis la racine du dépôt
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def constants():
+    """Constantes de jeu passées aux services, comme dans main.py"""
+    from config.constants import (
+        LEVEL_THRESHOLDS, RANKS, ACHIEVEMENTS, BASE_POINTS, BASE_XP_WIN,
+        BASE_XP_LOSE, MIN_POINTS, TIME_BONUS_THRESHOLDS, CLICK_BONUS_THRESHOLDS
+    )
+    return {
+        'LEVEL_THRESHOLDS': LEVEL_THRESHOLDS,
+        'RANKS': RANKS,
+        'ACHIEVEMENTS': ACHIEVEMENTS,
+        'BASE_POINTS': BASE_POINTS,
+        'BASE_XP_WIN': BASE_XP_WIN,
+        'BASE_XP_LOSE': BASE_XP_LOSE,
+        'MIN_POINTS': MIN_POINTS,
+        'TIME_BONUS_THRESHOLDS': TIME_BONUS_THRESHOLDS,
+        'CLICK_BONUS_THRESHOLDS': CLICK_BONUS_THRESHOLDS
+    }
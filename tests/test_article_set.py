@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+Ensemble compact des articles visités et table d'internement des titres
+"""
+
+import random
+
+import pytest
+
+from models.article_set import ArticleSet, articles_count
+from repositories.article_index import ArticleIndex
+
+
+def test_encode_decode_round_trip():
+    rng = random.Random(2)
+    ids = {rng.randrange(2 ** 32) for _ in range(1000)} | {0, 2 ** 32 - 1}
+    article_set = ArticleSet(ids)
+    encoded = article_set.encode()
+    assert encoded.startswith(ArticleSet.PREFIX)
+    decoded = ArticleSet.decode(encoded)
+    assert list(decoded) == sorted(ids)
+    assert len(decoded) == len(ids)
+
+
+def test_empty_set_encodes_to_empty_string():
+    assert ArticleSet().encode() == ""
+    assert len(ArticleSet.decode("")) == 0
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        ArticleSet.decode("z9:abc")
+
+
+def test_add_keeps_ids_sorted_and_unique():
+    article_set = ArticleSet([5, 1])
+    assert article_set.add(3)
+    assert not article_set.add(5)
+    assert list(article_set) == [1, 3, 5]
+    assert 3 in article_set
+    assert 4 not in article_set
+
+
+def test_legacy_title_list_is_interned():
+    index = ArticleIndex()
+    article_set = ArticleSet.from_field(['Paris', 'Lyon', 'Paris'], index)
+    assert sorted(index.title(i) for i in article_set) == ['Lyon', 'Paris']
+    assert ArticleSet.from_field(article_set.encode(), index).ids == article_set.ids
+    assert len(ArticleSet.from_field(None, index)) == 0
+
+
+def test_articles_count_of_new_and_legacy_players():
+    assert articles_count({'articles_count': 4, 'articles_visited': 'z1:...'}) == 4
+    assert articles_count({'articles_visited': ['Paris', 'Lyon']}) == 2
+    assert articles_count({}) == 0
+
+
+def test_article_index_persists_and_drops_partial_line(tmp_path):
+    path = tmp_path / "articles.txt"
+    index = ArticleIndex(path, fsync=False)
+    assert index.intern('Paris') == 0
+    assert index.intern('Lyon') == 1
+    assert index.intern('Paris') == 0
+    assert index.intern('Ligne\ncoupée') == index.intern('Ligne coupée') == 2
+    index.close()
+    with open(path, 'ab') as f:
+        f.write(b'Titre incompl')
+
+    reopened = ArticleIndex(path, fsync=False)
+    assert len(reopened) == 3
+    assert reopened.get_id('Lyon') == 1
+    assert reopened.intern('Marseille') == 3
+    reopened.close()
+    assert path.read_text(encoding='utf-8').splitlines() == ['Paris', 'Lyon', 'Ligne coupée', 'Marseille']
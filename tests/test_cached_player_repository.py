@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache à écriture différée : éviction, flush groupé et reprise après un échec d'écriture
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from repositories.cached_player_repository import CachedPlayerRepository
+from repositories.memory_player_repository import MemoryPlayerRepository
+
+
+class RecordingBackend(MemoryPlayerRepository):
+    """Repository en mémoire qui compte ses écritures et peut échouer ou bloquer sur demande"""
+
+    def __init__(self, players=None):
+        super().__init__(players)
+        self.batches = []
+        self.fail = False
+        self.gate = None
+
+    def save_many(self, players):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise OSError("disque plein")
+        self.batches.append(sorted(players))
+        super().save_many(players)
+
+
+@pytest.fixture
+def backend():
+    return RecordingBackend({'ancien': {'points': 1}})
+
+
+@pytest.fixture
+def cache(backend):
+    repository = CachedPlayerRepository(backend, capacity=2)
+    yield repository
+    repository.close()
+
+
+def test_saves_are_deferred_until_flush(cache, backend):
+    cache.save('a', {'points': 1})
+    cache.save('a', {'points': 2})
+    cache.save('b', {'points': 3})
+    assert backend.batches == []
+    assert cache.load('a') == {'points': 2}
+
+    assert cache.flush() == 2
+    assert backend.batches == [['a', 'b']]
+    assert backend.players['a'] == {'points': 2}
+    assert cache.flush() == 0
+
+
+def test_loaded_data_is_a_copy(cache):
+    cache.save('a', {'points': 1, 'achievements': []})
+    data = cache.load('a')
+    data['achievements'].append('x')
+    assert cache.load('a') == {'points': 1, 'achievements': []}
+
+
+def test_evicted_dirty_players_are_kept_until_written(cache, backend):
+    cache.save('a', {'points': 1})
+    cache.save('b', {'points': 2})
+    cache.save('c', {'points': 3})
+    # 'a' a quitté le LRU mais n'est pas encore écrit
+    assert 'a' not in cache._cache
+    assert cache._evicted == {'a': {'points': 1}}
+    assert backend.batches == []
+    assert cache.exists('a')
+    assert cache.load_many(['a', 'ancien', 'absent']) == {'a': {'points': 1}, 'ancien': {'points': 1}}
+
+    cache.save('d', {'points': 4})
+    cache.save('e', {'points': 5})
+    assert cache.flush() == 5
+    assert cache._evicted == {}
+    assert {name: backend.players[name]['points'] for name in 'abcde'} == \
+        {'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5}
+
+
+def test_failed_flush_marks_players_dirty_again(cache, backend):
+    cache.save('a', {'points': 1})
+    cache.save('b', {'points': 2})
+    cache.save('c', {'points': 3})
+    backend.fail = True
+    with pytest.raises(OSError):
+        cache.flush()
+    assert cache._dirty == {'a', 'b', 'c'}
+    assert 'a' in cache._evicted
+
+    backend.fail = False
+    assert cache.flush() == 3
+    assert backend.players['a'] == {'points': 1}
+    assert cache._dirty == set()
+    assert cache._evicted == {}
+
+
+def test_cancelled_flush_async_keeps_players_dirty(cache, backend):
+    async def scenario():
+        cache.save('a', {'points': 1})
+        backend.gate = threading.Event()
+        task = asyncio.ensure_future(cache.flush_async())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert cache._dirty == {'a'}
+        backend.gate.set()
+        backend.gate = None
+        assert await cache.flush_async() == 1
+
+    asyncio.run(scenario())
+    assert backend.players['a'] == {'points': 1}
+
+
+def test_async_reads_and_run_after_flush(cache, backend):
+    async def scenario():
+        assert await cache.load_async('ancien') == {'points': 1}
+        assert await cache.load_async('absent') is None
+        assert await cache.exists_async('ancien')
+        cache.save('a', {'points': 5})
+        assert await cache.load_many_async(['a', 'ancien', 'absent']) == \
+            {'a': {'points': 5}, 'ancien': {'points': 1}}
+        # Le lot en attente est écrit avant la lecture de tous les joueurs
+        players = await cache.get_all_async()
+        assert sorted(p['name'] for p in players) == ['a', 'ancien']
+        cache.save('b', {'points': 6})
+        seen = cache.run_after_flush(lambda: sorted(backend.players))
+        # Sauvegarde postérieure à la soumission : absente du résultat
+        cache.save('c', {'points': 7})
+        assert await seen == ['a', 'ancien', 'b']
+
+    asyncio.run(scenario())
+    assert cache._dirty == {'c'}
+
+
+def test_start_and_stop_flush_periodically(backend):
+    async def scenario():
+        repository = CachedPlayerRepository(backend, capacity=4, flush_interval=0.01)
+        repository.start()
+        repository.save('a', {'points': 1})
+        await asyncio.sleep(0.1)
+        assert backend.players.get('a') == {'points': 1}
+        repository.save('b', {'points': 2})
+        await repository.stop()
+        assert backend.players.get('b') == {'points': 2}
+        repository.close()
+
+    asyncio.run(scenario())
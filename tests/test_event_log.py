@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+Journal d'événements : écriture, reprise après arrêt brutal, instantanés et relecture
+"""
+
+import copy
+import random
+
+import pytest
+
+from repositories.article_index import ArticleIndex
+from repositories.event_log import EventLog
+from repositories.memory_player_repository import MemoryPlayerRepository
+from services.event_replayer import EventReplayer
+from services.game_service import GameService
+from services.player_service import PlayerService
+from services.stats_service import StatsService
+
+NAMES = ['alice', 'bob', 'chloe', 'driss', 'emma']
+TITLES = ['Paris', 'Lyon', 'Chat', 'Chien', 'Soleil', 'Lune', 'Python', 'Java']
+
+
+def _without_created_at(players):
+    """created_at vient de /partie en jeu et de l'événement en relecture : non comparé"""
+    return {name: {k: v for k, v in data.items() if k != 'created_at'} for name, data in players.items()}
+
+
+def _play(game_service, player_service, rng, rounds, names=NAMES):
+    """Joue des manches aléatoires comme le font les commandes du bot"""
+    for round_number in range(rounds):
+        members = rng.sample(names, rng.randint(2, len(names)))
+        player_service.create_players(members)
+        game_service.start_game(members)
+        if rng.random() < 0.15:
+            game_service.cancel_game(members)
+            continue
+        game_service.register_win(
+            rng.choice(members), round(rng.uniform(5, 200), 2), rng.randint(1, 15),
+            tuple(rng.sample(TITLES, 2)), members, token=f"manche-{round_number}"
+        )
+
+
+@pytest.fixture
+def live(tmp_path, constants):
+    """Bot en mémoire écrivant dans un journal, sur une table d'articles partagée"""
+    event_log = EventLog(tmp_path / "events", segment_size=25, snapshot_interval=40, fsync=False)
+    article_index = ArticleIndex()
+    repository = MemoryPlayerRepository()
+    player_service = PlayerService(repository, constants)
+    player_service.build_rank_index()
+    game_service = GameService(player_service, StatsService(constants), event_log, article_index)
+    yield event_log, article_index, repository, player_service, game_service
+    event_log.close()
+
+
+def test_append_and_iter_events_across_segments(tmp_path):
+    event_log = EventLog(tmp_path, segment_size=3, fsync=False)
+    for i in range(10):
+        assert event_log.append('game_start', members=[f"p{i}"])['seq'] == i + 1
+    assert [e['seq'] for e in event_log.iter_events()] == list(range(1, 11))
+    assert [e['seq'] for e in event_log.iter_events(after_seq=7)] == [8, 9, 10]
+    assert len(list(tmp_path.glob("events-*.jsonl"))) == 4
+    event_log.close()
+
+
+def test_truncated_tail_is_dropped_on_reopen(tmp_path):
+    event_log = EventLog(tmp_path, fsync=False)
+    for i in range(3):
+        event_log.append('game_start', members=['a'])
+    event_log.close()
+    segment = next(tmp_path.glob("events-*.jsonl"))
+    with open(segment, 'ab') as f:
+        f.write(b'{"seq":4,"ts":1.0,"type":"gam')
+
+    reopened = EventLog(tmp_path, fsync=False)
+    assert reopened.last_seq == 3
+    assert reopened.append('game_cancel', members=['a'])['seq'] == 4
+    assert [e['type'] for e in reopened.iter_events()] == ['game_start'] * 3 + ['game_cancel']
+    reopened.close()
+
+
+def test_compact_keeps_base_snapshot_and_segments(tmp_path):
+    event_log = EventLog(tmp_path, segment_size=2, fsync=False)
+    for seq in range(1, 9):
+        event_log.append('game_start', members=['a'])
+        if seq % 2 == 0:
+            event_log.write_snapshot({'a': {'points': seq}})
+    segments = sorted(tmp_path.glob("events-*.jsonl"))
+
+    assert event_log.compact(keep_snapshots=2) == 1
+    assert [s for s, _ in event_log._snapshots()] == [2, 6, 8]
+    assert sorted(tmp_path.glob("events-*.jsonl")) == segments
+    assert event_log.load_snapshot()['players'] == {'a': {'points': 8}}
+    assert event_log.load_snapshot(5)['seq'] == 2
+
+    # Élagage explicite : la base devient l'instantané 6, l'instantané 2 et les trois
+    # segments qu'il couvre (événements 1 à 6) disparaissent
+    assert event_log.compact(keep_snapshots=2, prune_segments=True) == 4
+    assert [s for s, _ in event_log._snapshots()] == [6, 8]
+    assert [e['seq'] for e in event_log.iter_events(6)] == [7, 8]
+    event_log.close()
+
+
+def test_rebuild_equals_live_aggregates(live, constants):
+    event_log, article_index, repository, player_service, game_service = live
+    _play(game_service, player_service, random.Random(11), 60)
+    # Des instantanés ont été écrits et compactés en cours de partie
+    assert event_log.latest_snapshot_seq() is not None
+
+    rebuilt = EventReplayer(constants, article_index).rebuild(event_log)
+    assert _without_created_at(rebuilt.players) == _without_created_at(repository.players)
+
+
+def test_recover_repairs_players_lost_in_a_crash(live, constants):
+    event_log, article_index, repository, player_service, game_service = live
+    rng = random.Random(5)
+    _play(game_service, player_service, rng, 10)
+    event_log.write_snapshot(copy.deepcopy(repository.players))
+    on_disk = copy.deepcopy(repository.players)
+
+    # Manches journalisées dont les sauvegardes n'ont pas atteint le disque
+    _play(game_service, player_service, rng, 10, NAMES + ['fatou'])
+    stale = MemoryPlayerRepository(on_disk)
+    repaired = EventReplayer(constants, article_index).recover(event_log, stale)
+
+    assert repaired > 0
+    assert _without_created_at(stale.players) == _without_created_at(repository.players)
+    # Les joueurs déjà sur disque gardent leur date de création
+    for name in on_disk:
+        assert stale.players[name]['created_at'] == on_disk[name]['created_at']
+    assert EventReplayer(constants, article_index).recover(event_log, stale) == 0
+
+
+def test_recover_without_snapshot_takes_existing_players_as_base(tmp_path, constants):
+    event_log = EventLog(tmp_path, fsync=False)
+    repository = MemoryPlayerRepository({'alice': {'points': 3}})
+    assert EventReplayer(constants).recover(event_log, repository) == 0
+    snapshot = event_log.load_snapshot()
+    assert snapshot['seq'] == 0
+    assert snapshot['players'] == {'alice': {'points': 3}}
+    event_log.close()
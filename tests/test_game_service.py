@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+Enregistrement idempotent des victoires (jeton de victoire)
+"""
+
+import pytest
+
+from repositories.event_log import EventLog
+from repositories.memory_player_repository import MemoryPlayerRepository
+from services.game_service import GameService
+from services.player_service import PlayerService
+from services.stats_service import StatsService
+
+MEMBERS = ['alice', 'bob']
+
+
+@pytest.fixture
+def services(tmp_path, constants):
+    event_log = EventLog(tmp_path, fsync=False)
+    repository = MemoryPlayerRepository()
+    player_service = PlayerService(repository, constants)
+    player_service.build_rank_index()
+    game_service = GameService(player_service, StatsService(constants), event_log)
+    player_service.create_players(MEMBERS)
+    game_service.start_game(MEMBERS)
+    yield game_service, repository, event_log
+    event_log.close()
+
+
+def test_same_token_is_applied_once(services):
+    game_service, repository, event_log = services
+    first = game_service.register_win('alice', 30.0, 4, ('Paris', 'Lyon'), MEMBERS, token='t1')
+    stored = dict(repository.players['alice'])
+    again = game_service.register_win('alice', 30.0, 4, ('Paris', 'Lyon'), MEMBERS, token='t1')
+
+    assert first['duplicate'] is False
+    assert again['duplicate'] is True
+    assert {k: v for k, v in again.items() if k != 'duplicate'} == \
+        {k: v for k, v in first.items() if k != 'duplicate'}
+    assert repository.players['alice'] == stored
+    assert repository.players['alice']['parties_gagnees'] == 1
+    assert sum(1 for e in event_log.iter_events() if e['type'] == 'win') == 1
+
+
+def test_distinct_tokens_and_no_token_are_all_applied(services):
+    game_service, repository, event_log = services
+    game_service.register_win('alice', 30.0, 4, ('Paris', 'Lyon'), MEMBERS, token='t1')
+    game_service.register_win('alice', 25.0, 3, ('Chat', 'Chien'), MEMBERS, token='t2')
+    game_service.register_win('alice', 20.0, 3, ('Chat', 'Chien'), MEMBERS)
+    game_service.register_win('alice', 20.0, 3, ('Chat', 'Chien'), MEMBERS)
+
+    assert repository.players['alice']['parties_gagnees'] == 4
+    assert sum(1 for e in event_log.iter_events() if e['type'] == 'win') == 4
+
+
+def test_oldest_tokens_are_forgotten(services, monkeypatch):
+    game_service, repository, _ = services
+    monkeypatch.setattr(GameService, 'COMPLETED_WINS_SIZE', 2)
+    for token in ('t1', 't2', 't3'):
+        game_service.register_win('alice', 30.0, 4, ('Paris', 'Lyon'), MEMBERS, token=token)
+    assert game_service.register_win('alice', 30.0, 4, ('Paris', 'Lyon'), MEMBERS, token='t3')['duplicate']
+    assert not game_service.register_win('alice', 30.0, 4, ('Paris', 'Lyon'), MEMBERS, token='t1')['duplicate']
+    assert repository.players['alice']['parties_gagnees'] == 4
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Index de classement comparé à un tri complet de la liste des joueurs
+"""
+
+import random
+
+import pytest
+
+from services.leaderboard_index import LeaderboardIndex, SortedKeys
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # Petits blocs : découpages et suppressions de blocs dès quelques dizaines de clés
+    monkeypatch.setattr(SortedKeys, 'LOAD', 4)
+
+
+def _player(rng, name):
+    played = rng.randint(0, 30)
+    return {
+        'name': name,
+        'points': rng.randint(0, 50),
+        'xp': rng.randint(0, 500),
+        'level': rng.randint(1, 10),
+        'parties_jouees': played,
+        'parties_gagnees': rng.randint(0, played),
+    }
+
+
+def _value(category, data):
+    if category == 'winrate':
+        played = data['parties_jouees']
+        return data['parties_gagnees'] / played * 100 if played else 0.0
+    return data[category]
+
+
+def _expected(players, category):
+    """Classement attendu : valeur décroissante, puis nom"""
+    return [name for name, data in sorted(players.items(), key=lambda p: (-_value(category, p[1]), p[0]))]
+
+
+def test_sorted_keys_matches_sorted_list():
+    rng = random.Random(1)
+    keys = SortedKeys()
+    reference = []
+    for _ in range(500):
+        if reference and rng.random() < 0.4:
+            key = rng.choice(reference)
+            keys.remove(key)
+            reference.remove(key)
+        else:
+            key = (rng.randint(0, 40), f"p{rng.randint(0, 10 ** 6)}")
+            if key in reference:
+                continue
+            keys.add(key)
+            reference.append(key)
+        reference.sort()
+        assert len(keys) == len(reference)
+    for position, key in enumerate(reference):
+        assert keys.index(key) == position
+    for offset in range(0, len(reference) + 3, 7):
+        assert list(keys.slice(offset, 9)) == reference[offset:offset + 9]
+
+
+def test_sorted_keys_initial_keys_and_empty_slice():
+    keys = SortedKeys([(3, 'c'), (1, 'a'), (2, 'b')])
+    assert list(keys.slice(0, 10)) == [(1, 'a'), (2, 'b'), (3, 'c')]
+    assert list(keys.slice(3, 10)) == []
+    assert list(keys.slice(0, 0)) == []
+    for key in [(1, 'a'), (2, 'b'), (3, 'c')]:
+        keys.remove(key)
+    assert len(keys) == 0
+    assert list(keys.slice(0, 10)) == []
+
+
+@pytest.mark.parametrize('category', LeaderboardIndex.CATEGORIES)
+def test_rank_and_page_match_sorted_list(category):
+    rng = random.Random(category)
+    players = {f"joueur{i}": _player(rng, f"joueur{i}") for i in range(60)}
+    index = LeaderboardIndex()
+    index.build(list(players.values()))
+
+    # Mises à jour, nouveaux joueurs et suppressions après la construction
+    for step in range(200):
+        name = f"joueur{rng.randint(0, 80)}"
+        if name in players and rng.random() < 0.1:
+            del players[name]
+            index.remove(name)
+        else:
+            players[name] = _player(rng, name)
+            index.update(name, players[name])
+
+    expected = _expected(players, category)
+    assert len(index) == len(players)
+    for position, name in enumerate(expected, 1):
+        assert index.get_rank(name, category) == position
+    for offset in range(0, len(expected), 10):
+        assert index.page(category, offset, 10) == expected[offset:offset + 10]
+    assert index.get_rank('inconnu', category) == 0
+
+
+def test_records_follow_updates():
+    index = LeaderboardIndex()
+    index.build([{'name': 'a', 'points': 5, 'xp': 10, 'level': 2,
+                  'parties_gagnees': 1, 'parties_jouees': 4}])
+    index.update('b', {'points': 7})
+    index.update('a', {'points': 5, 'xp': 30, 'level': 3, 'parties_gagnees': 2, 'parties_jouees': 4})
+
+    assert index.records('points', 0, 10) == [
+        {'points': 7, 'xp': 0, 'level': 1, 'parties_gagnees': 0, 'parties_jouees': 0,
+         'name': 'b', 'win_rate': 0.0},
+        {'points': 5, 'xp': 30, 'level': 3, 'parties_gagnees': 2, 'parties_jouees': 4,
+         'name': 'a', 'win_rate': 50.0},
+    ]
+    index.remove('a')
+    assert index.record('a') is None
+    assert 'a' not in index
+
+
+def test_player_service_pages_match_sorted_list(constants):
+    from repositories.memory_player_repository import MemoryPlayerRepository
+    from services.player_service import PlayerService
+
+    rng = random.Random(7)
+    players = {f"joueur{i}": _player(rng, f"joueur{i}") for i in range(35)}
+    repository = MemoryPlayerRepository({name: dict(data) for name, data in players.items()})
+    service = PlayerService(repository, constants)
+    with pytest.raises(RuntimeError):
+        service.get_rank('joueur0')
+    service.build_rank_index()
+
+    expected = _expected(players, 'points')
+    names = []
+    for page in range(4):
+        result = service.get_leaderboard_page('points', page, 10)
+        assert result['total'] == len(players)
+        assert result['pages'] == 4
+        assert [p['position'] for p in result['players']] == list(range(page * 10 + 1, page * 10 + 1 + len(result['players'])))
+        names += [p['name'] for p in result['players']]
+    assert names == expected
+    assert service.get_leaderboard_page_of(expected[23]) == 2
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+BFS bidirectionnel comparé à un BFS simple sur des graphes aléatoires
+"""
+
+import asyncio
+import random
+from collections import deque
+
+import pytest
+
+from services.path_solver import ApiPathSolver, GraphPathSolver, in_band
+
+
+class DictGraph:
+    """Graphe orienté en dictionnaires, même interface que LinkGraph pour le solveur"""
+
+    def __init__(self, node_count, edges):
+        self.out = {n: [] for n in range(node_count)}
+        self.inc = {n: [] for n in range(node_count)}
+        for source, target in edges:
+            self.out[source].append(target)
+            self.inc[target].append(source)
+
+    def out_links(self, node):
+        return self.out[node]
+
+    def in_links(self, node):
+        return self.inc[node]
+
+    def out_degree(self, node):
+        return len(self.out[node])
+
+    def in_degree(self, node):
+        return len(self.inc[node])
+
+    def find(self, title):
+        return int(title[1:]) if title[1:].isdigit() and int(title[1:]) in self.out else None
+
+
+def bfs_distance(graph, source, target):
+    distances = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            return distances[node]
+        for neighbor in graph.out_links(node):
+            if neighbor not in distances:
+                distances[neighbor] = distances[node] + 1
+                queue.append(neighbor)
+    return None
+
+
+def random_graph(rng, node_count, edge_count):
+    edges = {(rng.randrange(node_count), rng.randrange(node_count)) for _ in range(edge_count)}
+    return DictGraph(node_count, sorted(edges))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_graph_solver_matches_plain_bfs(seed):
+    rng = random.Random(seed)
+    # Graphes peu denses : distances variées, paires inatteignables comprises
+    graph = random_graph(rng, 60, rng.randint(70, 150))
+    solver = GraphPathSolver(graph, max_depth=60)
+    for _ in range(200):
+        source, target = rng.randrange(60), rng.randrange(60)
+        assert solver.distance(source, target) == bfs_distance(graph, source, target)
+
+
+def test_graph_solver_depth_limit_and_titles():
+    # Chaîne 0 -> 1 -> ... -> 9
+    graph = DictGraph(10, [(i, i + 1) for i in range(9)])
+    assert GraphPathSolver(graph).shortest_distance('n0', 'n9') == 9
+    assert GraphPathSolver(graph, max_depth=5).distance(0, 9) is None
+    assert GraphPathSolver(graph).shortest_distance('n9', 'n0') is None
+    assert GraphPathSolver(graph).shortest_distance('n0', 'inconnu') is None
+    assert GraphPathSolver(graph).shortest_distance('n4', 'n4') == 0
+
+
+class FakeClient:
+    """Client MediaWiki simulé à partir d'un graphe de titres"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.requests = 0
+
+    async def get_links_many(self, titles):
+        self.requests += 1
+        return {t: [f"n{n}" for n in self.graph.out_links(int(t[1:]))] for t in titles}
+
+    async def get_backlinks_many(self, titles):
+        self.requests += 1
+        return {t: [f"n{n}" for n in self.graph.in_links(int(t[1:]))] for t in titles}
+
+
+def test_api_solver_matches_plain_bfs():
+    rng = random.Random(9)
+    graph = random_graph(rng, 40, 90)
+    solver = ApiPathSolver(FakeClient(graph), max_depth=40, max_requests=1000)
+
+    async def scenario():
+        for _ in range(100):
+            source, target = rng.randrange(40), rng.randrange(40)
+            assert await solver.shortest_distance(f"n{source}", f"n{target}") == \
+                bfs_distance(graph, source, target)
+
+    asyncio.run(scenario())
+
+
+def test_api_solver_gives_up_when_budget_is_spent():
+    graph = DictGraph(10, [(i, i + 1) for i in range(9)])
+    client = FakeClient(graph)
+    solver = ApiPathSolver(client, max_requests=3)
+    assert asyncio.run(solver.shortest_distance('n0', 'n9')) is None
+    assert client.requests == 3
+
+
+def test_in_band():
+    assert in_band(4, (3, 5))
+    assert not in_band(6, (3, 5))
+    assert in_band(9, (6, None))
+    assert in_band(1, None)
+    assert not in_band(None, None)
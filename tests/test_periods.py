@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""
+Buckets par période et classements des périodes en cours, avec archivage
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from config.constants import SEASON_MONTHS
+from services.period_leaderboards import PeriodLeaderboards
+from utils.periods import PERIODS, add_to_periods, current_bucket, period_key, period_keys
+
+
+def _expected_keys(day):
+    iso_year, iso_week, _ = day.isocalendar()
+    return (
+        f"{day.year}-{day.month:02d}-{day.day:02d}",
+        f"{iso_year}-W{iso_week:02d}",
+        f"{day.year}-{day.month:02d}",
+        f"{day.year}-S{(day.month - 1) // SEASON_MONTHS + 1:02d}",
+    )
+
+
+def test_period_keys_for_dates_and_timestamps():
+    day = date(2020, 12, 25)
+    # Deux ans jour par jour, par datetime puis par horodatages (cache du dernier jour)
+    for offset in range(730):
+        current = day + timedelta(days=offset)
+        expected = _expected_keys(current)
+        assert period_keys(datetime(current.year, current.month, current.day, 12)) == expected
+        midnight = datetime(current.year, current.month, current.day).timestamp()
+        assert period_keys(midnight) == expected
+        next_day = current + timedelta(days=1)
+        assert period_keys(datetime(next_day.year, next_day.month, next_day.day).timestamp() - 0.5) == expected
+    # Semaine ISO à cheval sur deux années
+    assert period_key('week', datetime(2021, 1, 3)) == "2020-W53"
+    assert period_key('season', datetime(2021, 12, 31)) == f"2021-S{12 // SEASON_MONTHS:02d}"
+    with pytest.raises(ValueError):
+        period_key('decade')
+
+
+def test_period_keys_compare_chronologically():
+    days = [date(2023, 1, 1) + timedelta(days=d) for d in range(0, 800, 3)]
+    for period_index in range(len(PERIODS)):
+        keys = [_expected_keys(d)[period_index] for d in days]
+        assert keys == sorted(keys)
+
+
+def test_buckets_reset_on_new_period_and_ignore_older_events():
+    player = {}
+    monday = datetime(2024, 5, 6, 10)
+    add_to_periods(player, monday, points=10, wins=1, games=1)
+    add_to_periods(player, monday + timedelta(hours=2), points=5, games=1)
+    assert current_bucket(player, 'day', "2024-05-06") == \
+        {'key': "2024-05-06", 'points': 15, 'xp': 0, 'wins': 1, 'games': 2}
+
+    tuesday = monday + timedelta(days=1)
+    add_to_periods(player, tuesday, points=3)
+    assert player['periods']['day'] == {'key': "2024-05-07", 'points': 3, 'xp': 0, 'wins': 0, 'games': 0}
+    assert player['periods']['week']['points'] == 18
+    assert current_bucket(player, 'day', "2024-05-06") is None
+
+    # Événement de la veille arrivé après : le bucket du jour n'est pas touché
+    add_to_periods(player, monday, points=100)
+    assert player['periods']['day']['points'] == 3
+    assert player['periods']['week']['points'] == 118
+
+    # Annulation : les compteurs ne deviennent jamais négatifs
+    add_to_periods(player, tuesday, games=-1)
+    assert player['periods']['day']['games'] == 0
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _player(when, points, level=1):
+    data = {'level': level}
+    add_to_periods(data, when, points=points, xp=points * 2, wins=1, games=2)
+    return data
+
+
+def test_period_pages_and_page_of():
+    clock = Clock(datetime(2024, 5, 8, 12))
+    boards = PeriodLeaderboards(clock=clock)
+    players = [{'name': f"p{i:02d}", **_player(clock.now, points=i % 7)} for i in range(25)]
+    # Joueur inactif cette semaine : absent du classement hebdomadaire
+    players.append({'name': 'ancien', **_player(clock.now - timedelta(days=30), points=50)})
+    boards.build(players)
+
+    expected = [p['name'] for p in sorted(players[:25], key=lambda p: (-(int(p['name'][1:]) % 7), p['name']))]
+    pages = [boards.get_page('week', 'points', page, 10) for page in range(3)]
+    assert [p['name'] for page in pages for p in page['players']] == expected
+    assert pages[0]['total'] == 25 and pages[0]['pages'] == 3
+    assert pages[0]['key'] == "2024-W19"
+    assert pages[2]['players'][0]['position'] == 21
+    assert pages[0]['players'][0] == {
+        'points': 6, 'xp': 12, 'level': 1, 'parties_gagnees': 1, 'parties_jouees': 2,
+        'name': 'p06', 'win_rate': 50.0, 'position': 1,
+    }
+    assert boards.page_of(expected[14], 'week') == 1
+    assert boards.page_of('ancien', 'week') is None
+
+    # Mise à jour incrémentale après une victoire
+    winner = dict(players[0])
+    add_to_periods(winner, clock.now, points=100, wins=1)
+    boards.update('p00', winner)
+    assert boards.get_page('day')['players'][0]['name'] == 'p00'
+    boards.close()
+
+
+def test_finished_period_is_archived_and_restarted(tmp_path):
+    clock = Clock(datetime(2024, 5, 8, 12))
+    boards = PeriodLeaderboards(tmp_path, clock=clock)
+    boards.build([
+        {'name': 'a', **_player(clock.now, 5)},
+        {'name': 'b', **_player(clock.now, 9)},
+        # Semaine précédente, pas encore archivée (bot arrêté au changement de semaine)
+        {'name': 'c', **_player(clock.now - timedelta(days=7), 4)},
+    ])
+
+    clock.now += timedelta(days=7)
+    next_week = _player(clock.now, 1)
+    boards.update('a', next_week)
+    assert boards.get_page('week')['total'] == 1
+    boards.close()
+
+    current = json.loads((tmp_path / "week-2024-W19.json").read_text(encoding='utf-8'))
+    assert [(p['name'], p['position']) for p in current['players']] == [('b', 1), ('a', 2)]
+    stale = json.loads((tmp_path / "week-2024-W18.json").read_text(encoding='utf-8'))
+    assert [p['name'] for p in stale['players']] == ['c']
+    # Les classements journaliers ne sont pas archivés
+    assert not list(tmp_path.glob("day-*.json"))
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+Même contrat pour les trois repositories de joueurs (fichiers JSON, SQLite, mémoire)
+"""
+
+import pytest
+
+from repositories.memory_player_repository import MemoryPlayerRepository
+from repositories.player_repository import PlayerRepository
+from repositories.sqlite_player_repository import SqlitePlayerRepository
+
+
+@pytest.fixture(params=['json', 'sqlite', 'memory'])
+def repository(request, tmp_path):
+    if request.param == 'json':
+        yield PlayerRepository(tmp_path / "joueurs", fsync=False)
+    elif request.param == 'sqlite':
+        repository = SqlitePlayerRepository(tmp_path / "joueurs.db")
+        yield repository
+        repository.close()
+    else:
+        yield MemoryPlayerRepository()
+
+
+def test_save_load_and_delete(repository):
+    assert repository.load('alice') is None
+    assert not repository.exists('alice')
+    repository.save('alice', {'points': 3, 'achievements': ['premier']})
+    assert repository.exists('alice')
+    assert repository.load('alice') == {'points': 3, 'achievements': ['premier']}
+    assert repository.delete('alice')
+    assert not repository.delete('alice')
+    assert repository.load('alice') is None
+
+
+def test_batch_operations(repository):
+    repository.save_many({'a': {'points': 1}, 'b': {'points': 2}, 'c': {'points': 3}})
+    repository.save_many({'b': {'points': 20}})
+    assert repository.save_many({}) is None
+
+    # Noms en double et joueurs absents ignorés
+    assert repository.load_many(['b', 'absent', 'a', 'b']) == {'b': {'points': 20}, 'a': {'points': 1}}
+    assert repository.load_many([]) == {}
+    assert sorted((p['name'], p['points']) for p in repository.get_all()) == \
+        [('a', 1), ('b', 20), ('c', 3)]
+
+
+def test_json_repository_quarantines_corrupt_files(tmp_path):
+    repository = PlayerRepository(tmp_path, fsync=False)
+    repository.save('ok', {'points': 1})
+    (tmp_path / "casse.json").write_text('{"points": ', encoding='utf-8')
+
+    assert repository.load_many(['ok', 'casse']) == {'ok': {'points': 1}}
+    assert not (tmp_path / "casse.json").exists()
+    assert len(list((tmp_path / PlayerRepository.CORRUPT_DIR).iterdir())) == 1
+    assert [p['name'] for p in repository.get_all()] == ['ok']
+
+
+def test_sqlite_import_skips_unreadable_files(tmp_path):
+    json_dir = tmp_path / "joueurs"
+    json_repository = PlayerRepository(json_dir, fsync=False)
+    json_repository.save_many({'a': {'points': 1}, 'b': {'points': 2}})
+    (json_dir / "casse.json").write_bytes(b'\xff\xfe{')
+
+    repository = SqlitePlayerRepository(tmp_path / "joueurs.db")
+    assert repository.import_json_directory(json_dir) == (2, ['casse.json'])
+    assert repository.count() == 2
+    assert repository.load_many(['a', 'b']) == {'a': {'points': 1}, 'b': {'points': 2}}
+    repository.close()
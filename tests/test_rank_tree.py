@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Arbre de Fenwick et rang par statistique comparés à un calcul direct
+"""
+
+import random
+
+import pytest
+
+from services.rank_tree import FenwickTree, MetricRank
+
+
+def test_fenwick_counts_and_kth_smallest():
+    rng = random.Random(3)
+    tree = FenwickTree(4)
+    values = []
+    for _ in range(300):
+        if values and rng.random() < 0.3:
+            value = values.pop(rng.randrange(len(values)))
+            tree.add(value, -1)
+        else:
+            # Valeurs au-delà du domaine initial : agrandissement automatique
+            value = rng.randint(0, 3000)
+            values.append(value)
+            tree.add(value, 1)
+    ordered = sorted(values)
+    assert tree.total == len(values)
+    for probe in (-1, 0, 5, 100, 1500, 2999, 3000, 10 ** 6):
+        assert tree.count_le(probe) == sum(1 for v in values if v <= probe)
+    for k, value in enumerate(ordered, 1):
+        assert tree.kth_smallest(k) == value
+    assert tree.kth_smallest(0) is None
+    assert tree.kth_smallest(len(values) + 1) is None
+
+
+def _brute_stats(values, name, higher_is_better):
+    value = values[name]
+    if higher_is_better:
+        ahead = [v for v in values.values() if v > value]
+        gap = min(ahead) - value + 1 if ahead else None
+    else:
+        ahead = [v for v in values.values() if v < value]
+        gap = value - max(ahead) + 1 if ahead else None
+    rank = len(ahead) + 1
+    return {'rank': rank, 'total': len(values), 'percentile': rank / len(values) * 100, 'gap': gap}
+
+
+@pytest.mark.parametrize('higher_is_better', [True, False])
+def test_metric_rank_matches_brute_force(higher_is_better):
+    rng = random.Random(int(higher_is_better))
+    metric = MetricRank('points', higher_is_better=higher_is_better)
+    metric.build([{'name': f"p{i}", 'points': rng.randint(0, 40)} for i in range(50)])
+    values = {name: value for name, value in metric._values.items()}
+    for _ in range(100):
+        name = f"p{rng.randint(0, 60)}"
+        if rng.random() < 0.1:
+            metric.remove(name)
+            values.pop(name, None)
+        else:
+            values[name] = rng.randint(0, 40)
+            metric.update(name, {'points': values[name]})
+    for name in values:
+        assert metric.stats(name) == _brute_stats(values, name, higher_is_better)
+
+
+def test_metric_rank_scale_and_unranked_players():
+    metric = MetricRank('best_time', higher_is_better=False, scale=100)
+    metric.build([
+        {'name': 'rapide', 'best_time': 12.5},
+        {'name': 'lent', 'best_time': 20.0},
+        {'name': 'jamais', 'best_time': float('inf')},
+        {'name': 'sans_temps'},
+    ])
+    assert metric.stats('jamais') is None
+    assert metric.stats('sans_temps') is None
+    assert metric.stats('rapide') == {'rank': 1, 'total': 2, 'percentile': 50.0, 'gap': None}
+    assert metric.stats('lent') == {'rank': 2, 'total': 2, 'percentile': 100.0, 'gap': 7.51}
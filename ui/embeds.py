@@ -8,7 +8,7 @@ Création des embeds Discord
 import discord
 from discord import Embed
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 class EmbedCreator:
@@ -85,7 +85,8 @@ class EmbedCreator:
     
     @staticmethod
     def create_path_embed(page_start, page_end, is_ranked: bool, 
-                         attempt: int = 1) -> Embed:
+                         attempt: int = 1, optimal_clicks: int = None,
+                         difficulty: str = None) -> Embed:
         """Crée l'embed du parcours Wikipedia"""
         embed = Embed(
             title="🗺️ NOUVEAU DÉFI WIKIPÉDIA",
@@ -116,6 +117,21 @@ class EmbedCreator:
             inline=False
         )
         
+        if optimal_clicks is not None:
+            embed.add_field(
+                name="🧭 Chemin optimal",
+                value=f"**{optimal_clicks}** clic(s) au minimum",
+                inline=False
+            )
+        
+        if difficulty is not None:
+            from config.constants import DIFFICULTY_LABELS
+            embed.add_field(
+                name="🎯 Difficulté",
+                value=DIFFICULTY_LABELS.get(difficulty, difficulty),
+                inline=False
+            )
+        
         if not is_ranked:
             embed.add_field(
                 name="⚠️ Attention",
@@ -145,17 +161,21 @@ class EmbedCreator:
         )
         
         # Performance
+        clicks_text = f"🖱️ Clics : **{result.get('clicks', 0)}**"
+        if result.get('optimal_clicks') is not None:
+            clicks_text += f" (optimal : {result['optimal_clicks']})"
+        
         embed.add_field(
             name="📊 Performance",
             value=f"⏱️ Temps : **{result.get('temps', 0)}s**\n"
-                  f"🖱️ Clics : **{result.get('clicks', 0)}**\n"
+                  f"{clicks_text}\n"
                   f"💎 Points : **+{result['points']}** (Total: {player_data['points']})",
             inline=True
         )
         
         # Progression XP
-        from config.constants import LEVEL_THRESHOLDS
-        xp_for_next = LEVEL_THRESHOLDS.get(player_data['level'] + 1, player_data['xp'])
+        from utils.progression import default_progression
+        xp_for_next = default_progression().xp_for_next_level(player_data['level']) or player_data['xp']
         xp_progress = formatter.get_progress_bar(player_data['xp'], xp_for_next, 12)
         
         xp_details = f"+{result['xp_gained']} gameplay"
@@ -217,9 +237,11 @@ class EmbedCreator:
     
     @staticmethod
     def create_stats_embed(player_name: str, player_data: Dict, 
-                          rank_info: Dict, formatter) -> Embed:
-        """Crée l'embed des statistiques d'un joueur"""
-        from config.constants import LEVEL_THRESHOLDS
+                          rank_info: Dict, formatter,
+                          rank_stats: Optional[Dict[str, Optional[Dict]]] = None) -> Embed:
+        """Crée l'embed des statistiques d'un joueur, avec ses positions actuelles si fournies"""
+        from utils.progression import default_progression
+        from models.article_set import articles_count
         
         # Formater les temps
         h_total, m_total, s_total = formatter.format_time(player_data['temps_total'])
@@ -234,7 +256,7 @@ class EmbedCreator:
             win_rate = round((player_data['parties_gagnees'] / player_data['parties_jouees']) * 100, 1)
         
         # XP Progress
-        xp_for_next = LEVEL_THRESHOLDS.get(player_data['level'] + 1, player_data['xp'])
+        xp_for_next = default_progression().xp_for_next_level(player_data['level']) or player_data['xp']
         xp_progress = formatter.get_progress_bar(player_data['xp'], xp_for_next, 15)
         
         # Créer l'embed
@@ -288,7 +310,7 @@ class EmbedCreator:
             name="📊 Moyennes",
             value=f"🖱️ **Clics** : {player_data['moyenne_clics']:.2f}\n"
                   f"⏱️ **Temps** : {m_avg}m {s_avg}s\n"
-                  f"🗺️ **Articles visités** : {len(player_data.get('articles_visited', []))}",
+                  f"🗺️ **Articles visités** : {articles_count(player_data)}",
             inline=True
         )
         
@@ -299,6 +321,28 @@ class EmbedCreator:
             inline=True
         )
         
+        # Section Positions (rang, percentile, écart au joueur suivant)
+        if rank_stats:
+            lines = []
+            for metric, label, unit in (
+                ('points', "💎 **Points**", " pts"),
+                ('xp', "⭐ **XP**", " XP"),
+                ('best_time', "⚡ **Meilleur temps**", "s"),
+            ):
+                stats = rank_stats.get(metric)
+                if not stats:
+                    continue
+                line = f"{label} : #{stats['rank']}/{stats['total']} • top {stats['percentile']:.1f}%"
+                if stats['gap'] is None:
+                    line += " • en tête !"
+                elif metric == 'best_time':
+                    line += f" • -{stats['gap']:.2f}{unit} pour passer devant"
+                else:
+                    line += f" • +{stats['gap']}{unit} pour passer devant"
+                lines.append(line)
+            if lines:
+                embed.add_field(name="📍 Positions", value="\n".join(lines), inline=False)
+        
         # Section Achievements
         from config.constants import ACHIEVEMENTS
         achievements_count = len(player_data.get('achievements', []))
@@ -319,8 +363,9 @@ class EmbedCreator:
     
     @staticmethod
     def create_achievements_embed(player_name: str, player_data: Dict, 
-                                 rank_info: Dict, formatter) -> Embed:
-        """Crée l'embed des achievements"""
+                                 rank_info: Dict, formatter,
+                                 progress: Optional[Dict[str, Dict]] = None) -> Embed:
+        """Crée l'embed des achievements, avec l'avancement des succès verrouillés si fourni"""
         from config.constants import ACHIEVEMENTS
         
         unlocked = player_data.get('achievements', [])
@@ -349,7 +394,14 @@ class EmbedCreator:
         locked_text = []
         for ach_id, ach in ACHIEVEMENTS.items():
             if ach_id not in unlocked:
-                locked_text.append(f"🔒 {ach['name']}\n*{ach['description']}* (+{ach['xp']} XP)")
+                line = f"🔒 {ach['name']}\n*{ach['description']}* (+{ach['xp']} XP)"
+                step = (progress or {}).get(ach_id)
+                if step and step['current'] is not None and step['target'] is not None:
+                    current = step['current']
+                    if isinstance(current, float):
+                        current = f"{current:.1f}"
+                    line += f"\n`{current} / {step['target']}`"
+                locked_text.append(line)
         
         if locked_text:
             embed.add_field(
@@ -368,10 +420,11 @@ class EmbedCreator:
         return embed
     
     @staticmethod
-    def create_scoreboard_embed(players: List[Dict], formatter) -> Embed:
-        """Crée l'embed du classement général"""
-        from services.player_service import PlayerService
-        from config.constants import RANKS
+    def create_scoreboard_embed(players: List[Dict], formatter,
+                                page: int = 0, pages: int = 1) -> Embed:
+        """Crée l'embed d'une page du classement général"""
+        from utils.progression import default_progression
+        progression = default_progression()
         
         embed = Embed(
             title="🏆 CLASSEMENT GÉNÉRAL",
@@ -379,18 +432,11 @@ class EmbedCreator:
             color=0xFFD700
         )
         
-        for i, player in enumerate(players[:10], 1):
+        for i, player in enumerate(players, 1):
             # Obtenir le rang
-            level = player['level']
-            rank_info = None
-            for level_range, info in RANKS.items():
-                if level in level_range:
-                    rank_info = info
-                    break
-            if not rank_info:
-                rank_info = RANKS[range(1, 5)]
+            rank_info = progression.rank_for_level(player['level'])
             
-            medal = formatter.get_medal_emoji(i)
+            medal = formatter.get_medal_emoji(player.get('position', i))
             
             win_rate = 0
             if player['parties_jouees'] > 0:
@@ -403,13 +449,19 @@ class EmbedCreator:
                 inline=False
             )
         
+        if pages > 1:
+            embed.set_footer(text=f"Page {page + 1}/{pages}")
+        
         return embed
     
     @staticmethod
     def create_leaderboard_embed(players: List[Dict], category: str, 
-                                 formatter) -> Embed:
-        """Crée l'embed d'un classement spécifique"""
-        from config.constants import RANKS
+                                 formatter, page: int = 0, pages: int = 1,
+                                 period: Optional[str] = None,
+                                 period_key: Optional[str] = None) -> Embed:
+        """Crée l'embed d'une page d'un classement spécifique (éventuellement par période)"""
+        from utils.progression import default_progression
+        progression = default_progression()
         
         # Déterminer le titre
         if category in ["level", "niveau", "lvl"]:
@@ -421,18 +473,15 @@ class EmbedCreator:
         else:
             title = "💎 CLASSEMENT PAR POINTS"
         
+        if period is not None:
+            from config.constants import PERIOD_LABELS
+            title = f"{title} • {PERIOD_LABELS.get(period, period).upper()}"
+        
         embed = Embed(title=title, color=0x6366F1)
         
-        for i, player in enumerate(players[:10], 1):
+        for i, player in enumerate(players, 1):
             # Obtenir le rang
-            level = player['level']
-            rank_info = None
-            for level_range, info in RANKS.items():
-                if level in level_range:
-                    rank_info = info
-                    break
-            if not rank_info:
-                rank_info = RANKS[range(1, 5)]
+            rank_info = progression.rank_for_level(player['level'])
             
             if category in ["winrate", "wr", "victoires"]:
                 value = f"{rank_info['emoji']} Niv. {player['level']} • **{player.get('win_rate', 0):.1f}% WR**"
@@ -443,7 +492,7 @@ class EmbedCreator:
             else:
                 value = f"{rank_info['emoji']} Niv. {player['level']} • **{player['points']} pts**"
             
-            medal = formatter.get_medal_emoji(i)
+            medal = formatter.get_medal_emoji(player.get('position', i))
             
             embed.add_field(
                 name=f"{medal} {player['name']}",
@@ -451,6 +500,14 @@ class EmbedCreator:
                 inline=False
             )
         
+        footer = []
+        if period_key is not None:
+            footer.append(f"Période {period_key}")
+        if pages > 1:
+            footer.append(f"Page {page + 1}/{pages}")
+        if footer:
+            embed.set_footer(text=" • ".join(footer))
+        
         return embed
     
     @staticmethod
@@ -575,4 +632,50 @@ class EmbedCreator:
                 inline=False
             )
         
-        return embed
\ No newline at end of file
+        return embed
+    
+    @staticmethod
+    def create_pool_embed(metrics: Dict[str, Dict], cache_stats: Dict = None,
+                          reload_stats: Dict = None) -> Embed:
+        """Crée l'embed des métriques de la réserve de parcours, du cache et des achievements"""
+        embed = Embed(
+            title="🗃️ RÉSERVE DE PARCOURS",
+            color=0x6366F1
+        )
+        
+        for lang, m in metrics.items():
+            served = m['hits'] + m['misses']
+            hit_rate = round(m['hits'] / served * 100, 1) if served else 0.0
+            embed.add_field(
+                name=f"🌐 {lang}",
+                value=f"📦 Prêts : **{m['ready']}/{m['target']}**\n"
+                      f"✅ Générés : {m['generated']} • ❌ Échecs : {m['failed']} • ⌛ Expirés : {m['expired']}\n"
+                      f"🎯 Servis depuis la réserve : {hit_rate}% ({m['hits']}/{served})\n"
+                      f"⏱️ Génération : {m['generation_time_avg']:.2f}s en moyenne "
+                      f"(dernière : {m['generation_time_last']:.2f}s)",
+                inline=False
+            )
+        
+        if cache_stats:
+            hits = cache_stats['memory_hits'] + cache_stats['disk_hits']
+            lookups = hits + cache_stats['misses']
+            hit_rate = round(hits / lookups * 100, 1) if lookups else 0.0
+            embed.add_field(
+                name="💾 Cache Wikipédia",
+                value=f"🎯 Succès : **{hit_rate}%** ({hits}/{lookups})\n"
+                      f"🧠 Mémoire : {cache_stats['memory_hits']} • 💽 Disque : {cache_stats['disk_hits']}\n"
+                      f"📦 Entrées : {cache_stats['memory_size']} en mémoire, {cache_stats['disk_size']} sur disque",
+                inline=False
+            )
+        
+        if reload_stats:
+            value = (
+                f"📜 Règles : **{reload_stats['rules']}** sur {reload_stats['indexed_fields']} champ(s)\n"
+                f"🔄 Rechargements : {reload_stats['reloads']} • ❌ Erreurs : {reload_stats['errors']}\n"
+                f"⏱️ Dernier rechargement : {reload_stats['reload_time_last'] * 1000:.1f} ms"
+            )
+            if reload_stats['last_error']:
+                value += f"\n⚠️ {reload_stats['last_error'][:200]}"
+            embed.add_field(name="🏆 Achievements", value=value, inline=False)
+        
+        return embed
@@ -0,0 +1,88 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Vues Discord réutilisables (boutons)
+"""
+
+from typing import Optional
+
+import discord
+
+
+class LeaderboardView(discord.ui.View):
+    """
+    Classement paginé : précédent / suivant / ma position
+    Chaque clic ne lit que les lignes de la page affichée
+    """
+
+    PAGE_SIZE = 10
+
+    def __init__(self, player_service, embed_creator, formatters, category: Optional[str] = None,
+                 timeout: float = 180.0, period: Optional[str] = None):
+        super().__init__(timeout=timeout)
+        self.player_service = player_service
+        self.embed_creator = embed_creator
+        self.formatters = formatters
+        # None : classement général (/scoreboard), sinon catégorie de /leaderboard
+        self.category = category
+        # None : tous les temps, sinon 'day', 'week', 'month' ou 'season'
+        self.period = period
+        self.page = 0
+        self.pages = 1
+        self.message: Optional[discord.Message] = None
+
+    def render(self, page: int) -> Optional[discord.Embed]:
+        """Construit l'embed d'une page et met à jour l'état des boutons"""
+        result = self.player_service.get_leaderboard_page(
+            self.category or 'points', page, self.PAGE_SIZE, self.period
+        )
+        if not result['players']:
+            return None
+        self.page = result['page']
+        self.pages = result['pages']
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.pages - 1
+
+        if self.category is None:
+            return self.embed_creator.create_scoreboard_embed(
+                result['players'], self.formatters, self.page, self.pages
+            )
+        return self.embed_creator.create_leaderboard_embed(
+            result['players'], self.category, self.formatters, self.page, self.pages,
+            self.period, result.get('key')
+        )
+
+    async def _show(self, interaction: discord.Interaction, page: int) -> None:
+        embed = self.render(page)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(emoji='◀️', style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(emoji='▶️', style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    @discord.ui.button(label='Ma position', emoji='📍', style=discord.ButtonStyle.primary)
+    async def my_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        page = self.player_service.get_leaderboard_page_of(
+            interaction.user.name, self.category or 'points', self.PAGE_SIZE, self.period
+        )
+        if page is None:
+            await interaction.response.send_message(
+                "❌ Vous n'êtes pas encore classé !", ephemeral=True
+            )
+            return
+        await self._show(interaction, page)
+
+    async def on_timeout(self) -> None:
+        """Désactive les boutons à l'expiration de la vue"""
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,93 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Agrégats par période (jour, semaine, mois, saison) stockés dans les données joueur
+"""
+
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+
+from config.constants import SEASON_MONTHS
+
+PERIODS = ('day', 'week', 'month', 'season')
+
+# Compteurs d'un bucket de période
+BUCKET_FIELDS = ('points', 'xp', 'wins', 'games')
+
+
+# Dernier jour résolu depuis un horodatage : (début, fin, clés) ; les sauvegardes et la
+# relecture du journal tombent presque toujours dans le même jour que la précédente
+_last_day: Tuple[float, float, Tuple[str, ...]] = (0.0, 0.0, ())
+
+
+@lru_cache(maxsize=64)
+def _keys_for_date(day: date) -> Tuple[str, ...]:
+    """Clés des quatre périodes d'un jour, dans l'ordre de PERIODS"""
+    iso_year, iso_week, _ = day.isocalendar()
+    return (
+        day.strftime("%Y-%m-%d"),
+        f"{iso_year}-W{iso_week:02d}",
+        day.strftime("%Y-%m"),
+        f"{day.year}-S{(day.month - 1) // SEASON_MONTHS + 1:02d}",
+    )
+
+
+def period_keys(when: Union[datetime, float, None] = None) -> Tuple[str, ...]:
+    """
+    Clés des buckets contenant `when`, une par période dans l'ordre de PERIODS
+    Calculées une fois par jour : un horodatage du dernier jour résolu ne coûte qu'une comparaison
+    """
+    global _last_day
+    if isinstance(when, datetime):
+        return _keys_for_date(when.date())
+    if when is None:
+        when = time.time()
+    start, end, keys = _last_day
+    if start <= when < end:
+        return keys
+    day = datetime.fromtimestamp(when).date()
+    keys = _keys_for_date(day)
+    midnight = datetime(day.year, day.month, day.day)
+    _last_day = (midnight.timestamp(), (midnight + timedelta(days=1)).timestamp(), keys)
+    return keys
+
+
+def period_key(period: str, when: Union[datetime, float, None] = None) -> str:
+    """
+    Clé du bucket contenant `when` ; les clés d'une même période se comparent
+    chronologiquement en tant que chaînes
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Période inconnue : {period}")
+    return period_keys(when)[PERIODS.index(period)]
+
+
+def add_to_periods(player_data: Dict, when: Union[datetime, float, None] = None,
+                   **deltas: int) -> None:
+    """
+    Ajoute des compteurs (points, xp, wins, games) aux buckets courants du joueur, en O(1)
+    Un bucket d'une période terminée est remis à zéro à la première mise à jour suivante :
+    aucune réécriture de fichier n'est nécessaire au changement de période
+    """
+    periods = player_data.get('periods') or {}
+    for period, key in zip(PERIODS, period_keys(when)):
+        bucket = periods.get(period)
+        if bucket is None or bucket['key'] < key:
+            bucket = periods[period] = {'key': key, **{field: 0 for field in BUCKET_FIELDS}}
+        elif bucket['key'] > key:
+            # Événement antérieur au bucket en cours (horloge reculée) : ignoré
+            continue
+        for field, delta in deltas.items():
+            bucket[field] = max(0, bucket.get(field, 0) + delta)
+    player_data['periods'] = periods
+
+
+def current_bucket(player_data: Dict, period: str, key: str) -> Optional[Dict]:
+    """Bucket du joueur pour la période, s'il correspond à la clé en cours"""
+    bucket = (player_data.get('periods') or {}).get(period)
+    if bucket is not None and bucket.get('key') == key:
+        return bucket
+    return None
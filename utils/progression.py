@@ -0,0 +1,73 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+Tables de progression précalculées : niveau par XP et rang par niveau
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+
+class ProgressionTable:
+    """
+    Paliers d'XP triés (recherche dichotomique) et tableau niveau → rang
+    Construite une fois à partir de LEVEL_THRESHOLDS et RANKS
+    """
+
+    def __init__(self, level_thresholds: Dict[int, int], ranks: Dict[range, Dict]):
+        ordered = sorted(level_thresholds.items(), key=lambda item: item[1])
+        self.levels: List[int] = [level for level, _ in ordered]
+        self.thresholds: List[int] = [xp for _, xp in ordered]
+        self._xp_by_level = dict(level_thresholds)
+        self.max_level = max(self.levels)
+
+        # Rang par défaut (hors des plages) : celui du niveau 1, comme auparavant
+        self.default_rank = next(
+            (info for level_range, info in ranks.items() if 1 in level_range),
+            next(iter(ranks.values()))
+        )
+        size = max([self.max_level] + [r.stop for r in ranks]) + 1
+        self._rank_by_level: List[Dict] = [self.default_rank] * size
+        for level_range, info in ranks.items():
+            for level in level_range:
+                if level >= 0:
+                    self._rank_by_level[level] = info
+
+    def level_for_xp(self, xp: float) -> int:
+        """Niveau atteint avec cette quantité d'XP"""
+        index = bisect_right(self.thresholds, xp) - 1
+        return self.levels[index] if index >= 0 else self.levels[0]
+
+    def levels_for_xp(self, xp_values: Iterable[float]) -> List[int]:
+        """Niveaux de plusieurs joueurs en un passage (remises à zéro de saison)"""
+        thresholds = self.thresholds
+        levels = self.levels
+        first = levels[0]
+        result = []
+        for xp in xp_values:
+            index = bisect_right(thresholds, xp) - 1
+            result.append(levels[index] if index >= 0 else first)
+        return result
+
+    def xp_for_level(self, level: int) -> Optional[int]:
+        """XP requis pour atteindre un niveau, None s'il n'existe pas"""
+        return self._xp_by_level.get(level)
+
+    def xp_for_next_level(self, level: int) -> Optional[int]:
+        """XP requis pour le niveau suivant, None au niveau maximum"""
+        return self._xp_by_level.get(level + 1)
+
+    def rank_for_level(self, level: int) -> Dict:
+        """Rang (nom, emoji, couleur) correspondant à un niveau"""
+        if 0 <= level < len(self._rank_by_level):
+            return self._rank_by_level[level]
+        return self.default_rank
+
+
+@lru_cache(maxsize=1)
+def default_progression() -> ProgressionTable:
+    """Table construite à partir de config.constants, partagée par les embeds"""
+    from config.constants import LEVEL_THRESHOLDS, RANKS
+    return ProgressionTable(LEVEL_THRESHOLDS, RANKS)